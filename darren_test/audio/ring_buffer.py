@@ -0,0 +1,140 @@
+"""Single-producer / single-consumer float32 audio ring buffer.
+
+The producer (asyncio side) only advances ``write_index`` and the consumer
+(PortAudio callback) only advances ``read_index``; both are plain ints that
+grow monotonically, so under the GIL neither side needs a lock. Reads and
+writes are at most two slice copies, straight into the callback's
+``outdata``.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import numpy.typing as npt
+
+
+class AudioRingBuffer:
+    def __init__(self, capacity: int, channels: int = 1):
+        self.capacity = capacity
+        self.channels = channels
+        self.buffer = np.zeros((capacity, channels), dtype=np.float32)
+        self.write_index = 0
+        self.read_index = 0
+        self.closed = False
+
+    def available(self) -> int:
+        return self.write_index - self.read_index
+
+    def free(self) -> int:
+        return self.capacity - self.available()
+
+    def write(self, data: npt.NDArray) -> int:
+        """Copy as many frames of data as fit, returns the number written."""
+        data = np.asarray(data, dtype=np.float32).reshape(-1, self.channels)
+        count = min(len(data), self.free())
+        if count <= 0:
+            return 0
+
+        start = self.write_index % self.capacity
+        first = min(count, self.capacity - start)
+        self.buffer[start:start + first] = data[:first]
+        if count > first:
+            self.buffer[:count - first] = data[first:count]
+        # publish after the copy
+        self.write_index += count
+        return count
+
+    def read_into(self, out: npt.NDArray[np.float32]) -> int:
+        """Copy up to len(out) frames into out, returns the number read; the rest of out is left as is."""
+        count = min(len(out), self.available())
+        if count <= 0:
+            return 0
+
+        start = self.read_index % self.capacity
+        first = min(count, self.capacity - start)
+        out[:first] = self.buffer[start:start + first]
+        if count > first:
+            out[first:count] = self.buffer[:count - first]
+        self.read_index += count
+        return count
+
+    def close(self):
+        """Producer is done, the consumer drains what is left."""
+        self.closed = True
+
+    def drained(self) -> bool:
+        return self.closed and self.available() == 0
+
+    def reset(self):
+        self.write_index = 0
+        self.read_index = 0
+        self.closed = False
+
+
+@dataclass
+class AdaptivePrebuffer:
+    """Prebuffer target in frames, raised on underruns and lowered again after clean playback."""
+
+    initial: int
+    minimum: int
+    maximum: int
+    step: float = 1.5
+    # frames of underrun-free playback before the target is lowered one step
+    decay_after: int = 48000 * 5
+
+    target: int = field(init=False)
+    clean_frames: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self.target = self.initial
+
+    def on_underrun(self):
+        self.target = min(self.maximum, int(self.target * self.step))
+        self.clean_frames = 0
+
+    def on_played(self, frames: int):
+        self.clean_frames += frames
+        if self.clean_frames >= self.decay_after:
+            self.target = max(self.minimum, int(self.target / self.step))
+            self.clean_frames = 0
+
+
+@dataclass
+class PlaybackStats:
+    sample_rate: int
+    underruns: int = 0
+    underrun_frames: int = 0
+    played_frames: int = 0
+    callbacks: int = 0
+    fill_sum: int = 0
+    fill_max: int = 0
+    first_write_time: float | None = None
+    first_play_time: float | None = None
+
+    def on_write(self):
+        if self.first_write_time is None:
+            self.first_write_time = time.monotonic()
+
+    def on_callback(self, fill: int, played: int):
+        self.callbacks += 1
+        self.fill_sum += fill
+        self.fill_max = max(self.fill_max, fill)
+        if played and self.first_play_time is None:
+            self.first_play_time = time.monotonic()
+        self.played_frames += played
+
+    def to_dict(self) -> dict:
+        startup = None
+        if self.first_write_time is not None and self.first_play_time is not None:
+            startup = (self.first_play_time - self.first_write_time) * 1e3
+        return {
+            "underruns": self.underruns,
+            "underrun_ms": self.underrun_frames / self.sample_rate * 1e3,
+            "played_ms": self.played_frames / self.sample_rate * 1e3,
+            # first audio in -> first audio out
+            "startup_latency_ms": startup,
+            # audio queued ahead of the device, as seen by the callback
+            "buffered_ms_mean": self.fill_sum / self.callbacks / self.sample_rate * 1e3 if self.callbacks else 0.0,
+            "buffered_ms_max": self.fill_max / self.sample_rate * 1e3,
+        }
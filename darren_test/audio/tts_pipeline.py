@@ -0,0 +1,456 @@
+"""Streaming TTS -> speaker pipeline.
+
+    source (async PCM bytes) -> resample -> [normalize] -> sink
+
+Every stage runs as its own asyncio task, connected by bounded queues, so the
+network, DSP and playback overlap and a slow sink back-pressures the source
+instead of buffering without bound. Each stage records when it saw its first
+input and produced its first output, so time-to-first-audio can be measured
+offline with the stub source and the WAV sink:
+
+    python tts_pipeline.py --out /tmp/tts.wav
+    python tts_pipeline.py --openai "Hello there" --sink sounddevice
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable
+
+import numpy as np
+import numpy.typing as npt
+
+from resampler import StreamingResampler
+from ring_buffer import AudioRingBuffer, PlaybackStats
+
+logger = logging.getLogger(__name__)
+
+OPENAI_TTS_SAMPLE_RATE = 24000
+
+PcmSource = AsyncIterator[bytes]
+
+
+# ---------------------------------------------------------------- sources
+
+
+async def openai_tts_source(text: str, voice: str = "coral", instructions: str | None = None,
+                            chunk_size: int = 2048) -> PcmSource:
+    """OpenAI streaming TTS as raw 24 kHz int16 mono PCM."""
+    from openai import AsyncOpenAI
+
+    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL"))
+    extra = {"instructions": instructions} if instructions else {}
+    async with client.audio.speech.with_streaming_response.create(
+        model="gpt-4o-mini-tts",
+        voice=voice,
+        input=text,
+        response_format="pcm",
+        **extra,
+    ) as response:
+        async for chunk in response.iter_bytes(chunk_size=chunk_size):
+            if chunk:
+                yield chunk
+
+
+async def stub_source(duration: float = 3.0, sample_rate: int = OPENAI_TTS_SAMPLE_RATE, chunk_size: int = 2048,
+                      first_chunk_delay: float = 0.2, speed: float = 4.0, level: float = 0.1) -> PcmSource:
+    """Synthetic speech-like PCM delivered like a network stream, for tests and offline latency runs.
+
+    first_chunk_delay simulates the server's time to first byte, speed how much
+    faster than real time the rest arrives.
+    """
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    # 180 Hz tone with a 4 Hz syllable envelope
+    envelope = 0.5 * (1 - np.cos(2 * np.pi * 4 * t))
+    pcm = (np.sin(2 * np.pi * 180 * t) * envelope * level * 32767).astype("<i2").tobytes()
+
+    await asyncio.sleep(first_chunk_delay)
+    chunk_time = chunk_size / 2 / sample_rate / speed
+    for offset in range(0, len(pcm), chunk_size):
+        yield pcm[offset:offset + chunk_size]
+        await asyncio.sleep(chunk_time)
+
+
+# ---------------------------------------------------------------- stages
+
+
+class ResampleStage:
+    """int16 PCM bytes at the source rate -> float32 at the sink rate."""
+
+    name = "resample"
+
+    def __init__(self, input_rate: int, output_rate: int):
+        self.resampler = StreamingResampler(input_rate, output_rate, input_dtype=np.int16,
+                                            output_dtype=np.float32)
+
+    def process(self, data: bytes | npt.NDArray) -> npt.NDArray[np.float32]:
+        return self.resampler.process(data)
+
+    def flush(self) -> npt.NDArray[np.float32]:
+        return self.resampler.flush()
+
+
+class LoudnessNormalizer:
+    """Streaming RMS normalizer with a smoothed gain and a hard peak limit.
+
+    The level is an exponential average of the block mean square over about
+    ``window`` seconds; the gain ramps linearly across each block, and near
+    silence never raises it.
+    """
+
+    name = "normalize"
+
+    def __init__(self, sample_rate: int, target_dbfs: float = -18.0, max_gain_db: float = 20.0,
+                 window: float = 0.4, silence_dbfs: float = -55.0, limit: float = 0.98):
+        self.sample_rate = sample_rate
+        self.target = 10 ** (target_dbfs / 20)
+        self.max_gain = 10 ** (max_gain_db / 20)
+        self.window = window
+        self.silence = 10 ** (silence_dbfs / 20)
+        self.limit = limit
+        self.level: float | None = None
+        self.gain = 1.0
+
+    def process(self, samples: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]:
+        if len(samples) == 0:
+            return samples
+
+        mean_square = float(np.dot(samples, samples)) / len(samples)
+        if self.level is None:
+            self.level = mean_square
+        else:
+            alpha = 1 - math.exp(-len(samples) / (self.window * self.sample_rate))
+            self.level += alpha * (mean_square - self.level)
+
+        rms = math.sqrt(self.level)
+        target_gain = self.gain if rms < self.silence else min(self.max_gain, self.target / rms)
+        ramp = np.linspace(self.gain, target_gain, len(samples), dtype=np.float32)
+        self.gain = target_gain
+        out = samples * ramp
+        return np.clip(out, -self.limit, self.limit, out=out)
+
+    def flush(self) -> npt.NDArray[np.float32]:
+        return np.empty(0, np.float32)
+
+
+# ---------------------------------------------------------------- sinks
+
+
+def to_int16(samples: npt.NDArray[np.float32]) -> npt.NDArray[np.int16]:
+    return np.clip(np.rint(samples * 32768.0), -32768, 32767).astype(np.int16)
+
+
+class WavSink:
+    """Write to a 16-bit WAV file, as fast as the pipeline produces."""
+
+    name = "wav"
+
+    def __init__(self, path: str, sample_rate: int = 48000):
+        from unitree_sdk2py.utils.wav import WavWriter
+
+        self.sample_rate = sample_rate
+        self.writer = WavWriter(path, sample_rate, 1)
+        self.first_audio_time: float | None = None
+
+    async def open(self):
+        self.writer.Open()
+
+    async def write(self, samples: npt.NDArray[np.float32]):
+        self.writer.Write(to_int16(samples))
+        if self.first_audio_time is None:
+            self.first_audio_time = time.monotonic()
+
+    async def close(self):
+        self.writer.Close()
+
+
+class SounddeviceSink:
+    """Local playback through a ring buffer read by the PortAudio callback."""
+
+    name = "sounddevice"
+
+    def __init__(self, sample_rate: int = 48000, device: int | str | None = None, blocksize: int = 1024,
+                 latency: str | float = "low", buffer_seconds: float = 2.0, prebuffer_seconds: float = 0.05):
+        self.sample_rate = sample_rate
+        self.device = device
+        self.blocksize = blocksize
+        self.latency = latency
+        self.ring = AudioRingBuffer(int(buffer_seconds * sample_rate))
+        self.prebuffer = int(prebuffer_seconds * sample_rate)
+        self.stats = PlaybackStats(sample_rate)
+        self.stream = None
+        self.playing = False
+        self.done: asyncio.Event | None = None
+
+    @property
+    def first_audio_time(self) -> float | None:
+        return self.stats.first_play_time
+
+    async def open(self):
+        import sounddevice as sd
+
+        loop = asyncio.get_running_loop()
+        self.done = asyncio.Event()
+
+        def callback(outdata, frame_count, _time_info, status):
+            if status:
+                logger.warning("Audio callback status: %s", status)
+            fill = self.ring.available()
+            if not self.playing and (fill >= self.prebuffer or self.ring.closed):
+                self.playing = True
+            played = self.ring.read_into(outdata) if self.playing else 0
+            outdata[played:] = 0
+            self.stats.on_callback(fill, played)
+            if self.playing and played < frame_count and not self.ring.closed:
+                self.stats.underruns += 1
+                self.stats.underrun_frames += frame_count - played
+            if self.ring.drained():
+                loop.call_soon_threadsafe(self.done.set)
+                raise sd.CallbackStop
+
+        self.stream = sd.OutputStream(samplerate=self.sample_rate, channels=1, dtype=np.float32,
+                                      blocksize=self.blocksize, latency=self.latency, device=self.device,
+                                      callback=callback)
+        self.stream.start()
+
+    async def write(self, samples: npt.NDArray[np.float32]):
+        self.stats.on_write()
+        written = 0
+        while written < len(samples):
+            written += self.ring.write(samples[written:])
+            if written < len(samples):
+                await asyncio.sleep(self.blocksize / self.sample_rate / 2)
+
+    async def close(self):
+        self.ring.close()
+        if self.stream is not None:
+            await self.done.wait()
+            self.stream.close()
+            self.stream = None
+
+
+class G1SpeakerSink:
+    """G1 speaker through AudioStream (AudioClient.PlayStream), 16 kHz int16."""
+
+    name = "g1"
+
+    def __init__(self, client, app_name: str = "tts", chunk_duration: float = 0.25, lead_time: float = 0.5):
+        from unitree_sdk2py.g1.audio.g1_audio_stream import AUDIO_STREAM_SAMPLE_RATE, AudioStream
+
+        self.sample_rate = AUDIO_STREAM_SAMPLE_RATE
+        self.stream = AudioStream(client, app_name, self.sample_rate, chunkDuration=chunk_duration,
+                                  leadTime=lead_time)
+        self.queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=8)
+        self.task: asyncio.Task | None = None
+        self.first_audio_time: float | None = None
+
+    async def _chunks(self):
+        while True:
+            chunk = await self.queue.get()
+            if chunk is None:
+                return
+            yield chunk
+            if self.first_audio_time is None:
+                # the chunk has been handed to PlayStream
+                self.first_audio_time = time.monotonic()
+
+    async def open(self):
+        self.task = asyncio.create_task(self.stream.PlayAsync(self._chunks()))
+
+    async def write(self, samples: npt.NDArray[np.float32]):
+        await self.queue.put(to_int16(samples).tobytes())
+
+    async def close(self):
+        await self.queue.put(None)
+        code = await self.task
+        if code != 0:
+            logger.error("G1 PlayStream failed with code %d", code)
+        await asyncio.get_running_loop().run_in_executor(None, self.stream.WaitDone)
+
+
+# ---------------------------------------------------------------- pipeline
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    chunks_in: int = 0
+    chunks_out: int = 0
+    samples_out: int = 0
+    busy_time: float = 0.0
+    first_in: float | None = None
+    first_out: float | None = None
+
+    def to_dict(self, start: float) -> dict:
+        def since(t: float | None):
+            return None if t is None else (t - start) * 1e3
+
+        return {
+            "chunks_in": self.chunks_in,
+            "chunks_out": self.chunks_out,
+            "samples_out": self.samples_out,
+            "busy_ms": self.busy_time * 1e3,
+            "first_in_ms": since(self.first_in),
+            "first_out_ms": since(self.first_out),
+        }
+
+
+@dataclass
+class PipelineMetrics:
+    start: float
+    end: float | None = None
+    first_audio: float | None = None
+    stages: list[StageMetrics] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "time_to_first_audio_ms": None if self.first_audio is None else (self.first_audio - self.start) * 1e3,
+            "total_ms": None if self.end is None else (self.end - self.start) * 1e3,
+            "stages": {stage.name: stage.to_dict(self.start) for stage in self.stages},
+        }
+
+
+class TTSPipeline:
+    def __init__(self, source: PcmSource, sink, source_rate: int = OPENAI_TTS_SAMPLE_RATE,
+                 normalize: bool = False, stages: list | None = None, queue_size: int = 8):
+        self.source = source
+        self.sink = sink
+        # resampling to the sink rate always comes first, it also turns bytes into float32
+        self.stages = [ResampleStage(source_rate, sink.sample_rate)]
+        if normalize:
+            self.stages.append(LoudnessNormalizer(sink.sample_rate))
+        self.stages.extend(stages or [])
+        self.queue_size = queue_size
+        self.metrics: PipelineMetrics | None = None
+
+    # end of stream (None) is only sent on normal completion; on failure run()
+    # cancels every task, so nobody would be left to drain the queue
+    async def _run_source(self, out: asyncio.Queue, metrics: StageMetrics):
+        async for chunk in self.source:
+            now = time.monotonic()
+            if metrics.first_out is None:
+                metrics.first_in = metrics.first_out = now
+            metrics.chunks_out += 1
+            metrics.samples_out += len(chunk) // 2
+            await out.put(chunk)
+        await out.put(None)
+
+    async def _run_stage(self, stage, inp: asyncio.Queue, out: asyncio.Queue, metrics: StageMetrics):
+        while True:
+            data = await inp.get()
+            t0 = time.monotonic()
+            if data is None:
+                result = stage.flush()
+            else:
+                metrics.chunks_in += 1
+                if metrics.first_in is None:
+                    metrics.first_in = t0
+                result = stage.process(data)
+            metrics.busy_time += time.monotonic() - t0
+
+            if len(result) > 0:
+                if metrics.first_out is None:
+                    metrics.first_out = time.monotonic()
+                metrics.chunks_out += 1
+                metrics.samples_out += len(result)
+                await out.put(result)
+            if data is None:
+                await out.put(None)
+                return
+
+    async def _run_sink(self, inp: asyncio.Queue, metrics: StageMetrics):
+        while True:
+            samples = await inp.get()
+            if samples is None:
+                return
+            t0 = time.monotonic()
+            if metrics.first_in is None:
+                metrics.first_in = t0
+            metrics.chunks_in += 1
+            await self.sink.write(samples.reshape(-1))
+            metrics.busy_time += time.monotonic() - t0
+            metrics.chunks_out += 1
+            metrics.samples_out += len(samples)
+            if metrics.first_out is None:
+                metrics.first_out = time.monotonic()
+
+    async def run(self) -> PipelineMetrics:
+        self.metrics = metrics = PipelineMetrics(start=time.monotonic())
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        source_metrics = StageMetrics("source")
+        stage_metrics = [StageMetrics(stage.name) for stage in self.stages]
+        sink_metrics = StageMetrics(f"sink:{self.sink.name}")
+        metrics.stages = [source_metrics, *stage_metrics, sink_metrics]
+
+        await self.sink.open()
+        tasks = [asyncio.create_task(self._run_source(queues[0], source_metrics))]
+        for i, stage in enumerate(self.stages):
+            tasks.append(asyncio.create_task(self._run_stage(stage, queues[i], queues[i + 1], stage_metrics[i])))
+        tasks.append(asyncio.create_task(self._run_sink(queues[-1], sink_metrics)))
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            await self.sink.close()
+            metrics.end = time.monotonic()
+            metrics.first_audio = getattr(self.sink, "first_audio_time", None) or sink_metrics.first_out
+
+        logger.info("TTS pipeline done: %s", metrics.to_dict())
+        return metrics
+
+
+async def speak(text: str, sink, voice: str = "coral", normalize: bool = True,
+                source_factory: Callable[..., PcmSource] = openai_tts_source) -> PipelineMetrics:
+    """Speak text through sink with the default OpenAI source."""
+    return await TTSPipeline(source_factory(text, voice=voice), sink, normalize=normalize).run()
+
+
+if __name__ == "__main__":
+    import json
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="streaming TTS pipeline")
+    parser.add_argument("--openai", default=None, help="text to speak with OpenAI TTS, stub source otherwise")
+    parser.add_argument("--voice", default="coral")
+    parser.add_argument("--sink", choices=["wav", "sounddevice", "g1"], default="wav")
+    parser.add_argument("--out", default="tts_pipeline.wav", help="WAV sink path")
+    parser.add_argument("--rate", type=int, default=48000, help="WAV / sounddevice sample rate")
+    parser.add_argument("--interface", default="eth0", help="G1 network interface")
+    parser.add_argument("--no-normalize", action="store_true")
+    parser.add_argument("--first-chunk-delay", type=float, default=0.2, help="stub source time to first byte")
+    args = parser.parse_args()
+
+    if args.sink == "wav":
+        sink = WavSink(args.out, args.rate)
+    elif args.sink == "sounddevice":
+        sink = SounddeviceSink(args.rate)
+    else:
+        from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+        from unitree_sdk2py.g1.audio.g1_audio_client import AudioClient
+
+        ChannelFactoryInitialize(0, args.interface)
+        client = AudioClient()
+        client.SetTimeout(10.0)
+        client.Init()
+        sink = G1SpeakerSink(client)
+
+    if args.openai:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        source = openai_tts_source(args.openai, voice=args.voice)
+    else:
+        source = stub_source(first_chunk_delay=args.first_chunk_delay)
+
+    result = asyncio.run(TTSPipeline(source, sink, normalize=not args.no_normalize).run())
+    print(json.dumps(result.to_dict(), indent=2))
@@ -3,10 +3,10 @@ import numpy as np
 import cv2
 import os
 from PIL import Image
-import math
-from decimal import Decimal, ROUND_HALF_UP
 import time
 
+from deprojection import CameraToBody, Deprojector
+
 
 # License: Apache 2.0. See LICENSE file in root directory.
 # Copyright(c) 2025 RealSense, Inc. All Rights Reserved.
@@ -64,6 +64,11 @@ align = rs.align(align_to)
 intr = profile.get_stream(rs.stream.color).as_video_stream_profile().get_intrinsics()
 print(f"Depth camera intrinsics: {intr}")
 
+depth_scale = profile.get_device().first_depth_sensor().get_depth_scale()
+theta = 0
+# 35mm X offset between the camera and the target frame
+deprojector = Deprojector(intr, depth_scale, CameraToBody.from_pitch(theta, (-0.035, 0.0, 0.0)))
+
 
 
 # # COLOR CAMERA
@@ -142,27 +147,11 @@ while counter < 10:
     
     
 
-    dist = depth_frame.get_distance(u_depth, v_depth) * 1000 # Chuyển sang mm
-
-    Xtemp = dist * (u_depth - intr.ppx) / intr.fx
-    Ytemp = dist * (v_depth - intr.ppy) / intr.fy
-    Ztemp = dist
-    
-    print(f"Xtemp: {Xtemp}, Ytemp: {Ytemp}, Ztemp: {Ztemp}")
-
-
-    theta = 0
-    print(f"Theta: {theta}")
-    Xtarget = Xtemp - 35  # Bù 35mm sai lệch trục X
-    Ytarget = -(Ztemp * math.sin(theta) + Ytemp * math.cos(theta))
-    Ztarget = Ztemp * math.cos(theta) + Ytemp * math.sin(theta)
+    point = deprojector.deproject_pixels(depth_image, [u_depth], [v_depth])[0]
+    Xtarget, Ytarget, Ztarget = deprojector.transform.apply(point) * 1000  # mm
     print(f"Xtarget: {Xtarget}, Ytarget: {Ytarget}, Ztarget: {Ztarget}")
-    
-    
-    coordinates_text = "(" + str(Decimal(str(Xtarget)).quantize(Decimal('0'), rounding=ROUND_HALF_UP)) + \
-                                ", " + str(Decimal(str(Ytarget)).quantize(Decimal('0'), rounding=ROUND_HALF_UP)) + \
-                                ", " + str(Decimal(str(Ztarget)).quantize(Decimal('0'), rounding=ROUND_HALF_UP)) + ")"
 
+    coordinates_text = f"({Xtarget:.0f}, {Ytarget:.0f}, {Ztarget:.0f})"
     print(f"Coordinates: {coordinates_text}")
     
     # cv2.putText(color_image, coordinates_text, (u_color, v_color), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
@@ -0,0 +1,117 @@
+"""Loopback stand-ins for the robot services, shared by the MCP scripts.
+
+Stub "sport" and "videohub" RPC servers and an rt/sportmodestate publisher
+on the SDK's in-process loopback channel, so mcp_gateway.py --loopback and
+mcp_load_test.py --stub run real SportClient / VideoClient / StateCache code
+without a robot. result() is the tool reply shape both scripts return.
+"""
+
+import threading
+import time
+from typing import Any
+
+import cv2
+import numpy as np
+
+from unitree_sdk2py.core.channel import ChannelFactoryInitializeLoopback, ChannelPublisher
+from unitree_sdk2py.idl.default import unitree_go_msg_dds__SportModeState_
+from unitree_sdk2py.idl.unitree_go.msg.dds_ import SportModeState_
+from unitree_sdk2py.go2.sport.sport_api import *
+from unitree_sdk2py.go2.video.video_api import *
+from unitree_sdk2py.rpc.server import Server
+
+
+def result(code: int, data: Any = None) -> dict:
+    return {
+        "success": code == 0,
+        "message": "OK" if code == 0 else f"error code {code}",
+        "data": data,
+    }
+
+
+class StubSportServer(Server):
+    def __init__(self, service_delay: float = 0.0):
+        super().__init__(SPORT_SERVICE_NAME)
+        self.service_delay = service_delay
+        self.calls = 0
+
+    def Init(self):
+        for api_id in (SPORT_API_ID_STANDUP, SPORT_API_ID_STANDDOWN, SPORT_API_ID_STOPMOVE,
+                       SPORT_API_ID_MOVE, SPORT_API_ID_BALANCESTAND):
+            self._RegistHandler(api_id, self.Handle, 0)
+        self._SetApiVersion(SPORT_API_VERSION)
+
+    def Handle(self, parameter: str):
+        self.calls += 1
+        if self.service_delay:
+            time.sleep(self.service_delay)
+        return 0, ""
+
+
+class StubVideoServer(Server):
+    def __init__(self, width: int = 1280, height: int = 720, service_delay: float = 0.0):
+        super().__init__(VIDEO_SERVICE_NAME)
+        self.service_delay = service_delay
+        # one encoded frame, the size of a real front camera JPEG is what matters
+        x = np.linspace(0, 255, width, dtype=np.uint8)
+        image = np.dstack([np.tile(x, (height, 1))] * 3)
+        image += np.random.default_rng(0).integers(0, 32, image.shape, dtype=np.uint8)
+        self.jpeg = cv2.imencode(".jpg", image)[1].tobytes()
+
+    def Init(self):
+        self._RegistBinaryHandler(VIDEO_API_ID_GETIMAGESAMPLE, self.GetImageSample, 0)
+        self._SetApiVersion(VIDEO_API_VERSION)
+
+    def GetImageSample(self, parameter: bytes):
+        if self.service_delay:
+            time.sleep(self.service_delay)
+        return 0, self.jpeg
+
+
+class StubStatePublisher:
+    """rt/sportmodestate at a fixed rate, standing still with a moving stamp."""
+
+    def __init__(self, rate: float = 50.0):
+        self.interval = 1.0 / rate
+        self.publisher = ChannelPublisher("rt/sportmodestate", SportModeState_)
+        self.quit = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    def start(self):
+        self.publisher.Init()
+        self.thread = threading.Thread(target=self.run, name="stub_state", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.quit.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.publisher.Close()
+
+    def run(self):
+        state = unitree_go_msg_dds__SportModeState_()
+        state.body_height = 0.32
+        state.imu_state.quaternion = [1.0, 0.0, 0.0, 0.0]
+        while not self.quit.wait(self.interval):
+            now = time.time()
+            state.stamp.sec = int(now)
+            state.stamp.nanosec = int((now % 1) * 1e9)
+            self.publisher.Write(state)
+
+
+def start_stub_services(service_delay: float = 0.0) -> tuple[StubSportServer, StubVideoServer, StubStatePublisher]:
+    """Loopback channel plus stub sport / videohub servers and state publisher, call once per process."""
+    ChannelFactoryInitializeLoopback()
+
+    sport = StubSportServer(service_delay)
+    sport.Init()
+    sport.Start(False)
+
+    video = StubVideoServer(service_delay=service_delay)
+    video.Init()
+    video.Start(False)
+
+    state = StubStatePublisher()
+    state.start()
+    return sport, video, state
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+
+"""One-process MCP gateway for the sport, camera and state tools.
+
+All tool groups live in one FastAPI app and share one DDS participant
+(ChannelFactoryInitialize is called once) and one set of SDK clients:
+SportClient, VideoClient and a StateCache on rt/sportmodestate, so no rclpy
+executor thread is needed for state.
+
+    /sport/mcp    stand_up, stand_down, stop_move, move_*, turn_*, step_to_*
+    /camera/mcp   capture_image
+    /state/mcp    get_sport_mode_state, get_gateway_stats
+
+Blocking SDK calls go through ToolDispatcher: a bounded thread pool plus a
+concurrency limit per tool group. All sport tools share the "motion" group,
+so motion commands reach the SportClient one at a time; stop_move bypasses
+the limit so it is never queued behind them. A burst of calls to one group
+queues instead of tying up every worker.
+
+    python mcp_gateway.py --interface eth0
+    python mcp_gateway.py --loopback        # stub robot services, for mcp_load_test.py --url
+
+With --loopback, sport/videohub RPC and rt/sportmodestate (50 Hz) come from
+the stubs in loopback_stubs.py.
+"""
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import uvicorn
+from fastapi import FastAPI
+from fastmcp import FastMCP
+
+from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+from unitree_sdk2py.go2.sport.sport_client import SportClient
+from unitree_sdk2py.go2.video.video_client import VideoClient
+
+from loopback_stubs import result, start_stub_services
+from state_cache import StateCache
+
+logger = logging.getLogger(__name__)
+
+SPORT_TOOLS = ("stand_up", "stand_down", "move_forward", "move_backward", "turn_left", "turn_right",
+               "step_to_left", "step_to_right")
+
+# tool -> limit group, tools not listed are their own group
+DEFAULT_TOOL_GROUPS = {tool: "motion" for tool in SPORT_TOOLS}
+
+# max concurrent calls per group, groups not listed use the dispatcher default
+DEFAULT_GROUP_LIMITS = {
+    "motion": 1,
+    "capture_image": 2,
+}
+
+# run without waiting for their group
+UNLIMITED_TOOLS = {"stop_move"}
+
+MOVE_SPEED = 0.3
+TURN_SPEED = 0.5
+
+
+@dataclass
+class ToolStats:
+    calls: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    wait_time: float = 0.0
+    run_time: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "wait_ms_mean": self.wait_time / self.calls * 1e3 if self.calls else 0.0,
+            "run_ms_mean": self.run_time / self.calls * 1e3 if self.calls else 0.0,
+        }
+
+
+class ToolDispatcher:
+    def __init__(self, default_limit: int = 1, limits: dict[str, int] | None = None,
+                 max_workers: int = 8, groups: dict[str, str] | None = None,
+                 unlimited: set[str] | None = None):
+        self.default_limit = default_limit
+        self.limits = dict(limits or {})
+        self.groups = dict(groups or {})
+        self.unlimited = set(unlimited or ())
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-tool")
+        self.semaphores: dict[str, asyncio.Semaphore] = {}
+        self.stats: dict[str, ToolStats] = {}
+
+    def semaphore(self, tool: str) -> asyncio.Semaphore | None:
+        if tool in self.unlimited:
+            return None
+        group = self.groups.get(tool, tool)
+        semaphore = self.semaphores.get(group)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limits.get(group, self.default_limit))
+            self.semaphores[group] = semaphore
+        return semaphore
+
+    async def call(self, tool: str, fn: Callable, *args) -> Any:
+        """Run the blocking fn(*args) in the pool once the tool's group is below its limit."""
+        stats = self.stats.setdefault(tool, ToolStats())
+        semaphore = self.semaphore(tool)
+
+        queued = time.perf_counter()
+        async with semaphore if semaphore is not None else contextlib.nullcontext():
+            start = time.perf_counter()
+            stats.wait_time += start - queued
+            stats.calls += 1
+            stats.in_flight += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                stats.in_flight -= 1
+                stats.run_time += time.perf_counter() - start
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        return {tool: stats.to_dict() for tool, stats in self.stats.items()}
+
+
+@dataclass
+class RobotServices:
+    sport: SportClient
+    video: VideoClient
+    state: StateCache
+
+    @classmethod
+    def create(cls, interface: str | None = None, domain: int = 0, loopback: bool = False,
+               timeout: float = 5.0) -> "RobotServices":
+        if loopback:
+            start_stub_services()
+        else:
+            ChannelFactoryInitialize(domain, interface)
+
+        sport = SportClient()
+        sport.SetTimeout(timeout)
+        sport.Init()
+
+        video = VideoClient()
+        video.SetTimeout(timeout)
+        video.Init()
+
+        state = StateCache()
+        state.start()
+        return cls(sport, video, state)
+
+    def close(self):
+        self.state.stop()
+
+
+def create_sport_mcp(robot: RobotServices, dispatcher: ToolDispatcher) -> FastMCP:
+    mcp = FastMCP("go2_sport")
+
+    async def command(tool: str, fn: Callable, *args) -> dict:
+        return result(await dispatcher.call(tool, fn, *args))
+
+    @mcp.tool(description="Đứng dậy (stand up)")
+    async def stand_up():
+        return await command("stand_up", robot.sport.StandUp)
+
+    @mcp.tool(description="Nằm xuống (stand down)")
+    async def stand_down():
+        return await command("stand_down", robot.sport.StandDown)
+
+    @mcp.tool(description="Dừng di chuyển (stop moving)")
+    async def stop_move():
+        return await command("stop_move", robot.sport.StopMove)
+
+    @mcp.tool(description="Đi tới (move forward)")
+    async def move_forward():
+        return await command("move_forward", robot.sport.Move, MOVE_SPEED, 0.0, 0.0)
+
+    @mcp.tool(description="Đi lùi (move backward)")
+    async def move_backward():
+        return await command("move_backward", robot.sport.Move, -MOVE_SPEED, 0.0, 0.0)
+
+    @mcp.tool(description="Quay trái (turn left)")
+    async def turn_left():
+        return await command("turn_left", robot.sport.Move, 0.0, 0.0, TURN_SPEED)
+
+    @mcp.tool(description="Quay phải (turn right)")
+    async def turn_right():
+        return await command("turn_right", robot.sport.Move, 0.0, 0.0, -TURN_SPEED)
+
+    @mcp.tool(description="Bước sang trái (step to the left)")
+    async def step_to_left():
+        return await command("step_to_left", robot.sport.Move, 0.0, MOVE_SPEED, 0.0)
+
+    @mcp.tool(description="Bước sang phải (step to the right)")
+    async def step_to_right():
+        return await command("step_to_right", robot.sport.Move, 0.0, -MOVE_SPEED, 0.0)
+
+    return mcp
+
+
+def create_camera_mcp(robot: RobotServices, dispatcher: ToolDispatcher) -> FastMCP:
+    mcp = FastMCP("go2_camera")
+
+    @mcp.tool(description="Chụp ảnh từ camera trước (front camera JPEG, base64)")
+    async def capture_image():
+        code, data = await dispatcher.call("capture_image", robot.video.GetImageSample)
+        if code != 0:
+            return result(code)
+        return result(code, base64.b64encode(bytes(data)).decode())
+
+    return mcp
+
+
+def create_state_mcp(robot: RobotServices, dispatcher: ToolDispatcher) -> FastMCP:
+    mcp = FastMCP("go2_state")
+
+    # the cache read is cheap and non-blocking, no need for the pool
+    @mcp.tool(description="Lấy trạng thái SportMode của robot (go2)")
+    async def get_sport_mode_state():
+        state = robot.state.get()
+        if state is None:
+            return {"success": False, "message": "No state received yet", "data": {}}
+        return {"success": True, "message": "State OK", "data": state}
+
+    @mcp.tool(description="Gateway statistics: per-tool calls, queueing and state cache")
+    async def get_gateway_stats():
+        return {
+            "success": True,
+            "message": "OK",
+            "data": {"tools": dispatcher.get_stats(), "state": robot.state.get_stats()},
+        }
+
+    return mcp
+
+
+def create_app(robot: RobotServices, dispatcher: ToolDispatcher) -> FastAPI:
+    groups = {
+        "sport": create_sport_mcp(robot, dispatcher),
+        "camera": create_camera_mcp(robot, dispatcher),
+        "state": create_state_mcp(robot, dispatcher),
+    }
+    http_apps = {name: mcp.http_app(path="/mcp") for name, mcp in groups.items()}
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        try:
+            async with AsyncExitStack() as stack:
+                for mcp_http in http_apps.values():
+                    await stack.enter_async_context(mcp_http.lifespan(app))
+                yield
+        finally:
+            dispatcher.shutdown()
+            robot.close()
+
+    app = FastAPI(name="go2_mcp_gateway", lifespan=lifespan)
+    for name, mcp_http in http_apps.items():
+        app.mount(f"/{name}", mcp_http, name=name)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="unified sport / camera / state MCP gateway")
+    parser.add_argument("--interface", default="eth0", help="network interface for DDS")
+    parser.add_argument("--domain", type=int, default=0)
+    parser.add_argument("--loopback", action="store_true",
+                        help="stub sport/video services over the loopback channel, no robot")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--workers", type=int, default=8, help="threads for blocking SDK calls")
+    parser.add_argument("--default-limit", type=int, default=1, help="concurrent calls per group")
+    parser.add_argument("--limit", nargs="*", default=[], metavar="GROUP=N",
+                        help="per-group limits, e.g. capture_image=4 (sport tools are group motion)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    limits = dict(DEFAULT_GROUP_LIMITS)
+    for item in args.limit:
+        group, value = item.split("=", 1)
+        limits[group] = int(value)
+
+    robot = RobotServices.create(args.interface, args.domain, args.loopback)
+    dispatcher = ToolDispatcher(args.default_limit, limits, args.workers, DEFAULT_TOOL_GROUPS, UNLIMITED_TOOLS)
+    uvicorn.run(create_app(robot, dispatcher), host=args.host, port=args.port)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+
+"""Load test for the robot-side MCP tools, with a loopback stub server.
+
+test_mcp_sport.py / test_mcp_cam.py open a new MCP session per tool call,
+which mostly measures the session handshake. Here each worker keeps its
+session open and many call_tool requests run concurrently, so the numbers
+show what the gateway itself sustains.
+
+The stub serves the same tools under the same paths (/sport/mcp, /camera/mcp)
+as the robot, backed by real SportClient / VideoClient calls answered by
+stub "sport" and "videohub" RPC servers over the SDK's in-process loopback
+channel: MCP, JSON-RPC and SDK RPC costs are all in, the robot is not. The
+stubs, and the rt/sportmodestate publisher that keeps the gateway's state
+tool supplied, live in loopback_stubs.py.
+
+    python mcp_load_test.py --stub                          # stub + load in one process
+    python mcp_load_test.py --serve-stub --port 8001        # stub only
+    python mcp_load_test.py --url http://robot:8001 --concurrency 1 4 16 --no-reuse
+    python mcp_load_test.py --url http://localhost:8001 --tools state/get_sport_mode_state
+
+With --stub the server shares the process (and the GIL) with the load
+generator; run --serve-stub separately for cleaner numbers.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import threading
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+
+import uvicorn
+from fastapi import FastAPI
+from fastmcp import Client, FastMCP
+from fastmcp.client import StreamableHttpTransport
+
+from unitree_sdk2py.go2.sport.sport_client import SportClient
+from unitree_sdk2py.go2.video.video_client import VideoClient
+
+from loopback_stubs import result, start_stub_services
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOOLS = {
+    "sport": ["stand_up", "move_forward"],
+    "camera": ["capture_image"],
+}
+
+
+# --- stub MCP server ---
+
+def create_stub_app(sport_client: SportClient, video_client: VideoClient) -> FastAPI:
+    sport = FastMCP("go2_sport_stub")
+    camera = FastMCP("go2_camera_stub")
+
+    # SDK calls block, keep them off the event loop
+    @sport.tool(description="Stand up")
+    async def stand_up():
+        return result(await asyncio.to_thread(sport_client.StandUp))
+
+    @sport.tool(description="Stand down")
+    async def stand_down():
+        return result(await asyncio.to_thread(sport_client.StandDown))
+
+    @sport.tool(description="Move forward")
+    async def move_forward():
+        return result(await asyncio.to_thread(sport_client.Move, 0.3, 0.0, 0.0))
+
+    @camera.tool(description="Capture an image from the front camera")
+    async def capture_image():
+        code, data = await asyncio.to_thread(video_client.GetImageSample)
+        if code != 0:
+            return result(code)
+        return result(code, base64.b64encode(bytes(data)).decode())
+
+    sport_http = sport.http_app(path="/mcp", stateless_http=False)
+    camera_http = camera.http_app(path="/mcp", stateless_http=False)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        async with AsyncExitStack() as stack:
+            for mcp_http in (sport_http, camera_http):
+                await stack.enter_async_context(mcp_http.lifespan(app))
+            yield
+
+    app = FastAPI(name="go2_mcp_stub", lifespan=lifespan)
+    app.mount("/sport", sport_http, name="sport")
+    app.mount("/camera", camera_http, name="camera")
+    return app
+
+
+def serve_stub(host: str, port: int, service_delay: float = 0.0) -> uvicorn.Server:
+    start_stub_services(service_delay)
+
+    sport_client = SportClient()
+    sport_client.SetTimeout(5.0)
+    sport_client.Init()
+    video_client = VideoClient()
+    video_client.SetTimeout(5.0)
+    video_client.Init()
+
+    config = uvicorn.Config(create_stub_app(sport_client, video_client), host=host, port=port,
+                            log_level="warning")
+    return uvicorn.Server(config)
+
+
+def start_stub_thread(host: str, port: int, service_delay: float = 0.0) -> uvicorn.Server:
+    server = serve_stub(host, port, service_delay)
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.monotonic() + 10.0
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("stub server did not start")
+        time.sleep(0.05)
+    return server
+
+
+# --- load generator ---
+
+@dataclass
+class LoadResult:
+    tool: str
+    concurrency: int
+    reuse: bool
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    wall: float = 0.0
+
+    def to_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "tool": self.tool,
+            "concurrency": self.concurrency,
+            "reuse": self.reuse,
+            "calls": len(latencies),
+            "errors": self.errors,
+            "p50_ms": percentile(latencies, 0.50) * 1e3,
+            "p90_ms": percentile(latencies, 0.90) * 1e3,
+            "p99_ms": percentile(latencies, 0.99) * 1e3,
+            "max_ms": (latencies[-1] if latencies else 0.0) * 1e3,
+            "calls_per_sec": len(latencies) / self.wall if self.wall > 0 else 0.0,
+        }
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def new_client(url: str) -> Client:
+    return Client(transport=StreamableHttpTransport(url=url))
+
+
+def check(response) -> bool:
+    data = response.structured_content
+    return not response.is_error and (data is None or data.get("success", True))
+
+
+async def run_load(url: str, tool: str, calls: int, concurrency: int, reuse: bool = True,
+                   sessions: int | None = None, arguments: dict | None = None) -> LoadResult:
+    """calls tool calls from concurrency workers.
+
+    With reuse, workers share sessions (default: one per worker) opened up front;
+    without, every call opens and closes its own session like the test_mcp_* scripts.
+    """
+    load = LoadResult(tool, concurrency, reuse)
+    arguments = arguments or {}
+    remaining = calls
+
+    async def call(client: Client | None) -> bool:
+        if client is not None:
+            return check(await client.call_tool(tool, arguments, raise_on_error=False))
+        async with new_client(url) as fresh:
+            return check(await fresh.call_tool(tool, arguments, raise_on_error=False))
+
+    async def worker(client: Client | None):
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                ok = await call(client)
+            except Exception as e:
+                logger.debug(f"{tool} failed: {e}")
+                ok = False
+            if ok:
+                load.latencies.append(time.perf_counter() - start)
+            else:
+                load.errors += 1
+
+    async with AsyncExitStack() as stack:
+        clients: list[Client | None] = [None] * concurrency
+        if reuse:
+            opened = [await stack.enter_async_context(new_client(url))
+                      for _ in range(min(sessions or concurrency, concurrency))]
+            # warm up every session before timing
+            for client in opened:
+                await client.call_tool(tool, arguments, raise_on_error=False)
+            clients = [opened[i % len(opened)] for i in range(concurrency)]
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for client in clients))
+        load.wall = time.perf_counter() - start
+    return load
+
+
+def print_result(r: dict):
+    print("{:<14} conc {:>3}  {:<8} calls {:>5}  err {:>3}  p50 {:>8.2f}  p90 {:>8.2f}  p99 {:>8.2f}  "
+          "max {:>8.2f} ms  {:>8.1f} call/s".format(
+              r["tool"], r["concurrency"], "reuse" if r["reuse"] else "new", r["calls"], r["errors"],
+              r["p50_ms"], r["p90_ms"], r["p99_ms"], r["max_ms"], r["calls_per_sec"]))
+
+
+async def benchmark(base_url: str, tools: dict[str, list[str]], calls: int, concurrency: list[int],
+                    sessions: int | None, compare_new: bool) -> list[dict]:
+    results = []
+    for group, names in tools.items():
+        url = f"{base_url}/{group}/mcp"
+        for tool in names:
+            for conc in concurrency:
+                modes = [True, False] if compare_new else [True]
+                for reuse in modes:
+                    load = await run_load(url, tool, calls, conc, reuse, sessions)
+                    results.append(load.to_dict())
+                    print_result(results[-1])
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCP sport/camera tool load test")
+    parser.add_argument("--url", default=None, help="gateway base url, e.g. http://localhost:8001")
+    parser.add_argument("--stub", action="store_true", help="start the loopback stub server in-process")
+    parser.add_argument("--serve-stub", action="store_true", help="only run the stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--service-delay", type=float, default=0.0,
+                        help="stub RPC handler time, seconds")
+    parser.add_argument("--tools", nargs="*", default=None,
+                        help="group/tool to run, e.g. sport/stand_up camera/capture_image")
+    parser.add_argument("--calls", type=int, default=200, help="calls per tool and concurrency")
+    parser.add_argument("--concurrency", type=int, nargs="*", default=[1, 4, 16])
+    parser.add_argument("--sessions", type=int, default=None,
+                        help="sessions shared by the workers (default: one per worker)")
+    parser.add_argument("--no-reuse", action="store_true",
+                        help="also measure a new session per call, for comparison")
+    parser.add_argument("--json", default=None, help="write results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.serve_stub:
+        serve_stub(args.host, args.port, args.service_delay).run()
+    else:
+        if args.stub:
+            start_stub_thread(args.host, args.port, args.service_delay)
+            base_url = f"http://{args.host}:{args.port}"
+        else:
+            base_url = args.url or f"http://{args.host}:{args.port}"
+
+        tools = DEFAULT_TOOLS
+        if args.tools:
+            tools = {}
+            for name in args.tools:
+                group, tool = name.split("/", 1)
+                tools.setdefault(group, []).append(tool)
+
+        results = asyncio.run(benchmark(base_url.rstrip("/"), tools, args.calls, args.concurrency,
+                                        args.sessions, args.no_reuse))
+        if args.json is not None:
+            with open(args.json, "w") as f:
+                json.dump({"url": base_url, "results": results}, f, indent=2)
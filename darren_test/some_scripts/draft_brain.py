@@ -10,6 +10,9 @@ import sounddevice as sd
 import dataclasses
 import glob
 import base64 
+from collections import OrderedDict, deque
+
+from vad import SpeechGate, SpeechSegment, VoiceActivityDetector
 
 @dataclasses.dataclass
 class SpeechData:
@@ -83,12 +86,100 @@ def get_available_audio_capture_device_ids() -> list[int | str]:
     ]
 
 
+def scale_to_width(frame: np.ndarray, width: int | None) -> np.ndarray:
+    h, w = frame.shape[:2]
+    if width is None or width >= w:
+        return frame
+
+    return cv2.resize(frame, (width, int(h * width / w)), interpolation=cv2.INTER_AREA)
+
+
+class FrameEncodeCache:
+    """Encoded frames keyed by (frame id, width, quality), so each captured frame
+    is resized and JPEG/base64-encoded at most once per target resolution."""
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries: int = max_entries
+        self.lock = threading.Lock()
+        self.encoded: OrderedDict[tuple[int, int | None, int], str] = OrderedDict()
+        self.scaled: OrderedDict[tuple[int, int | None], np.ndarray] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get_scaled(self, frame_id: int, frame: np.ndarray, width: int | None) -> np.ndarray:
+        key = (frame_id, width)
+        with self.lock:
+            scaled = self.scaled.get(key)
+            if scaled is not None:
+                self.scaled.move_to_end(key)
+                return scaled
+
+        scaled = scale_to_width(frame, width)
+
+        with self.lock:
+            self.scaled[key] = scaled
+            while len(self.scaled) > self.max_entries:
+                self.scaled.popitem(last=False)
+
+        return scaled
+
+    def get_b64(self, frame_id: int, frame: np.ndarray, width: int | None, quality: int = 90) -> str:
+        key = (frame_id, width, quality)
+        with self.lock:
+            url = self.encoded.get(key)
+            if url is not None:
+                self.hits += 1
+                self.encoded.move_to_end(key)
+                return url
+            self.misses += 1
+
+        # encode outside the lock, a concurrent miss on the same key only wastes work
+        url = imgb64(self.get_scaled(frame_id, frame, width), quality=quality)
+
+        with self.lock:
+            self.encoded[key] = url
+            while len(self.encoded) > self.max_entries:
+                self.encoded.popitem(last=False)
+
+        return url
+
+    def get_stats(self) -> dict[str, int]:
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self.encoded)}
+
+
+@dataclasses.dataclass
+class CapturedFrame:
+    frame_id: int
+    image: np.ndarray
+    timestamp: float
+
+
+@dataclasses.dataclass
+class CaptureTiming:
+    grabbed: int = 0
+    retrieved: int = 0
+    failed: int = 0
+    grab_time: float = 0.0
+    retrieve_time: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "grabbed": self.grabbed,
+            "retrieved": self.retrieved,
+            "failed": self.failed,
+            "grab_ms_mean": self.grab_time / self.grabbed * 1e3 if self.grabbed else 0.0,
+            "retrieve_ms_mean": self.retrieve_time / self.retrieved * 1e3 if self.retrieved else 0.0,
+        }
+
+
 class VideoCaptureDevice(IDevice):
     def __init__(
         self,
         device_id: int | str, 
         fps: int = 5,
-        max_width: int = 384
+        max_width: int = 384,
+        ring_size: int = 8
     ):
         super().__init__()
 
@@ -96,7 +187,14 @@ class VideoCaptureDevice(IDevice):
         self.fps: int = fps
         self.max_width: int = max_width 
         self.lock = threading.Lock()
-        self.frame = None
+        # latest full-resolution frame; consumers scale/encode on demand through the cache
+        self.frame: np.ndarray | None = None
+        self.frame_id: int = -1
+        self.encode_cache = FrameEncodeCache()
+        # most recent retrieved frames, oldest first
+        self.ring: deque[CapturedFrame] = deque(maxlen=ring_size)
+        self.timing = CaptureTiming()
+        self.thread: threading.Thread | None = None
 
     def get_device_info(self) -> dict[str, Any]:
         return {
@@ -105,49 +203,108 @@ class VideoCaptureDevice(IDevice):
             "device_type": "video",
             "device_status": "connected",
             "fps": self.fps,
-            "max_width": self.max_width
+            "max_width": self.max_width,
+            "timing": self.get_timing()
         }
 
+    def get_timing(self) -> dict[str, Any]:
+        with self.lock:
+            return self.timing.to_dict()
+
+    def get_recent_frames(self, since: float = 0.0) -> list[CapturedFrame]:
+        with self.lock:
+            return [f for f in self.ring if f.timestamp > since]
+
+    def get_frame(self) -> tuple[int, np.ndarray | None]:
+        with self.lock:
+            return self.frame_id, self.frame
+
+    def get_scaled_frame(self, width: int | None = None) -> np.ndarray | None:
+        frame_id, frame = self.get_frame()
+        if frame is None:
+            return None
+
+        return self.encode_cache.get_scaled(frame_id, frame, width or self.max_width)
+
+    def get_image_url(self, width: int | None = None, quality: int = 70) -> str | None:
+        frame_id, frame = self.get_frame()
+        if frame is None:
+            return None
+
+        return self.encode_cache.get_b64(frame_id, frame, width or self.max_width, quality)
+
+    def start(self) -> threading.Thread:
+        # capture on a background thread, run() blocks
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self.run, name=f"video_capture_{self.device_id}", daemon=True)
+            self.thread.start()
+
+        return self.thread
+
     def run(self):
         self.running = True
         cap = cv2.VideoCapture(self.device_id)
 
         fps = cap.get(cv2.CAP_PROP_FPS)
-        h, w = cap.get(cv2.CAP_PROP_FRAME_HEIGHT), cap.get(cv2.CAP_PROP_FRAME_WIDTH)
-        
 
         interval = 0 if fps < self.fps else 1 / self.fps - 1e-5
-        last_frame_time = time.time() 
+        last_frame_time = 0.0
 
         while self.running:
-            ret, frame = cap.read()
-            current_time = time.time()
+            # grab() only dequeues the buffer; retrieve() decodes, and only for frames that are due
+            t0 = time.perf_counter()
+            ret = cap.grab()
+            t1 = time.perf_counter()
 
             if not ret:
-                logger.warning("Failed to read frame from video capture device")
+                with self.lock:
+                    self.timing.failed += 1
+                logger.warning("Failed to grab frame from video capture device")
                 break
 
+            current_time = time.time()
             if current_time - last_frame_time < interval:
+                with self.lock:
+                    self.timing.grabbed += 1
+                    self.timing.grab_time += t1 - t0
+                continue
+
+            ret, frame = cap.retrieve()
+            t2 = time.perf_counter()
+
+            if not ret:
+                with self.lock:
+                    self.timing.failed += 1
+                logger.warning("Failed to decode frame from video capture device")
                 continue
 
-            new_w = min(w, self.max_width)
-            new_h = int(h * (new_w / w)) 
+            # no resize here: callbacks get the full frame, scaling happens per consumer
+            with self.lock:
+                self.timing.grabbed += 1
+                self.timing.grab_time += t1 - t0
+                self.timing.retrieved += 1
+                self.timing.retrieve_time += t2 - t1
 
-            frame = cv2.resize(frame, (new_w, new_h))
+                self.frame = frame
+                self.frame_id += 1
+                self.ring.append(CapturedFrame(self.frame_id, frame, current_time))
 
             for callback in self.callbacks:
                 callback(frame)
 
             last_frame_time = current_time
 
-            with self.lock:
-                self.frame = frame
-
         cap.release()
 
     def stop(self):
         self.running = False
-        self.frame = None
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+        with self.lock:
+            self.frame = None
+            self.ring.clear()
 
 
 class SpeakerDevice(IDevice):
@@ -188,26 +345,92 @@ class SpeakerDevice(IDevice):
         self.running = False
 
 class AudioCaptureDevice(IDevice):
-    def __init__(self, device_id: int | str):
+    """Microphone input through a PortAudio callback stream.
+
+    Without a VAD, callbacks get every captured block as SpeechData. With a
+    VoiceActivityDetector, blocks go through a SpeechGate and callbacks only
+    get complete speech segments, so nothing downstream runs on silence.
+    """
+
+    def __init__(
+        self,
+        device_id: int | str,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        block_ms: int = 20,
+        vad: VoiceActivityDetector | None = None
+    ):
         super().__init__()
 
+        if vad is not None and vad.config.sample_rate != sample_rate:
+            raise ValueError(f"VAD expects {vad.config.sample_rate} Hz, capture is {sample_rate} Hz")
+
         self.device_id: int | str = device_id
+        self.sample_rate: int = sample_rate
+        self.channels: int = channels
+        self.blocksize: int = sample_rate * block_ms // 1000
+        self.vad: VoiceActivityDetector | None = vad
+        self.gate: SpeechGate | None = SpeechGate(vad, self.on_segment) if vad is not None else None
+        self.blocks: queue.Queue[tuple[np.ndarray, float]] = queue.Queue(maxsize=256)
+        self.dropped_blocks: int = 0
 
     def get_device_info(self) -> dict[str, Any]:
-        return {
+        info = {
             "device_id": self.device_id,
             "device_name": "AudioCaptureDevice",
             "device_type": "audio",
-            "device_status": "connected"
+            "device_status": "connected",
+            "sample_rate": self.sample_rate,
+            "dropped_blocks": self.dropped_blocks,
         }
+        if self.vad is not None:
+            info["vad"] = self.vad.get_stats()
+        return info
+
+    def emit(self, speech_data: SpeechData):
+        for callback in self.callbacks:
+            try:
+                callback(speech_data)
+            except Exception as e:
+                logger.error(f"Error in audio callback: {e}")
+
+    def on_segment(self, segment: SpeechSegment):
+        logger.debug(f"Speech segment {segment.start_time:.2f}-{segment.end_time:.2f}s")
+        self.emit(SpeechData(segment.data, segment.sample_rate, 1))
 
     def run(self):
         self.running = True
 
-        while self.running:
-            data = sd.rec(frames=1024, samplerate=44100, channels=2, dtype='int16')
-            sd.wait()
-            self.callbacks.append(data)
+        def callback(indata: np.ndarray, _frames: int, _time_info: Any, status: Any):
+            if status:
+                logger.warning(f"Audio capture status: {status}")
+            try:
+                # PortAudio reuses indata, keep a copy; VAD runs off the audio thread
+                self.blocks.put_nowait((indata.copy(), time.monotonic()))
+            except queue.Full:
+                self.dropped_blocks += 1
+
+        with sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            dtype='int16',
+            blocksize=self.blocksize,
+            device=self.device_id,
+            callback=callback
+        ):
+            while self.running:
+                try:
+                    block, capture_time = self.blocks.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+                if self.gate is not None:
+                    self.gate.process(block, capture_time)
+                else:
+                    self.emit(SpeechData(block, self.sample_rate, self.channels))
+
+    def stop(self):
+        self.running = False
 
 def image_filter(messages: list[dict[str, Any]], k: int = 2) -> list[dict[str, Any]]:
     total_images = sum(
@@ -245,7 +468,7 @@ from typing import Awaitable
 def sync2async(func: Callable[[], Any]) -> Callable[[], Awaitable[Any]]:
     async def wrapper(*args: Any, **kwargs: Any) -> Any:
         return await asyncio.to_thread(func, *args, **kwargs)
-    return wrapper if asyncio.iscoroutinefunction(func) else func
+    return func if asyncio.iscoroutinefunction(func) else wrapper
 
 @dataclasses.dataclass
 class SessionInput:
@@ -279,30 +502,39 @@ class Session:
         self.send_response: Callable[[str], None] = sync2async(ses_input.send_response)
         self.send_tool_result: Callable[[Any, Any], None] = sync2async(ses_input.send_tool_result)
 
-    async def build_complete_context(self) -> list[dict[str, Any]]:
+    async def build_complete_context(self) -> list[dict[str, Any]] | None:
+        """None when no input arrives within patience, which ends the session."""
+        try:
+            # one second of slack so inputs with their own timeout (queue.get) end first
+            # and do not leave a blocked thread behind to swallow the next input
+            text = await asyncio.wait_for(self.get_input(), timeout=self.patience + 1)
+        except (asyncio.TimeoutError, queue.Empty):
+            return None
+
         msg_content = [
             {
                 "type": "text",
-                "text": await asyncio.wait_for(
-                    self.get_input(), 
-                    timeout=self.patience
-                )
+                "text": text
             }
         ]
 
+        image_url = None
         if self.video_capture_device is not None:
-            msg_content.append( 
+            image_url = self.video_capture_device.get_image_url(width=self.max_img_width, quality=70)
+
+        if image_url is not None:
+            msg_content.extend([
                 {
                     "type": "image_url",
                     "image_url": {
-                        "url": imgb64(self.video_capture_device.frame, quality=70)
+                        "url": image_url
                     }
                 },
                 {
                     "type": "text",
                     "text": "<system-reminder>The image include more information.</system-reminder>"
                 }
-            )
+            ])
 
         prebuilt_context = self.context + [
             {
@@ -316,7 +548,10 @@ class Session:
     async def run(self) -> bool:
 
         while True:
-            messages: list[dict[str, Any]] = await self.build_complete_context()
+            messages: list[dict[str, Any]] | None = await self.build_complete_context()
+            if messages is None:
+                logger.info(f"No input for {self.patience}s, ending session")
+                break
 
             # @todo: call llm
 
@@ -328,10 +563,22 @@ class Session:
         return True
 
 class RobotBrain():
-    def __init__(self):
+    def __init__(
+        self,
+        transcribe: Callable[[SpeechData], str] | None = None,
+        hotword: str = "robot"
+    ):
         self.que: queue.Queue[SessionInput] = queue.Queue()
         self.running: bool = False
 
+        # speech segments from the VAD gate are only transcribed, never raw audio
+        self.transcribe: Callable[[SpeechData], str] | None = transcribe
+        self.hotword: str = hotword.lower()
+        self.utterances: queue.Queue[str] = queue.Queue()
+        self.voice_session: bool = False
+        # transcription runs on its own thread so it never stalls audio capture / VAD
+        self.speech_segments: queue.Queue[SpeechData | None] = queue.Queue(maxsize=8)
+
         self.video_capture_device_ids: list[int | str] = get_available_video_capture_device_ids()
         self.audio_capture_device_ids: list[int | str] = get_available_audio_capture_device_ids()
         self.speaker_device_ids: list[int | str] = get_available_speaker_device_ids()
@@ -345,12 +592,56 @@ class RobotBrain():
             self.video_capture_device = VideoCaptureDevice(self.video_capture_device_ids[0])
 
         if len(self.audio_capture_device_ids) > 0:
-            self.audio_capture_device = AudioCaptureDevice(self.audio_capture_device_ids[0])
+            self.audio_capture_device = AudioCaptureDevice(
+                self.audio_capture_device_ids[0],
+                vad=VoiceActivityDetector()
+            )
+            self.audio_capture_device.register_callback(self.on_speech)
 
         if len(self.speaker_device_ids) > 0:
             self.speaker_device = SpeakerDevice(self.speaker_device_ids[0])
 
-    # a job to listen audio capture device, wait for hot word
+    # audio capture thread: only hand the segment over
+    def on_speech(self, speech: SpeechData):
+        if self.transcribe is None:
+            return
+
+        try:
+            self.speech_segments.put_nowait(speech)
+        except queue.Full:
+            logger.warning("Transcription is falling behind, dropping speech segment")
+
+    def transcribe_worker(self):
+        while True:
+            speech = self.speech_segments.get()
+            if speech is None:
+                break
+
+            try:
+                text = self.transcribe(speech).strip()
+            except Exception as e:
+                logger.error(f"Transcription failed: {e}")
+                continue
+
+            if text:
+                self.on_text(text)
+
+    # wait for hot word, then feed the voice session
+    def on_text(self, text: str):
+
+        if self.voice_session:
+            self.utterances.put(text)
+            return
+
+        if self.hotword not in text.lower():
+            logger.debug(f"No hot word in: {text}")
+            return
+
+        self.utterances.put(text)
+        self.voice_session = self.enqueue(SessionInput(
+            get_input=lambda: self.utterances.get(timeout=self.patience)
+        ))
+
     def enqueue(
         self,
         session_input: SessionInput
@@ -365,6 +656,13 @@ class RobotBrain():
     def run(self):
         self.running = True
 
+        if self.video_capture_device is not None:
+            self.video_capture_device.start()
+
+        if self.audio_capture_device is not None:
+            threading.Thread(target=self.transcribe_worker, daemon=True).start()
+            threading.Thread(target=self.audio_capture_device.run, daemon=True).start()
+
         while self.running:
             session_input = self.que.get()
 
@@ -384,16 +682,30 @@ class RobotBrain():
                 continue
 
             finally:
+                self.voice_session = False
+                # utterances after the session timed out belong to no session
+                while not self.utterances.empty():
+                    self.utterances.get_nowait()
                 logger.info("session ended")
 
     def stop(self):
         self.running = False
 
+        if self.video_capture_device is not None:
+            self.video_capture_device.stop()
+
+        if self.audio_capture_device is not None:
+            self.audio_capture_device.stop()
+            try:
+                self.speech_segments.put_nowait(None)
+            except queue.Full:
+                pass
+
 if __name__ == "__main__":
     video_capture = VideoCaptureDevice(0, 5, 384)
 
     video_capture.register_callback(
-        lambda frame: (cv2.imshow("Frame", frame), print(len(imgb64(frame))), cv2.waitKey(1))
+        lambda frame: (cv2.imshow("Frame", frame), print(len(video_capture.get_image_url())), cv2.waitKey(1))
     )
 
     try:
@@ -0,0 +1,245 @@
+"""Streaming voice activity detection.
+
+Audio is cut into fixed 10-30 ms frames; per-frame energy and zero-crossing
+rate are computed for a whole block of frames at once with NumPy, then a
+small state machine (onset frames, hangover) turns frame decisions into
+speech segments. The noise floor adapts on non-speech frames, so the energy
+threshold follows the room.
+
+SpeechGate keeps a short pre-roll and hands complete speech segments to a
+callback, so ASR / LLM work only starts when someone talks.
+"""
+
+import dataclasses
+import logging
+import time
+from collections import deque
+from typing import Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class VadConfig:
+    sample_rate: int = 16000
+    frame_ms: int = 20
+    # speech when the frame energy is margin_db above the noise floor and above min_dbfs
+    margin_db: float = 12.0
+    min_dbfs: float = -50.0
+    # zero-crossing rate above which a frame must be much louder to count (hiss, fans)
+    zcr_max: float = 0.35
+    zcr_extra_db: float = 10.0
+    onset_ms: int = 60
+    hangover_ms: int = 400
+    # noise floor follows non-speech frames with this time constant
+    noise_tau: float = 1.0
+    initial_noise_dbfs: float = -60.0
+
+    def __post_init__(self):
+        if self.frame_ms not in (10, 20, 30):
+            raise ValueError(f"frame_ms must be 10, 20 or 30, got {self.frame_ms}")
+
+    @property
+    def frame_len(self) -> int:
+        return self.sample_rate * self.frame_ms // 1000
+
+
+@dataclasses.dataclass
+class VadEvent:
+    kind: str  # "start" or "end"
+    # stream time in seconds of the first (start) or last (end) speech frame
+    time: float
+    # audio between that frame and the decision, plus processing time
+    latency: float
+
+
+@dataclasses.dataclass
+class VadStats:
+    frames: int = 0
+    speech_frames: int = 0
+    segments: int = 0
+    cpu_time: float = 0.0
+    latency_sum: float = 0.0
+    latency_max: float = 0.0
+
+    def to_dict(self, frame_ms: int) -> dict:
+        audio = self.frames * frame_ms / 1000
+        return {
+            "frames": self.frames,
+            "speech_ratio": self.speech_frames / self.frames if self.frames else 0.0,
+            "segments": self.segments,
+            "cpu_ms": self.cpu_time * 1e3,
+            # CPU seconds per second of audio
+            "cpu_load": self.cpu_time / audio if audio else 0.0,
+            "detect_latency_ms_mean": self.latency_sum / self.segments * 1e3 if self.segments else 0.0,
+            "detect_latency_ms_max": self.latency_max * 1e3,
+        }
+
+
+def to_mono_float(samples: np.ndarray) -> np.ndarray:
+    samples = np.asarray(samples)
+    if samples.ndim == 2:
+        samples = samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+    if samples.dtype == np.int16:
+        return samples.astype(np.float32) / 32768.0
+    return samples.astype(np.float32, copy=False)
+
+
+class VoiceActivityDetector:
+    def __init__(self, config: VadConfig | None = None):
+        self.config = config or VadConfig()
+        self.frame_len = self.config.frame_len
+        self.onset_frames = max(1, self.config.onset_ms // self.config.frame_ms)
+        self.hangover_frames = max(1, self.config.hangover_ms // self.config.frame_ms)
+        self.noise_alpha = 1 - np.exp(-self.config.frame_ms / 1000 / self.config.noise_tau)
+        self.stats = VadStats()
+        self.reset()
+
+    def reset(self):
+        self.pending = np.empty(0, np.float32)
+        self.frame_index = 0
+        self.noise_db = self.config.initial_noise_dbfs
+        self.in_speech = False
+        self.run = 0  # consecutive speech (while silent) or silent (while speaking) frames
+
+    def frame_features(self, frames: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(N, frame_len) -> energy in dBFS and zero-crossing rate per frame."""
+        energy = np.einsum("ij,ij->i", frames, frames) / frames.shape[1]
+        energy_db = 10 * np.log10(energy + 1e-12)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frames.shape[1] - 1)
+        return energy_db, zcr
+
+    def process(self, samples: np.ndarray, capture_time: float | None = None) -> list[VadEvent]:
+        """Feed audio (int16 or float, mono or multi-channel), returns start/end events.
+
+        capture_time is the wall clock (time.monotonic) of the end of samples, when known;
+        it is only used for latency accounting.
+        """
+        t0 = time.perf_counter()
+        data = np.concatenate([self.pending, to_mono_float(samples)])
+        count = len(data) // self.frame_len
+        self.pending = data[count * self.frame_len:]
+        if count == 0:
+            self.stats.cpu_time += time.perf_counter() - t0
+            return []
+
+        frames = data[:count * self.frame_len].reshape(count, self.frame_len)
+        energy_db, zcr = self.frame_features(frames)
+
+        config = self.config
+        frame_s = config.frame_ms / 1000
+        events: list[VadEvent] = []
+        for i in range(count):
+            threshold = max(self.noise_db + config.margin_db, config.min_dbfs)
+            if zcr[i] > config.zcr_max:
+                threshold += config.zcr_extra_db
+            speech = energy_db[i] > threshold
+
+            if not speech:
+                self.noise_db += self.noise_alpha * (energy_db[i] - self.noise_db)
+            else:
+                self.stats.speech_frames += 1
+
+            index = self.frame_index + i
+            if self.in_speech:
+                self.run = 0 if speech else self.run + 1
+                if self.run >= self.hangover_frames:
+                    self.in_speech = False
+                    self.run = 0
+                    last = index - self.hangover_frames
+                    events.append(VadEvent("end", (last + 1) * frame_s, (index - last) * frame_s))
+            else:
+                self.run = self.run + 1 if speech else 0
+                if self.run >= self.onset_frames:
+                    self.in_speech = True
+                    self.run = 0
+                    first = index - self.onset_frames + 1
+                    events.append(VadEvent("start", first * frame_s, (index + 1 - first) * frame_s))
+
+        self.frame_index += count
+        self.stats.frames += count
+
+        elapsed = time.perf_counter() - t0
+        self.stats.cpu_time += elapsed
+        # audio still to come after the deciding frame is in pending; add processing time
+        lag = elapsed + (time.monotonic() - capture_time if capture_time is not None else 0.0)
+        for event in events:
+            event.latency += lag
+            if event.kind == "start":
+                self.stats.segments += 1
+                self.stats.latency_sum += event.latency
+                self.stats.latency_max = max(self.stats.latency_max, event.latency)
+        return events
+
+    def get_stats(self) -> dict:
+        stats = self.stats.to_dict(self.config.frame_ms)
+        stats["noise_dbfs"] = float(self.noise_db)
+        stats["in_speech"] = self.in_speech
+        return stats
+
+
+@dataclasses.dataclass
+class SpeechSegment:
+    data: np.ndarray  # float32 mono
+    sample_rate: int
+    start_time: float
+    end_time: float
+
+
+class SpeechGate:
+    """Collect audio between VAD start and end, with pre-roll, and pass each segment on."""
+
+    def __init__(self, vad: VoiceActivityDetector, on_segment: Callable[[SpeechSegment], None],
+                 preroll_ms: int = 300, max_segment_s: float = 15.0):
+        self.vad = vad
+        self.on_segment = on_segment
+        self.sample_rate = vad.config.sample_rate
+        self.preroll = deque()
+        self.preroll_len = 0
+        self.preroll_max = self.sample_rate * preroll_ms // 1000
+        self.max_segment = int(max_segment_s * self.sample_rate)
+        self.segment: list[np.ndarray] = []
+        self.segment_len = 0
+        self.segment_start = 0.0
+
+    def process(self, samples: np.ndarray, capture_time: float | None = None) -> list[VadEvent]:
+        mono = to_mono_float(samples)
+        events = self.vad.process(mono, capture_time)
+
+        for event in events:
+            if event.kind == "start":
+                self.segment = list(self.preroll)
+                self.segment_len = self.preroll_len
+                self.segment_start = max(0.0, event.time - self.preroll_len / self.sample_rate)
+
+        if self.vad.in_speech or any(event.kind == "end" for event in events):
+            self.segment.append(mono)
+            self.segment_len += len(mono)
+
+        for event in events:
+            if event.kind == "end":
+                self.emit(event.time)
+
+        if self.vad.in_speech and self.segment_len >= self.max_segment:
+            self.emit(self.segment_start + self.segment_len / self.sample_rate)
+            self.segment_start += self.segment_len / self.sample_rate
+
+        self.preroll.append(mono)
+        self.preroll_len += len(mono)
+        while self.preroll and self.preroll_len - len(self.preroll[0]) >= self.preroll_max:
+            self.preroll_len -= len(self.preroll.popleft())
+        return events
+
+    def emit(self, end_time: float):
+        if not self.segment:
+            return
+        data = np.concatenate(self.segment)
+        self.segment = []
+        self.segment_len = 0
+        try:
+            self.on_segment(SpeechSegment(data, self.sample_rate, self.segment_start, end_time))
+        except Exception as e:
+            logger.error(f"Speech segment callback failed: {e}")
@@ -0,0 +1,186 @@
+"""Latest-sample cache for robot state topics.
+
+The subscriber callback only swaps in a reference to the newest message
+(no conversion, no logging), which is all a 500 Hz topic should cost when
+the state is read a few times a second. Conversion to a dict / JSON happens
+at query time and is memoized per sequence number, so concurrent readers of
+the same sample share one conversion.
+
+Works off the SDK's ChannelSubscriber directly (no rclpy); update() can also
+be fed from any other subscriber with the same message fields, e.g. the ROS 2
+unitree_go/SportModeState.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SPORT_MODE_STATE_TOPIC = "rt/sportmodestate"
+LOW_STATE_TOPIC = "rt/lowstate"
+
+
+def _list(values: Any) -> list:
+    return np.asarray(values).tolist()
+
+
+def sport_mode_state_to_dict(msg: Any) -> dict[str, Any]:
+    return {
+        "stamp": {"sec": msg.stamp.sec, "nanosec": msg.stamp.nanosec},
+        "error_code": msg.error_code,
+        "imu_state": {
+            "quaternion": _list(msg.imu_state.quaternion),
+            "gyroscope": _list(msg.imu_state.gyroscope),
+            "accelerometer": _list(msg.imu_state.accelerometer),
+            "rpy": _list(msg.imu_state.rpy),
+            "temperature": msg.imu_state.temperature
+        },
+        "mode": msg.mode,
+        "progress": msg.progress,
+        "gait_type": msg.gait_type,
+        "foot_raise_height": msg.foot_raise_height,
+        "position": _list(msg.position),
+        "body_height": msg.body_height,
+        "velocity": _list(msg.velocity),
+        "yaw_speed": msg.yaw_speed,
+        "range_obstacle": _list(msg.range_obstacle),
+        "foot_force": _list(msg.foot_force),
+        "foot_position_body": _list(msg.foot_position_body),
+        "foot_speed_body": _list(msg.foot_speed_body),
+    }
+
+
+def low_state_to_dict(msg: Any) -> dict[str, Any]:
+    motors = msg.motor_state
+    return {
+        "tick": msg.tick,
+        "imu_state": {
+            "quaternion": _list(msg.imu_state.quaternion),
+            "gyroscope": _list(msg.imu_state.gyroscope),
+            "accelerometer": _list(msg.imu_state.accelerometer),
+            "rpy": _list(msg.imu_state.rpy),
+            "temperature": msg.imu_state.temperature
+        },
+        # one list per quantity, indexed by motor
+        "motor_state": {
+            "mode": [m.mode for m in motors],
+            "q": [m.q for m in motors],
+            "dq": [m.dq for m in motors],
+            "tau_est": [m.tau_est for m in motors],
+            "temperature": [m.temperature for m in motors],
+            "lost": [m.lost for m in motors],
+        },
+        "bms_state": {
+            "status": msg.bms_state.status,
+            "soc": msg.bms_state.soc,
+            "current": msg.bms_state.current,
+            "cycle": msg.bms_state.cycle,
+            "cell_vol": _list(msg.bms_state.cell_vol),
+        },
+        "foot_force": _list(msg.foot_force),
+        "foot_force_est": _list(msg.foot_force_est),
+        "power_v": msg.power_v,
+        "power_a": msg.power_a,
+        "temperature_ntc1": msg.temperature_ntc1,
+        "temperature_ntc2": msg.temperature_ntc2,
+    }
+
+
+class StateCache:
+    def __init__(
+        self,
+        topic: str = SPORT_MODE_STATE_TOPIC,
+        msg_type: type | None = None,
+        converter: Callable[[Any], dict[str, Any]] = sport_mode_state_to_dict
+    ):
+        self.topic = topic
+        self.msg_type = msg_type
+        self.converter = converter
+        self.subscriber = None
+
+        # (seq, receive time, message), replaced as one reference on every sample
+        self._latest: tuple[int, float, Any] | None = None
+        self._seq = 0
+
+        self._lock = threading.Lock()
+        self._dict_seq = -1
+        self._dict: dict[str, Any] | None = None
+        self._json_seq = -1
+        self._json: str | None = None
+
+        self.conversions = 0
+        self.hits = 0
+
+    def start(self):
+        """Subscribe through the SDK; ChannelFactoryInitialize must have been called."""
+        from unitree_sdk2py.core.channel import ChannelSubscriber
+
+        msg_type = self.msg_type
+        if msg_type is None:
+            from unitree_sdk2py.idl.unitree_go.msg.dds_ import SportModeState_
+            msg_type = SportModeState_
+
+        self.subscriber = ChannelSubscriber(self.topic, msg_type)
+        self.subscriber.Init(self.update, 0)
+        logger.info(f"Caching {self.topic}")
+
+    def stop(self):
+        if self.subscriber is not None:
+            self.subscriber.Close()
+            self.subscriber = None
+
+    def update(self, msg: Any):
+        # subscriber thread: count and swap the reference, nothing else
+        self._seq += 1
+        self._latest = (self._seq, time.monotonic(), msg)
+
+    def get_raw(self) -> tuple[int, float, Any] | None:
+        return self._latest
+
+    def get(self) -> dict[str, Any] | None:
+        """Latest sample as a dict (shared, do not modify), None before the first one."""
+        latest = self._latest
+        if latest is None:
+            return None
+
+        seq, _, msg = latest
+        with self._lock:
+            if self._dict_seq == seq:
+                self.hits += 1
+                return self._dict
+            state = self.converter(msg)
+            state["seq"] = seq
+            self._dict, self._dict_seq = state, seq
+            self.conversions += 1
+            return state
+
+    def get_json(self) -> str | None:
+        latest = self._latest
+        if latest is None:
+            return None
+
+        state = self.get()
+        with self._lock:
+            if self._json_seq != state["seq"]:
+                self._json = json.dumps(state, separators=(",", ":"))
+                self._json_seq = state["seq"]
+            return self._json
+
+    def get_age(self) -> float | None:
+        latest = self._latest
+        return None if latest is None else time.monotonic() - latest[1]
+
+    def get_stats(self) -> dict[str, Any]:
+        age = self.get_age()
+        return {
+            "topic": self.topic,
+            "received": self._seq,
+            "conversions": self.conversions,
+            "cache_hits": self.hits,
+            "age_ms": None if age is None else age * 1e3,
+        }
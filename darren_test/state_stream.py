@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+
+"""Push robot state to dashboards over SSE / WebSocket instead of MCP polling.
+
+    GET /stream/{topic}?fields=position,imu_state.rpy&hz=10&delta=1   (SSE, JSON)
+    WS  /ws/{topic}?fields=...&hz=...&delta=...&format=json|msgpack
+    GET /stats
+
+topic is "sportmodestate" or "lowstate". Each topic is read from a StateCache
+fed by the SDK ChannelSubscriber, so the DDS callback stays a reference swap.
+
+One fan-out loop picks up new samples; every client has its own rate limit,
+field selection and encoding, but clients asking for the same thing share
+the encoded frame: a sample is converted once and encoded once per distinct
+(fields, format, delta base), then the same bytes go to every socket.
+
+Frames are {"topic", "seq", "full", "data"}. With delta=1, "full": false
+frames only carry the leaves that changed since the previous frame sent to
+that client (merge them into the last state); a full frame is sent first and
+then every keyframe_every frames.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any
+
+import msgpack
+import uvicorn
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from state_cache import (LOW_STATE_TOPIC, SPORT_MODE_STATE_TOPIC, StateCache,
+                         low_state_to_dict, sport_mode_state_to_dict)
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("json", "sse", "msgpack")
+
+_MISSING = object()
+
+
+def select_fields(state: dict[str, Any], fields: tuple[str, ...]) -> dict[str, Any]:
+    """Keep only the given top-level or dotted keys ("imu_state.rpy"); empty keeps everything."""
+    if not fields:
+        return state
+
+    selected: dict[str, Any] = {}
+    for field in fields:
+        value: Any = state
+        for key in field.split("."):
+            value = value.get(key, _MISSING) if isinstance(value, dict) else _MISSING
+            if value is _MISSING:
+                break
+        if value is _MISSING:
+            continue
+
+        target = selected
+        keys = field.split(".")
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        target[keys[-1]] = value
+    return selected
+
+
+def diff_state(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """Leaves of current that differ from previous, nested like current."""
+    changed: dict[str, Any] = {}
+    for key, value in current.items():
+        old = previous.get(key, _MISSING)
+        if isinstance(value, dict) and isinstance(old, dict):
+            sub = diff_state(old, value)
+            if sub:
+                changed[key] = sub
+        elif old != value:
+            changed[key] = value
+    return changed
+
+
+def parse_fields(fields: str | None) -> tuple[str, ...]:
+    if not fields:
+        return ()
+    # sorted so "a,b" and "b,a" share encodings
+    return tuple(sorted({f.strip() for f in fields.split(",") if f.strip()}))
+
+
+class StreamClient:
+    def __init__(self, topic: str, fields: tuple[str, ...], hz: float, fmt: str,
+                 delta: bool, queue_size: int = 4):
+        self.topic = topic
+        self.fields = fields
+        self.interval = 1.0 / hz
+        self.format = fmt
+        self.delta = delta
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+        self.next_time = 0.0
+        self.last_seq = -1
+        # selected state of the last frame sent, delta base (shared, never modified)
+        self.last_state: dict[str, Any] | None = None
+        self.frames_since_key = 0
+
+        self.sent = 0
+        self.dropped = 0
+
+    def push(self, frame: bytes | str):
+        # a slow client loses its oldest frame rather than stalling everyone
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            # the lost frame may have carried changes, resync with a full one
+            self.last_state = None
+        self.queue.put_nowait(frame)
+        self.sent += 1
+
+
+class TelemetryHub:
+    def __init__(self, caches: dict[str, StateCache], poll_hz: float = 200.0,
+                 max_hz: float = 50.0, keyframe_every: int = 50):
+        self.caches = caches
+        self.poll_interval = 1.0 / poll_hz
+        self.max_hz = max_hz
+        self.keyframe_every = keyframe_every
+        self.clients: set[StreamClient] = set()
+        self.task: asyncio.Task | None = None
+
+        self.last_seq = {topic: -1 for topic in caches}
+        # per topic: selected states and encoded frames of the current sample only
+        self.selected: dict[str, dict] = {topic: {} for topic in caches}
+        self.frames: dict[str, dict] = {topic: {} for topic in caches}
+
+        self.encodes = 0
+        self.frames_pushed = 0
+
+    def start(self):
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    def add_client(self, topic: str, fields: str | None = None, hz: float = 10.0,
+                   fmt: str = "json", delta: bool = False) -> StreamClient:
+        if topic not in self.caches:
+            raise ValueError(f"unknown topic {topic}, expected one of {sorted(self.caches)}")
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown format {fmt}, expected one of {FORMATS}")
+        if hz <= 0:
+            raise ValueError(f"hz must be positive, got {hz}")
+
+        client = StreamClient(topic, parse_fields(fields), min(hz, self.max_hz), fmt, delta)
+        self.clients.add(client)
+        logger.info(f"Stream client on {topic}: {client.format}, {1 / client.interval:.1f} Hz, "
+                    f"fields={list(client.fields) or 'all'}, delta={delta}")
+        return client
+
+    def remove_client(self, client: StreamClient):
+        self.clients.discard(client)
+
+    async def run(self):
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Telemetry fan-out failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def poll(self):
+        now = time.monotonic()
+        for topic, cache in self.caches.items():
+            latest = cache.get_raw()
+            if latest is None:
+                continue
+
+            due = [c for c in self.clients if c.topic == topic and now >= c.next_time]
+            if not due:
+                continue
+
+            state = cache.get()
+            seq = state["seq"]
+            if seq != self.last_seq[topic]:
+                self.last_seq[topic] = seq
+                self.selected[topic].clear()
+                self.frames[topic].clear()
+
+            for client in due:
+                if client.last_seq == seq:
+                    continue
+                self.send(topic, seq, state, client)
+                # keep the cadence, but never try to catch up on missed slots
+                client.next_time += client.interval
+                if client.next_time <= now:
+                    client.next_time = now + client.interval
+
+    def send(self, topic: str, seq: int, state: dict[str, Any], client: StreamClient):
+        selected = self.selected[topic].get(client.fields)
+        if selected is None:
+            selected = select_fields(state, client.fields)
+            self.selected[topic][client.fields] = selected
+
+        full = (not client.delta or client.last_state is None
+                or client.frames_since_key >= self.keyframe_every)
+        # clients with the same base sample get the same delta
+        base = None if full else client.last_seq
+        key = (client.fields, client.format, base)
+        frame = self.frames[topic].get(key)
+        if frame is None:
+            data = selected if full else diff_state(client.last_state, selected)
+            frame = self.encode({"topic": topic, "seq": seq, "full": full, "data": data}, client.format)
+            self.frames[topic][key] = frame
+            self.encodes += 1
+
+        client.last_seq = seq
+        client.last_state = selected
+        client.frames_since_key = 0 if full else client.frames_since_key + 1
+        client.push(frame)
+        self.frames_pushed += 1
+
+    @staticmethod
+    def encode(message: dict[str, Any], fmt: str) -> bytes | str:
+        if fmt == "msgpack":
+            return msgpack.packb(message)
+        text = json.dumps(message, separators=(",", ":"))
+        if fmt == "sse":
+            return f"id: {message['seq']}\ndata: {text}\n\n".encode()
+        return text
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "clients": len(self.clients),
+            "encodes": self.encodes,
+            "frames_pushed": self.frames_pushed,
+            # frames sent per encoding done, > 1 when clients share frames
+            "fanout": self.frames_pushed / self.encodes if self.encodes else 0.0,
+            "dropped": sum(c.dropped for c in self.clients),
+            "topics": {topic: cache.get_stats() for topic, cache in self.caches.items()},
+        }
+
+
+def create_caches() -> dict[str, StateCache]:
+    from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowState_, SportModeState_
+
+    return {
+        "sportmodestate": StateCache(SPORT_MODE_STATE_TOPIC, SportModeState_, sport_mode_state_to_dict),
+        "lowstate": StateCache(LOW_STATE_TOPIC, LowState_, low_state_to_dict),
+    }
+
+
+def create_app(hub: TelemetryHub) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        for cache in hub.caches.values():
+            cache.start()
+        hub.start()
+        try:
+            yield
+        finally:
+            await hub.stop()
+            for cache in hub.caches.values():
+                cache.stop()
+
+    app = FastAPI(name="go2_state_stream", lifespan=lifespan)
+
+    @app.get("/stream/{topic}")
+    async def stream(topic: str, fields: str | None = None, hz: float = 10.0, delta: bool = False):
+        try:
+            client = hub.add_client(topic, fields, hz, "sse", delta)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        async def events():
+            try:
+                while True:
+                    yield await client.queue.get()
+            finally:
+                hub.remove_client(client)
+
+        return StreamingResponse(events(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache"})
+
+    @app.websocket("/ws/{topic}")
+    async def websocket(ws: WebSocket, topic: str, fields: str | None = None, hz: float = 10.0,
+                        delta: bool = False, format: str = "json"):
+        if format == "sse":
+            format = "json"
+        try:
+            client = hub.add_client(topic, fields, hz, format, delta)
+        except ValueError as e:
+            await ws.close(code=1008, reason=str(e))
+            return
+
+        async def sender():
+            while True:
+                frame = await client.queue.get()
+                if isinstance(frame, bytes):
+                    await ws.send_bytes(frame)
+                else:
+                    await ws.send_text(frame)
+
+        async def watcher():
+            # clients send nothing; this notices a disconnect while the topic is silent
+            while (await ws.receive())["type"] != "websocket.disconnect":
+                pass
+
+        await ws.accept()
+        tasks = [asyncio.create_task(sender()), asyncio.create_task(watcher())]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                # uvicorn raises ClientDisconnected (an OSError) on a dropped connection
+                error = task.exception()
+                if error is not None and not isinstance(error, (WebSocketDisconnect, OSError)):
+                    raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            hub.remove_client(client)
+
+    @app.get("/stats")
+    async def stats():
+        return hub.get_stats()
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="robot state telemetry stream (SSE / WebSocket)")
+    parser.add_argument("--interface", default="eth0", help="network interface for DDS")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8006)
+    parser.add_argument("--max-hz", type=float, default=50.0, help="upper bound on per-client rate")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+
+    ChannelFactoryInitialize(0, args.interface)
+    hub = TelemetryHub(create_caches(), max_hz=args.max_hz)
+    uvicorn.run(create_app(hub), host=args.host, port=args.port)
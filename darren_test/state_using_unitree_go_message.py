@@ -14,11 +14,12 @@ from fastmcp import FastMCP
 from fastapi import FastAPI
 from unitree_go.msg import SportModeState
 
+from state_cache import StateCache
+
 logger = logging.getLogger(__name__)
 
-# In-memory storage for latest state
-_latest_state_lock = threading.Lock()
-_latest_state = {}
+# Latest raw message only, converted when a tool asks for it
+_state_cache = StateCache(topic='/lf/sportmodestate')
 
 class SportStateSubscriber(Node):
     def __init__(self):
@@ -32,26 +33,7 @@ class SportStateSubscriber(Node):
         logger.info('SportState MCP Subscriber đã khởi động!')
 
     def listener_callback(self, msg):
-        logger.info(f"State updated: {msg}")
-        global _latest_state
-        state = {
-            "imu_state": {
-                "quaternion": list(msg.imu_state.quaternion),
-                "gyroscope": list(msg.imu_state.gyroscope),
-                "accelerometer": list(msg.imu_state.accelerometer),
-                "rpy": list(msg.imu_state.rpy),
-                "temperature": msg.imu_state.temperature
-            },
-            "position": list(msg.position),
-            "body_height": msg.body_height,
-            "velocity": list(msg.velocity),
-            "yaw_speed": msg.yaw_speed,
-            "foot_force": list(msg.foot_force),
-            "mode": msg.mode,
-        }
-        with _latest_state_lock:
-            _latest_state = state
-        logger.debug(f"State updated: {state}")
+        _state_cache.update(msg)
 
 # --- MCP Server wrapping ---
 
@@ -77,15 +59,19 @@ def ensure_background_ros_spin():
 @mcp.tool(description="Lấy trạng thái SportMode của robot (go2)")
 async def get_sport_mode_state() :
     ensure_background_ros_spin()
-    with _latest_state_lock:
-        state = _latest_state.copy()
+    state = _state_cache.get()
+    if state is None:
+        return {
+            "success": False,
+            "message": "No state received yet",
+            "data": {}
+        }
 
-    logger.info(f"State: {state}")
+    logger.debug(f"State seq {state['seq']}, stats: {_state_cache.get_stats()}")
     return {
         "success": True,
         "message": "State OK",
         "data": state
- 
     }
     
     
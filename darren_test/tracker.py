@@ -0,0 +1,321 @@
+"""IoU tracker around YOLOv8Detector.
+
+The detector runs every ``detect_every`` frames, or sooner when the frame
+changes enough (motion trigger), but never more often than every
+``motion_min_gap`` frames because of motion. In between, tracks are
+propagated with a constant-velocity Kalman filter, so IDs stay stable for
+"follow the person" behaviours at a fraction of the detection cost.
+
+Motion is measured between consecutive frames after removing the global
+shift (phase correlation on a thumbnail), so camera ego-motion and a person
+walking steadily do not trigger detection on every frame; a sudden change
+(someone entering, a fast turn) does.
+
+    python tracker.py --model yolov8n.pt --source 0 --classes person
+"""
+
+import argparse
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+
+import cv2
+import numpy as np
+
+from yolo import DetectionArrays, YOLOv8Detector
+
+logger = logging.getLogger("yolov8_tracker")
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of (N, 4) and (M, 4) xyxy boxes."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), np.float32)
+
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def xyxy_to_cxcywh(box: np.ndarray) -> np.ndarray:
+    return np.array([(box[0] + box[2]) / 2, (box[1] + box[3]) / 2, box[2] - box[0], box[3] - box[1]], np.float64)
+
+
+def cxcywh_to_xyxy(state: np.ndarray) -> np.ndarray:
+    cx, cy, w, h = state[:4]
+    return np.array([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], np.float32)
+
+
+class KalmanBoxFilter:
+    """Constant-velocity Kalman filter over (cx, cy, w, h) in normalized coordinates."""
+
+    def __init__(self, box: np.ndarray, position_noise: float = 0.05, velocity_noise: float = 0.5,
+                 measurement_noise: float = 0.01):
+        self.x = np.zeros(8)
+        self.x[:4] = xyxy_to_cxcywh(box)
+        self.P = np.diag([measurement_noise] * 4 + [1.0] * 4)
+        self.position_noise = position_noise
+        self.velocity_noise = velocity_noise
+        self.R = np.eye(4) * measurement_noise ** 2
+        self.H = np.hstack([np.eye(4), np.zeros((4, 4))])
+
+    def predict(self, dt: float):
+        F = np.eye(8)
+        F[:4, 4:] = np.eye(4) * dt
+        Q = np.diag([(self.position_noise * dt) ** 2] * 4 + [(self.velocity_noise * dt) ** 2] * 4)
+        self.x = F @ self.x
+        # keep width/height positive
+        self.x[2:4] = np.maximum(self.x[2:4], 1e-4)
+        self.P = F @ self.P @ F.T + Q
+
+    def update(self, box: np.ndarray):
+        z = xyxy_to_cxcywh(box)
+        y = z - self.H @ self.x
+        S = self.H @ self.P @ self.H.T + self.R
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ y
+        self.P = (np.eye(8) - K @ self.H) @ self.P
+
+    @property
+    def box(self) -> np.ndarray:
+        return np.clip(cxcywh_to_xyxy(self.x), 0.0, 1.0)
+
+
+@dataclass
+class Track:
+    track_id: int
+    class_id: int
+    name: str
+    conf: float
+    filter: KalmanBoxFilter
+    hits: int = 1
+    misses: int = 0
+    # frames since the box was last corrected by a detection
+    predicted_frames: int = 0
+
+    @property
+    def xyxyn(self) -> np.ndarray:
+        return self.filter.box
+
+    def to_dict(self) -> dict:
+        return {
+            "track_id": self.track_id,
+            "name": self.name,
+            "conf": self.conf,
+            "xyxyn": self.xyxyn.tolist(),
+            "predicted": self.predicted_frames > 0,
+        }
+
+
+@dataclass
+class TrackerStats:
+    frames: int = 0
+    detections: int = 0
+    motion_triggers: int = 0
+    detect_time: float = 0.0
+    track_time: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "frames": self.frames,
+            "detections": self.detections,
+            "motion_triggers": self.motion_triggers,
+            "detect_ratio": self.detections / self.frames if self.frames else 0.0,
+            "detect_ms_mean": self.detect_time / self.detections * 1e3 if self.detections else 0.0,
+            "track_ms_mean": self.track_time / self.frames * 1e3 if self.frames else 0.0,
+        }
+
+
+class MotionTrigger:
+    """Mean absolute difference of a small grayscale thumbnail against the previous frame,
+    after aligning the two by their global translation."""
+
+    def __init__(self, threshold: float = 8.0, width: int = 64):
+        self.threshold = threshold
+        self.width = width
+        self.previous: np.ndarray | None = None
+        self.window: np.ndarray | None = None
+
+    def thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        h, w = frame.shape[:2]
+        small = cv2.resize(frame, (self.width, max(1, h * self.width // w)), interpolation=cv2.INTER_AREA)
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        return small.astype(np.float32)
+
+    def residual(self, previous: np.ndarray, current: np.ndarray) -> float:
+        h, w = current.shape
+        if self.window is None or self.window.shape != current.shape:
+            self.window = cv2.createHanningWindow((w, h), cv2.CV_32F)
+
+        # pan / tilt of the robot shows up as a translation of the whole thumbnail.
+        # phaseCorrelate applies the window to its inputs in place, hence the copies
+        (dx, dy), _ = cv2.phaseCorrelate(previous.copy(), current.copy(), self.window)
+        shift = np.float32([[1, 0, dx], [0, 1, dy]])
+        aligned = cv2.warpAffine(previous, shift, (w, h))
+
+        # ignore the border uncovered by the shift
+        mx = min(w // 2 - 1, int(np.ceil(abs(dx))) + 1)
+        my = min(h // 2 - 1, int(np.ceil(abs(dy))) + 1)
+        return float(cv2.absdiff(aligned, current)[my:h - my, mx:w - mx].mean())
+
+    def moved(self, thumbnail: np.ndarray) -> bool:
+        """Call once per frame, True when the frame changed beyond the global shift."""
+        previous, self.previous = self.previous, thumbnail
+        if previous is None or previous.shape != thumbnail.shape:
+            return False
+        return self.residual(previous, thumbnail) > self.threshold
+
+    def reset(self):
+        self.previous = None
+
+
+@dataclass
+class ObjectTracker:
+    detector: YOLOv8Detector
+    # scheduled detection period, in frames
+    detect_every: int = 5
+    motion_threshold: float | None = 8.0
+    # motion can trigger a detection at most once per motion_min_gap frames since the last one
+    motion_min_gap: int = 2
+    iou_threshold: float = 0.3
+    max_misses: int = 3
+    min_hits: int = 2
+    classes: set[str] | None = None
+
+    tracks: list[Track] = field(default_factory=list)
+    stats: TrackerStats = field(default_factory=TrackerStats)
+
+    def __post_init__(self):
+        self.ids = itertools.count(1)
+        self.motion = MotionTrigger(self.motion_threshold) if self.motion_threshold is not None else None
+        self.frames_since_detect = self.detect_every
+        self.last_time: float | None = None
+
+    def update(self, frame: np.ndarray, timestamp: float | None = None) -> list[Track]:
+        """Feed one BGR frame, returns the confirmed tracks."""
+        now = timestamp if timestamp is not None else time.monotonic()
+        dt = now - self.last_time if self.last_time is not None else 0.0
+        self.last_time = now
+        self.stats.frames += 1
+
+        t0 = time.perf_counter()
+        for track in self.tracks:
+            track.filter.predict(dt)
+            track.predicted_frames += 1
+
+        moved = self.motion is not None and self.motion.moved(self.motion.thumbnail(frame))
+        self.frames_since_detect += 1
+        run_detector = self.frames_since_detect >= self.detect_every
+        if not run_detector and moved and self.frames_since_detect >= self.motion_min_gap:
+            run_detector = True
+            self.stats.motion_triggers += 1
+        self.stats.track_time += time.perf_counter() - t0
+
+        if run_detector:
+            t1 = time.perf_counter()
+            detections = self.detector.detect_image(frame, as_arrays=True)
+            self.stats.detect_time += time.perf_counter() - t1
+            self.stats.detections += 1
+            self.frames_since_detect = 0
+            self.associate(detections)
+
+        return self.get_tracks()
+
+    def associate(self, detections: DetectionArrays):
+        keep = np.ones(len(detections.cls), bool)
+        if self.classes is not None:
+            keep = np.array([self.class_name(c) in self.classes for c in detections.cls.tolist()], bool)
+        boxes, confs, classes = detections.xyxyn[keep], detections.conf[keep], detections.cls[keep]
+
+        track_boxes = np.array([track.xyxyn for track in self.tracks], np.float32).reshape(-1, 4)
+        iou = iou_matrix(track_boxes, boxes)
+        # tracks never match detections of another class
+        for i, track in enumerate(self.tracks):
+            iou[i, classes != track.class_id] = 0.0
+
+        # greedy assignment, highest IoU first
+        matched_tracks, matched_dets = set(), set()
+        for flat in np.argsort(-iou, axis=None):
+            i, j = divmod(int(flat), iou.shape[1])
+            if iou[i, j] < self.iou_threshold:
+                break
+            if i in matched_tracks or j in matched_dets:
+                continue
+            track = self.tracks[i]
+            track.filter.update(boxes[j])
+            track.conf = float(confs[j])
+            track.hits += 1
+            track.misses = 0
+            track.predicted_frames = 0
+            matched_tracks.add(i)
+            matched_dets.add(j)
+
+        for i, track in enumerate(self.tracks):
+            if i not in matched_tracks:
+                track.misses += 1
+        self.tracks = [track for track in self.tracks if track.misses <= self.max_misses]
+
+        for j in range(len(boxes)):
+            if j in matched_dets:
+                continue
+            class_id = int(classes[j])
+            self.tracks.append(Track(next(self.ids), class_id, self.class_name(class_id), float(confs[j]),
+                                     KalmanBoxFilter(boxes[j])))
+
+    def class_name(self, class_id: int) -> str:
+        names = self.detector.class_names
+        return names[class_id] if class_id < len(names) else "unknown"
+
+    def get_tracks(self) -> list[Track]:
+        return [track for track in self.tracks if track.hits >= self.min_hits]
+
+    def get_stats(self) -> dict:
+        stats = self.stats.to_dict()
+        stats["tracks"] = len(self.tracks)
+        return stats
+
+    def reset(self):
+        self.tracks = []
+        self.frames_since_detect = self.detect_every
+        self.last_time = None
+        if self.motion is not None:
+            self.motion.reset()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="YOLOv8 detection + IoU/Kalman tracking")
+    parser.add_argument("--model", default="yolov8n.pt")
+    parser.add_argument("--world", action="store_true", help="load as YOLOWorld")
+    parser.add_argument("--source", default="0", help="camera index or video file")
+    parser.add_argument("--detect-every", type=int, default=5)
+    parser.add_argument("--motion-threshold", type=float, default=8.0, help="negative to disable")
+    parser.add_argument("--motion-min-gap", type=int, default=2,
+                        help="min frames between motion-triggered detections")
+    parser.add_argument("--classes", nargs="*", default=None, help="only track these class names")
+    args = parser.parse_args()
+
+    detector = YOLOv8Detector(model_path=args.model, use_world=args.world, device="cpu")
+    tracker = ObjectTracker(detector, detect_every=args.detect_every,
+                            motion_threshold=args.motion_threshold if args.motion_threshold >= 0 else None,
+                            motion_min_gap=args.motion_min_gap,
+                            classes=set(args.classes) if args.classes else None)
+
+    cap = cv2.VideoCapture(int(args.source) if args.source.isdigit() else args.source)
+    try:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            tracks = tracker.update(frame)
+            print(tracker.stats.frames, [track.to_dict() for track in tracks])
+    finally:
+        cap.release()
+        print(tracker.get_stats())
@@ -4,21 +4,99 @@ from ultralytics.engine.model import Model
 import logging
 from PIL import Image
 import io
+import threading
 import time
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("yolov8_inference")
 
+ImageInput = bytes | Image.Image | np.ndarray
+
+
+@dataclass
+class LetterboxInfo:
+    ratio: float
+    pad_x: int
+    pad_y: int
+    width: int
+    height: int
+
+
+@dataclass
+class DetectionArrays:
+    xyxyn: np.ndarray  # (N, 4) float32, normalized to the original image
+    conf: np.ndarray  # (N,) float32
+    cls: np.ndarray  # (N,) int32
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.int32))
+
+    def to_list(self, class_names: list[str]) -> list[dict]:
+        return [{
+            "name": class_names[c] if c < len(class_names) else "unknown",
+            "xyxyn": box
+        } for box, c in zip(self.xyxyn.tolist(), self.cls.tolist())]
+
+
+class Letterbox:
+    """Resize-and-pad BGR frames into preallocated square buffers.
+
+    One buffer per batch slot, reused across calls; the padding is only
+    refilled when the frame geometry changes.
+    """
+
+    def __init__(self, imgsz: int = 640, fill: int = 114):
+        self.imgsz = imgsz
+        self.fill = fill
+        self.buffers: list[np.ndarray] = []
+        self.geometry: list[tuple | None] = []
+
+    def __call__(self, image: np.ndarray, index: int = 0) -> tuple[np.ndarray, LetterboxInfo]:
+        while len(self.buffers) <= index:
+            self.buffers.append(np.full((self.imgsz, self.imgsz, 3), self.fill, dtype=np.uint8))
+            self.geometry.append(None)
+
+        h, w = image.shape[:2]
+        ratio = min(self.imgsz / h, self.imgsz / w)
+        new_w, new_h = min(self.imgsz, round(w * ratio)), min(self.imgsz, round(h * ratio))
+        pad_x, pad_y = (self.imgsz - new_w) // 2, (self.imgsz - new_h) // 2
+
+        buffer = self.buffers[index]
+        if self.geometry[index] != (new_w, new_h):
+            buffer.fill(self.fill)
+            self.geometry[index] = (new_w, new_h)
+
+        # resize straight into the buffer
+        view = buffer[pad_y:pad_y + new_h, pad_x:pad_x + new_w]
+        if (new_w, new_h) == (w, h):
+            view[...] = image
+        else:
+            cv2.resize(image, (new_w, new_h), dst=view, interpolation=cv2.INTER_LINEAR)
+        return buffer, LetterboxInfo(ratio, pad_x, pad_y, w, h)
+
+
 class YOLOv8Detector:
     def __init__(
         self,
         model_path: str,
         use_world: bool = True,
-        custom_classes=None
+        custom_classes=None,
+        device: str | None = None,
+        imgsz: int = 640
     ):
         t0 = time.time()
         self.model_path = model_path
         self.use_world = use_world
+        self.device = device
+        self.imgsz = imgsz
+        self.letterbox = Letterbox(imgsz)
+        # the model and the letterbox buffers are shared state
+        self.lock = threading.Lock()
         
         logger.info(f"Loading model from {self.model_path} ...")
         if use_world:
@@ -34,39 +112,105 @@ class YOLOv8Detector:
             self.class_names = self.class_names + list(custom_classes)
             self.model.set_classes(self.class_names)
 
-    def detect_image(self, img_bytes: bytes | Image.Image):
-        if isinstance(img_bytes, bytes):
+    def _load_image(self, img_bytes: ImageInput):
+        if isinstance(img_bytes, np.ndarray):
+            if img_bytes.ndim != 3 or img_bytes.shape[2] != 3 or img_bytes.dtype != np.uint8:
+                logger.error(f"Invalid image array: {img_bytes.shape} {img_bytes.dtype}, expected HxWx3 uint8 BGR")
+                return None
+            return img_bytes
+        elif isinstance(img_bytes, bytes):
             try:
-                pil_img = Image.open(io.BytesIO(img_bytes)).convert("RGB")
+                return Image.open(io.BytesIO(img_bytes)).convert("RGB")
             except Exception as e:
                 logger.error(f"Error loading image from bytes: {e}")
-                return []
+                return None
         elif isinstance(img_bytes, Image.Image):
-            pil_img = img_bytes
+            return img_bytes
         else:
             logger.error(f"Invalid image type: {type(img_bytes)}")
-            return []
+            return None
+
+    def _prepare(self, images: list[ImageInput]):
+        # NumPy frames go through the letterbox buffers, everything else to ultralytics as is
+        inputs, infos = [], []
+        for img in images:
+            loaded = self._load_image(img)
+            info = None
+            if isinstance(loaded, np.ndarray):
+                loaded, info = self.letterbox(loaded, len(inputs))
+            inputs.append(loaded)
+            infos.append(info)
+        return inputs, infos
+
+    def _parse_arrays(self, result, info: LetterboxInfo | None) -> DetectionArrays:
+        if result is None or not hasattr(result, "boxes") or result.boxes is None:
+            return DetectionArrays.empty()
+
+        boxes = result.boxes
+        conf = boxes.conf.cpu().numpy().astype(np.float32, copy=False)
+        cls = boxes.cls.cpu().numpy().astype(np.int32)
+        if info is None:
+            xyxyn = boxes.xyxyn.cpu().numpy().astype(np.float32, copy=False)
+        else:
+            # undo the letterbox, normalize to the original frame
+            xyxyn = boxes.xyxy.cpu().numpy().astype(np.float32)
+            xyxyn[:, [0, 2]] = (xyxyn[:, [0, 2]] - info.pad_x) / (info.ratio * info.width)
+            xyxyn[:, [1, 3]] = (xyxyn[:, [1, 3]] - info.pad_y) / (info.ratio * info.height)
+            np.clip(xyxyn, 0.0, 1.0, out=xyxyn)
+        return DetectionArrays(xyxyn, conf, cls)
+
+    def _run(self, images: list[ImageInput], as_arrays: bool):
+        with self.lock:
+            inputs, infos = self._prepare(images)
+            valid = [i for i, img in enumerate(inputs) if img is not None]
+            results = []
+            if valid:
+                results = self.model([inputs[i] for i in valid], stream=False, device=self.device,
+                                     imgsz=self.imgsz, verbose=False)
+
+        out = [DetectionArrays.empty() for _ in images]
+        for i, result in zip(valid, results):
+            logger.debug(f"Boxes: {result.boxes}")
+            out[i] = self._parse_arrays(result, infos[i])
+
+        if as_arrays:
+            return out
+        return [arrays.to_list(self.class_names) for arrays in out]
+
+    def detect_image(self, img_bytes: ImageInput, as_arrays: bool = False):
+        """Detect objects in one image: JPEG/PNG bytes, a PIL image, or a BGR uint8 array.
 
+        Returns a list of {"name", "xyxyn"} dicts, or DetectionArrays when as_arrays is set.
+        """
         t0 = time.time()
-        results = self.model(pil_img, stream=False)
+        result = self._run([img_bytes], as_arrays)[0]
         logger.info(f"Detection done in {time.time() - t0:.4f}s")
-        if not results or not hasattr(results[0], "boxes") or results[0].boxes is None:
+        return result
+
+    def detect_batch(self, images: list[ImageInput], as_arrays: bool = False):
+        """Run one forward pass over several images, one detection result per input."""
+        if not images:
             return []
-        
-        out = []
-        print("Boxes: ", results[0].boxes)
-        boxes_obj = results[0].boxes.xyxyn.cpu().numpy().tolist()
-        class_idx = results[0].boxes.cls.cpu().numpy().tolist()
-        for box, class_idx in zip(boxes_obj, class_idx):
-            class_name = self.class_names[int(class_idx)] if int(class_idx) < len(self.class_names) else "unknown"
-            out.append({
-                "name": class_name,
-                "xyxyn": box
-            })
-        return out
-
-detector = YOLOv8Detector(model_path="/home/ubuntu/go2w-backup/darren_test/yolov8m.pt")
-with open("/home/ubuntu/go2w-backup/darren_test/imgs/img4.jpg", "rb") as f:
-    img_bytes = f.read()
-detections = detector.detect_image(img_bytes)
-print(detections)
+
+        t0 = time.time()
+        results = self._run(images, as_arrays)
+        logger.info(f"Batch detection of {len(images)} images done in {time.time() - t0:.4f}s")
+        return results
+
+    def export(self, format: str = "onnx", batch: int = 1, imgsz: int = 640, dynamic: bool = False) -> str:
+        """Export the model for CPU inference ("onnx" or "openvino").
+
+        The returned path can be loaded back with ``YOLOv8Detector(path, use_world=False)``.
+        """
+        t0 = time.time()
+        path = self.model.export(format=format, batch=batch, imgsz=imgsz, dynamic=dynamic, device="cpu")
+        logger.info(f"Exported {self.model_path} to {path} in {time.time() - t0:.4f}s")
+        return str(path)
+
+
+if __name__ == "__main__":
+    detector = YOLOv8Detector(model_path="/home/ubuntu/go2w-backup/darren_test/yolov8m.pt")
+    with open("/home/ubuntu/go2w-backup/darren_test/imgs/img4.jpg", "rb") as f:
+        img_bytes = f.read()
+    detections = detector.detect_image(img_bytes)
+    print(detections)
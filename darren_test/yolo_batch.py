@@ -0,0 +1,210 @@
+"""Batching inference server around YOLOv8Detector.
+
+Frames submitted from several cameras within ``max_wait`` seconds are run as
+one batch; each ``submit`` returns a Future resolved with that frame's
+detections.
+
+Throughput benchmark (CPU only, synthetic images):
+
+    python yolo_batch.py --model yolov8n.pt --batch-sizes 1 2 4 8
+    python yolo_batch.py --model yolov8n.pt --export onnx --batch-sizes 1 4 8
+"""
+
+import argparse
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+from PIL import Image
+
+from yolo import ImageInput, YOLOv8Detector
+
+logger = logging.getLogger("yolov8_batch")
+
+
+@dataclass
+class BatchRequest:
+    image: ImageInput
+    camera_id: str | None
+    future: Future
+    submit_time: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class BatchStats:
+    requests: int = 0
+    batches: int = 0
+    images: int = 0
+    errors: int = 0
+    infer_time: float = 0.0
+    wait_time: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.images / self.batches if self.batches else 0.0,
+            "errors": self.errors,
+            "infer_ms_per_image": self.infer_time / self.images * 1e3 if self.images else 0.0,
+            "wait_ms_mean": self.wait_time / self.images * 1e3 if self.images else 0.0,
+        }
+
+
+class BatchInferenceServer:
+    def __init__(self, detector: YOLOv8Detector, max_batch: int = 8, max_wait: float = 0.01, queue_size: int = 64):
+        self.detector = detector
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self.queue: queue.Queue[BatchRequest | None] = queue.Queue(maxsize=queue_size)
+        self.stats = BatchStats()
+        self.lock = threading.Lock()
+        self.thread: threading.Thread | None = None
+        self.running = False
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="yolo_batch", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+        # fail whatever is still queued
+        while True:
+            try:
+                request = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request.future.set_exception(RuntimeError("BatchInferenceServer stopped"))
+
+    def submit(self, image: ImageInput, camera_id: str | None = None) -> Future:
+        future = Future()
+        if not self.running:
+            future.set_exception(RuntimeError("BatchInferenceServer is not running"))
+            return future
+
+        self.queue.put(BatchRequest(image, camera_id, future))
+        with self.lock:
+            self.stats.requests += 1
+        return future
+
+    def detect(self, image: ImageInput, camera_id: str | None = None, timeout: float | None = None):
+        return self.submit(image, camera_id).result(timeout)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            stats = self.stats.to_dict()
+        stats["queued"] = self.queue.qsize()
+        return stats
+
+    def _collect(self) -> list[BatchRequest]:
+        first = self.queue.get()
+        if first is None:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                # stop requested, finish this batch first
+                self.running = False
+                break
+            batch.append(request)
+        return batch
+
+    def run(self):
+        while self.running:
+            batch = self._collect()
+            if not batch:
+                continue
+
+            start = time.monotonic()
+            try:
+                results = self.detector.detect_batch([request.image for request in batch])
+            except Exception as e:
+                logger.error(f"Batch inference failed: {e}")
+                with self.lock:
+                    self.stats.errors += 1
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            end = time.monotonic()
+
+            with self.lock:
+                self.stats.batches += 1
+                self.stats.images += len(batch)
+                self.stats.infer_time += end - start
+                self.stats.wait_time += sum(start - request.submit_time for request in batch)
+
+            for request, result in zip(batch, results):
+                request.future.set_result(result)
+
+
+def benchmark(detector: YOLOv8Detector, batch_sizes: list[int], images: int, cameras: int, size: tuple[int, int]):
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    frames = [Image.fromarray(rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)) for _ in range(cameras)]
+
+    # warm up
+    detector.detect_batch(frames[:1])
+
+    results = []
+    for batch_size in batch_sizes:
+        server = BatchInferenceServer(detector, max_batch=batch_size, max_wait=0.02, queue_size=images)
+        server.start()
+
+        t0 = time.perf_counter()
+        futures = [server.submit(frames[i % cameras], f"cam{i % cameras}") for i in range(images)]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - t0
+
+        server.stop()
+        stats = server.get_stats()
+        results.append({"batch_size": batch_size, "images_per_sec": images / elapsed, **stats})
+        print(f"batch {batch_size:>3}  {images / elapsed:8.2f} img/s  "
+              f"mean batch {stats['mean_batch_size']:5.2f}  {stats['infer_ms_per_image']:8.2f} ms/img")
+    return results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="YOLOv8 batched inference throughput on CPU")
+    parser.add_argument("--model", default="yolov8n.pt")
+    parser.add_argument("--world", action="store_true", help="load as YOLOWorld")
+    parser.add_argument("--export", choices=["onnx", "openvino"], default=None,
+                        help="export the model and benchmark the exported one")
+    parser.add_argument("--batch-sizes", type=int, nargs="*", default=[1, 2, 4, 8])
+    parser.add_argument("--images", type=int, default=64)
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+
+    detector = YOLOv8Detector(model_path=args.model, use_world=args.world, device="cpu")
+    if args.export is not None:
+        # dynamic batch so one export serves every batch size
+        path = detector.export(format=args.export, batch=max(args.batch_sizes), dynamic=True)
+        detector = YOLOv8Detector(model_path=path, use_world=False, device="cpu")
+
+    benchmark(detector, args.batch_sizes, args.images, args.cameras, (args.width, args.height))
@@ -0,0 +1,45 @@
+from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+from unitree_sdk2py.b2.front_video.front_video_client import FrontVideoClient
+from unitree_sdk2py.b2.back_video.back_video_client import BackVideoClient
+from unitree_sdk2py.utils.video_stream import VideoStream
+import cv2
+import sys
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        ChannelFactoryInitialize(0, sys.argv[1])
+    else:
+        ChannelFactoryInitialize(0)
+
+    frontCameraClient = FrontVideoClient()  # Create a front camera video client
+    frontCameraClient.SetTimeout(3.0)
+    frontCameraClient.Init()
+
+    backCameraClient = BackVideoClient()  # Create a back camera video client
+    backCameraClient.SetTimeout(3.0)
+    backCameraClient.Init()
+
+    # Both cameras stream concurrently, each with its own fetch and decode threads
+    streams = {
+        "Front Camera": VideoStream(frontCameraClient),
+        "Back Camera": VideoStream(backCameraClient),
+    }
+    for stream in streams.values():
+        stream.Start()
+
+    while True:
+        for name, stream in streams.items():
+            frame = stream.GetLatestFrame()
+            if frame is not None:
+                cv2.imshow(name, frame.image)
+
+        # Press ESC to stop
+        if cv2.waitKey(20) == 27:
+            break
+
+    for name, stream in streams.items():
+        stream.Stop()
+        print(name, "stats:", stream.GetStats())
+
+    # Clean up windows
+    cv2.destroyAllWindows()
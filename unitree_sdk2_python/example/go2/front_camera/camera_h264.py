@@ -0,0 +1,36 @@
+from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+from unitree_sdk2py.go2.video.front_video_stream import FrontVideoStream
+import cv2
+import sys
+
+
+if __name__ == "__main__":
+    if len(sys.argv)>1:
+        ChannelFactoryInitialize(0, sys.argv[1])
+    else:
+        ChannelFactoryInitialize(0)
+
+    # Decode the rt/frontvideostream H.264 topic in-process (needs: pip install av)
+    stream = FrontVideoStream("720p")
+    stream.Init()
+    stream.Start()
+
+    count = 0
+    while True:
+        frame = stream.GetFrame(timeout=3.0)
+        if frame is None:
+            print("No frame received. stats:", stream.GetStats())
+            break
+
+        cv2.imshow("front_camera_h264", frame.image)
+
+        count += 1
+        if count % 100 == 0:
+            print("stream stats:", stream.GetStats())
+
+        # Press ESC to stop
+        if cv2.waitKey(1) == 27:
+            break
+
+    stream.Close()
+    cv2.destroyWindow("front_camera_h264")
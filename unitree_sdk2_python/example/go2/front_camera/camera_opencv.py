@@ -23,7 +23,7 @@ if __name__ == "__main__":
         code, data = client.GetImageSample()
 
         # Convert to numpy image
-        image_data = np.frombuffer(bytes(data), dtype=np.uint8)
+        image_data = np.frombuffer(data, dtype=np.uint8)
         image = cv2.imdecode(image_data, cv2.IMREAD_COLOR)
 
         # Display image
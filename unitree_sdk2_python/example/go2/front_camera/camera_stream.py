@@ -0,0 +1,40 @@
+from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+from unitree_sdk2py.go2.video.video_client import VideoClient
+from unitree_sdk2py.utils.video_stream import VideoStream
+import cv2
+import sys
+
+
+if __name__ == "__main__":
+    if len(sys.argv)>1:
+        ChannelFactoryInitialize(0, sys.argv[1])
+    else:
+        ChannelFactoryInitialize(0)
+
+    client = VideoClient()  # Create a video client
+    client.SetTimeout(3.0)
+    client.Init()
+
+    # Keep 2 requests in flight, decode on 2 threads, always show the newest frame
+    stream = VideoStream(client, fetchers=2, decoders=2)
+    stream.Start()
+
+    count = 0
+    while True:
+        frame = stream.GetFrame(timeout=3.0)
+        if frame is None:
+            print("No frame received.")
+            break
+
+        cv2.imshow("front_camera", frame.image)
+
+        count += 1
+        if count % 100 == 0:
+            print("stream stats:", stream.GetStats())
+
+        # Press ESC to stop
+        if cv2.waitKey(1) == 27:
+            break
+
+    stream.Stop()
+    cv2.destroyWindow("front_camera")
@@ -6,6 +6,7 @@ import logging
 
 from unitree_sdk2py.core.channel import ChannelSubscriber, ChannelFactoryInitialize
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import HeightMap_
+from unitree_sdk2py.go2.height_map.height_map import HeightMapGrid
 
 # Setup logging
 logging.basicConfig(
@@ -56,6 +57,7 @@ TOPIC_CLOUD = "rt/utlidar/height_map_array"
 class StateReader:
     def __init__(self):
         self.last_print = 0
+        self.height_map = HeightMapGrid(200)
 
     def Init(self):
         logging.info(f"Initializing channel subscriber for topic: {TOPIC_CLOUD}")
@@ -64,6 +66,8 @@ class StateReader:
         logging.info("Channel subscriber initialized.")
 
     def StateCallback(self, msg: HeightMap_):
+        self.height_map.Update(msg)
+
         now = time.time()
         if now - self.last_print < 0.2:
             return
@@ -76,7 +80,15 @@ class StateReader:
             f"\n\tframe = {msg.frame_id}"
             f"\n\twidth = {msg.width}"
             f"\n\theight = {msg.height}"
-            f"\n\tresolution = {msg.resolution}\n"
+            f"\n\tresolution = {msg.resolution}"
+        )
+
+        # traversability around the map center (robot position)
+        cx = msg.origin[0] + msg.width * msg.resolution / 2
+        cy = msg.origin[1] + msg.height * msg.resolution / 2
+        print(
+            f"\tmax step (0.3m) = {self.height_map.MaxStep(cx, cy, 0.3):.3f}"
+            f"\n\tslope (0.3m) = {self.height_map.Slope(cx, cy, 0.3):.3f}\n"
         )
 
 
@@ -0,0 +1,99 @@
+import time
+import argparse
+
+from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowState_, SportModeState_, WirelessController_
+from unitree_sdk2py.idl.unitree_go.msg.dds_ import HeightMap_, LidarState_
+from unitree_sdk2py.idl.sensor_msgs.msg.dds_ import PointCloud2_
+from unitree_sdk2py.idl.geometry_msgs.msg.dds_ import PoseStamped_
+from unitree_sdk2py.record.recorder import Recorder
+from unitree_sdk2py.record.player import Player
+from unitree_sdk2py.record.columnar import ExportNpz
+from unitree_sdk2py.record.log_query import LogQuery
+
+# Go2 telemetry topics
+GO2_TOPICS = [
+    ("rt/lowstate", LowState_),
+    ("rt/sportmodestate", SportModeState_),
+    ("rt/wirelesscontroller", WirelessController_),
+    ("rt/utlidar/cloud", PointCloud2_),
+    ("rt/utlidar/height_map_array", HeightMap_),
+    ("rt/utlidar/robot_pose", PoseStamped_),
+    ("rt/utlidar/lidar_state", LidarState_),
+]
+
+
+def record(args):
+    ChannelFactoryInitialize(0, args.interface)
+
+    recorder = Recorder(args.file, maxFileSize=args.max_file_size)
+    for name, type in GO2_TOPICS:
+        if args.topics is None or name in args.topics:
+            recorder.AddTopic(name, type)
+    recorder.Start()
+
+    start = time.time()
+    try:
+        while args.duration <= 0 or time.time() - start < args.duration:
+            time.sleep(1.0)
+            print("records:", recorder.GetStats()["count"])
+    except KeyboardInterrupt:
+        pass
+
+    recorder.Stop()
+    print("files:", recorder.GetFiles())
+
+
+def play(args):
+    ChannelFactoryInitialize(0, args.interface)
+
+    player = Player(args.file, rate=args.rate, loop=args.loop, topics=args.topics)
+    player.Init()
+    try:
+        player.Play()
+    except KeyboardInterrupt:
+        pass
+    print("playback:", player.GetStats())
+
+
+def export(args):
+    for name in args.topics or ["rt/lowstate"]:
+        out = name.replace("/", "_") + ".npz"
+        count = ExportNpz(args.file, name, out)
+        print("exported", count, "samples of", name, "to", out)
+
+
+def query(args):
+    q = LogQuery(args.file)
+    q.Open()
+    start, end = q.GetTimeRange()
+    if start is None:
+        print("empty log")
+        q.Close()
+        return
+
+    t0 = start + int(args.start * 1e9)
+    t1 = end if args.end is None else start + int(args.end * 1e9)
+    for name in args.topics or ["rt/sportmodestate"]:
+        samples = q.ReadAll(name, t0, t1)
+        print(name, ":", len(samples), "samples in [{:.3f}, {:.3f}] s".format((t0 - start) / 1e9, (t1 - start) / 1e9))
+        if samples:
+            print("  last:", samples[-1][1])
+    q.Close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="record, replay and export DDS telemetry")
+    parser.add_argument("command", choices=["record", "play", "export", "query"])
+    parser.add_argument("file", help="log file, e.g. run.utlog")
+    parser.add_argument("--interface", default=None, help="network interface, e.g. eth0")
+    parser.add_argument("--topics", nargs="*", default=None)
+    parser.add_argument("--duration", type=float, default=0.0, help="record seconds, 0 for until Ctrl+C")
+    parser.add_argument("--max-file-size", type=int, default=0, help="rotate files at this many bytes")
+    parser.add_argument("--rate", type=float, default=1.0, help="playback speed multiplier")
+    parser.add_argument("--loop", action="store_true")
+    parser.add_argument("--start", type=float, default=0.0, help="query start, seconds from log start")
+    parser.add_argument("--end", type=float, default=None, help="query end, seconds from log start")
+    args = parser.parse_args()
+
+    {"record": record, "play": play, "export": export, "query": query}[args.command](args)
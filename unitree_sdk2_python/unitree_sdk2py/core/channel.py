@@ -16,6 +16,9 @@ from cyclonedds.internal import dds_c_t, InvalidSample
 # for channel config
 from .channel_config import ChannelConfigAutoDetermine, ChannelConfigHasInterface
 
+# for in-process loopback backend
+from .channel_loopback import LoopbackChannel, LoopbackBus, LoopbackConfig
+
 # for singleton
 from ..utils.singleton import Singleton
 from ..utils.bqueue import BQueue
@@ -192,6 +195,7 @@ class ChannelFactory(Singleton):
     __domain = None
     __participant = None
     __qos = None
+    __loopback = False
 
     __initialized = False
     __init_lock = threading.Lock()
@@ -236,7 +240,26 @@ class ChannelFactory(Singleton):
             self.__class__.__initialized = True
             return True
 
+    def InitLoopback(self, config: LoopbackConfig = None):
+        if self.__class__.__initialized:
+            return True
+
+        with self.__class__.__init_lock:
+            if self.__class__.__initialized:
+                return True
+
+            LoopbackBus().Configure(LoopbackConfig() if config is None else config)
+
+            self.__class__.__loopback = True
+            self.__class__.__initialized = True
+            return True
+
+    def IsLoopback(self):
+        return self.__class__.__loopback
+
     def CreateChannel(self, name: str, type: Any):
+        if self.__class__.__loopback:
+            return LoopbackChannel(name, type)
         return Channel(self.__class__.__participant, name, type, self.__class__.__qos)
 
     def CreateSendChannel(self, name: str, type: Any):
@@ -299,3 +322,12 @@ def ChannelFactoryInitialize(id: int = 0, networkInterface: str = None):
     factory = ChannelFactory()
     if not factory.Init(id, networkInterface):
         raise Exception("channel factory init error.")
+
+"""
+" function ChannelFactoryInitializeLoopback. used to initialize an in-process channel
+" environment without DDS, for tests and benchmarks. latency/jitter in seconds.
+"""
+def ChannelFactoryInitializeLoopback(latency: float = 0.0, jitter: float = 0.0, loss: float = 0.0, seed: int = 0):
+    factory = ChannelFactory()
+    if not factory.InitLoopback(LoopbackConfig(latency, jitter, loss, seed)):
+        raise Exception("channel factory loopback init error.")
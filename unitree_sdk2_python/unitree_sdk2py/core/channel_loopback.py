@@ -0,0 +1,248 @@
+import time
+import heapq
+import random
+from typing import Any, Callable
+from threading import Thread, Event, Condition
+
+from ..utils.singleton import Singleton
+from ..utils.bqueue import BQueue
+
+
+"""
+" class LoopbackConfig. link model of the loopback bus.
+"
+" every delivery is delayed by latency + uniform(0, jitter) seconds and
+" dropped with probability loss. draws come from one RNG seeded with seed,
+" so a given sequence of writes always sees the same delays and drops.
+"""
+class LoopbackConfig:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, loss: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.seed = seed
+
+
+"""
+" class LoopbackBus. in-process topic bus with a delivery scheduler thread.
+"
+" samples are copied through serialize()/deserialize() on write, so readers
+" never share objects with the writer, as with a real DDS transport.
+" delivery order per reader follows write order (reliable, no reordering).
+"""
+class LoopbackBus(Singleton):
+    __config = LoopbackConfig()
+    __random = random.Random(0)
+    __readers = {}
+    __heap = []
+    __seq = 0
+    __lastDelivery = {}
+    __condition = Condition()
+    __thread = None
+
+    __written = 0
+    __delivered = 0
+    __dropped = 0
+
+    def __init__(self):
+        super().__init__()
+
+    def Configure(self, config: LoopbackConfig):
+        cls = self.__class__
+        with cls.__condition:
+            cls.__config = config
+            cls.__random = random.Random(config.seed)
+            cls.__written = 0
+            cls.__delivered = 0
+            cls.__dropped = 0
+
+            if cls.__thread is None:
+                cls.__thread = Thread(target=self.__SchedulerThreadFunc, name="loopback_bus", daemon=True)
+                cls.__thread.start()
+
+    def GetConfig(self):
+        return self.__class__.__config
+
+    def GetStats(self):
+        cls = self.__class__
+        with cls.__condition:
+            return {"written": cls.__written, "delivered": cls.__delivered, "dropped": cls.__dropped, "pending": len(cls.__heap)}
+
+    def AddReader(self, name: str, reader: Any):
+        with self.__class__.__condition:
+            self.__class__.__readers.setdefault(name, []).append(reader)
+
+    def RemoveReader(self, name: str, reader: Any):
+        cls = self.__class__
+        with cls.__condition:
+            readers = cls.__readers.get(name, [])
+            if reader in readers:
+                readers.remove(reader)
+            cls.__lastDelivery.pop(id(reader), None)
+
+    def GetReaderCount(self, name: str):
+        with self.__class__.__condition:
+            return len(self.__class__.__readers.get(name, []))
+
+    def Write(self, name: str, type: Any, sample: Any):
+        payload = sample.serialize()
+
+        cls = self.__class__
+        with cls.__condition:
+            cls.__written += 1
+            config = cls.__config
+            now = time.monotonic()
+
+            for reader in cls.__readers.get(name, []):
+                if config.loss > 0.0 and cls.__random.random() < config.loss:
+                    cls.__dropped += 1
+                    continue
+
+                delay = config.latency
+                if config.jitter > 0.0:
+                    delay += cls.__random.uniform(0.0, config.jitter)
+
+                # keep per-reader order: never deliver before an earlier sample
+                due = max(now + delay, cls.__lastDelivery.get(id(reader), 0.0))
+                cls.__lastDelivery[id(reader)] = due
+
+                heapq.heappush(cls.__heap, (due, cls.__seq, reader, type, payload))
+                cls.__seq += 1
+
+            cls.__condition.notify()
+
+    def __SchedulerThreadFunc(self):
+        cls = self.__class__
+        while True:
+            with cls.__condition:
+                if not cls.__heap:
+                    cls.__condition.wait(0.1)
+                    continue
+
+                wait = cls.__heap[0][0] - time.monotonic()
+                if wait > 0.0:
+                    cls.__condition.wait(wait)
+                    continue
+
+                _, _, reader, type, payload = heapq.heappop(cls.__heap)
+                cls.__delivered += 1
+
+            try:
+                reader.Deliver(type.deserialize(payload))
+            except Exception as e:
+                print("[LoopbackBus] deliver error. msg:", e)
+
+
+"""
+" class LoopbackChannel. same interface as Channel, on the LoopbackBus
+"""
+class LoopbackChannel:
+
+    """
+    " internal class __Reader
+    """
+    class __Reader:
+        def __init__(self):
+            self.__name = None
+            self.__handler = None
+            self.__queue = None
+            self.__queueEnable = False
+            self.__threadEvent = None
+            self.__threadReader = None
+            self.__inited = False
+
+        def Init(self, name: str, handler: Callable = None, queueLen: int = 0):
+            self.__name = name
+            self.__handler = handler
+            if handler is None:
+                # keep last 1, like the default DDS reader history
+                self.__queue = BQueue(1)
+            elif queueLen > 0:
+                self.__queueEnable = True
+                self.__queue = BQueue(queueLen)
+                self.__threadEvent = Event()
+                self.__threadReader = Thread(target=self.__ChannelReaderThreadFunc, name="ch_reader", daemon=True)
+                self.__threadReader.start()
+
+            LoopbackBus().AddReader(name, self)
+            self.__inited = True
+
+        def Deliver(self, sample: Any):
+            if not self.__inited:
+                return
+
+            if self.__handler is None:
+                self.__queue.Put(sample, True)
+            elif self.__queueEnable:
+                self.__queue.Put(sample)
+            else:
+                self.__handler(sample)
+
+        def Read(self, timeout: float = None):
+            if self.__queue is None:
+                return None
+            return self.__queue.Get(timeout)
+
+        def Close(self):
+            if not self.__inited:
+                return
+
+            LoopbackBus().RemoveReader(self.__name, self)
+            self.__inited = False
+
+            if self.__queueEnable:
+                self.__threadEvent.set()
+                self.__queue.Interrupt()
+                self.__queue.Clear()
+                self.__threadReader.join()
+
+        def __ChannelReaderThreadFunc(self):
+            while not self.__threadEvent.is_set():
+                sample = self.__queue.Get()
+                if sample is not None:
+                    self.__handler(sample)
+
+    # channel __init__
+    def __init__(self, name: str, type: Any):
+        self.__name = name
+        self.__type = type
+        self.__reader = self.__Reader()
+        self.__writer = False
+
+    def SetWriter(self, qos: Any = None):
+        self.__writer = True
+
+    def SetReader(self, qos: Any = None, handler: Callable = None, queueLen: int = 0):
+        self.__reader.Init(self.__name, handler, queueLen)
+
+    def Write(self, sample: Any, timeout: float = None):
+        if not self.__writer:
+            return False
+
+        bus = LoopbackBus()
+
+        # same contract as Channel: with a timeout, wait for a matched reader
+        waitsec = 0.0 if timeout is None else timeout
+        while waitsec > 0.0 and bus.GetReaderCount(self.__name) == 0:
+            time.sleep(0.01)
+            waitsec = waitsec - 0.01
+
+        if timeout is not None and waitsec <= 0.0:
+            return False
+
+        try:
+            bus.Write(self.__name, self.__type, sample)
+        except Exception as e:
+            print("[LoopbackChannel] write sample error. msg:", e)
+            return False
+
+        return True
+
+    def Read(self, timeout: float = None):
+        return self.__reader.Read(timeout)
+
+    def CloseReader(self):
+        self.__reader.Close()
+
+    def CloseWriter(self):
+        self.__writer = False
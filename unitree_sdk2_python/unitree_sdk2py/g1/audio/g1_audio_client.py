@@ -62,8 +62,7 @@ class AudioClient(Client):
     
     def PlayStream(self, app_name: str, stream_id: str, pcm_data: bytes):
         param = json.dumps({"app_name": app_name, "stream_id": stream_id})
-        pcm_list = list(pcm_data) 
-        return self._CallRequestWithParamAndBin(ROBOT_API_ID_AUDIO_START_PLAY, param, pcm_list)
+        return self._CallRequestWithParamAndBin(ROBOT_API_ID_AUDIO_START_PLAY, param, pcm_data)
     
     def PlayStop(self, app_name: str):
         parameter = json.dumps({"app_name": app_name})
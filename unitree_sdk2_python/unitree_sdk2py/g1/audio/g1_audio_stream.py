@@ -0,0 +1,165 @@
+import time
+import asyncio
+
+from typing import Any, AsyncIterable, Iterable
+
+from .g1_audio_client import AudioClient
+
+
+"""
+" g1 speaker stream format: 16 kHz mono int16
+"""
+AUDIO_STREAM_SAMPLE_RATE = 16000
+AUDIO_STREAM_CHANNELS = 1
+AUDIO_STREAM_SAMPLE_WIDTH = 2
+
+
+"""
+" class AudioStream. paced PCM streaming to the g1 speaker through AudioClient.PlayStream.
+"
+" PCM goes out as bytes/memoryview slices, never as lists of int. chunks are
+" paced from the audio duration they carry and the measured PlayStream round
+" trip: the next chunk is sent when the audio already queued on the robot
+" drops to leadTime (plus one round trip), not after a fixed sleep.
+"
+" Play() sends a whole buffer, PlayChunks() / PlayAsync() take any (async)
+" iterable of PCM pieces, e.g. a TTS generator, regrouped to chunkDuration.
+"""
+class AudioStream:
+    def __init__(self, client: AudioClient, appName: str = "sdk", sampleRate: int = AUDIO_STREAM_SAMPLE_RATE,
+                 channels: int = AUDIO_STREAM_CHANNELS, chunkDuration: float = 0.5, leadTime: float = 1.0):
+        self.__client = client
+        self.__appName = appName
+        self.__bytesPerSecond = sampleRate * channels * AUDIO_STREAM_SAMPLE_WIDTH
+        self.__frameBytes = channels * AUDIO_STREAM_SAMPLE_WIDTH
+        self.__chunkBytes = max(self.__frameBytes, int(chunkDuration * sampleRate) * self.__frameBytes)
+        self.__leadTime = leadTime
+
+        self.__streamId = None
+        self.__playEnd = 0.0
+        self.__rtt = 0.0
+
+        self.__chunks = 0
+        self.__bytes = 0
+        self.__gaps = 0
+        self.__errors = 0
+        self.__rttMax = 0.0
+
+    def Play(self, pcm: Any, streamId: str = None):
+        # pcm: bytes, bytearray, memoryview or int16 NumPy array
+        view = memoryview(pcm).cast("B")
+        return self.PlayChunks((view[i:i + self.__chunkBytes] for i in range(0, len(view), self.__chunkBytes)),
+                               streamId)
+
+    def PlayChunks(self, chunks: Iterable[Any], streamId: str = None):
+        self.__Begin(streamId)
+        for chunk in self.__Regroup(chunks):
+            wait = self.__Wait()
+            if wait > 0:
+                time.sleep(wait)
+            code = self.__Send(chunk)
+            if code != 0:
+                return code
+        return 0
+
+    async def PlayAsync(self, chunks: AsyncIterable[Any], streamId: str = None):
+        self.__Begin(streamId)
+        loop = asyncio.get_running_loop()
+
+        pending = bytearray()
+        async for piece in chunks:
+            pending += memoryview(piece).cast("B")
+            while len(pending) >= self.__chunkBytes:
+                chunk = bytes(pending[:self.__chunkBytes])
+                del pending[:self.__chunkBytes]
+                code = await self.__SendAsync(loop, chunk)
+                if code != 0:
+                    return code
+
+        usable = len(pending) - len(pending) % self.__frameBytes
+        if usable:
+            return await self.__SendAsync(loop, bytes(pending[:usable]))
+        return 0
+
+    def WaitDone(self):
+        # block until the audio sent so far has played out
+        wait = self.__playEnd - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+    def Stop(self):
+        self.__playEnd = 0.0
+        return self.__client.PlayStop(self.__appName)
+
+    def GetStats(self):
+        return {
+            "chunks": self.__chunks,
+            "seconds": self.__bytes / self.__bytesPerSecond,
+            "gaps": self.__gaps,
+            "errors": self.__errors,
+            "rtt": self.__rtt,
+            "rtt_max": self.__rttMax,
+            "queued": max(0.0, self.__playEnd - time.monotonic()),
+        }
+
+    def __Begin(self, streamId: str):
+        self.__streamId = streamId if streamId is not None else str(int(time.time() * 1000))
+        self.__playEnd = 0.0
+
+    def __Regroup(self, chunks: Iterable[Any]):
+        # pass chunkBytes-sized pieces through as views, gather smaller ones
+        pending = bytearray()
+        for piece in chunks:
+            view = memoryview(piece).cast("B")
+            if not pending and len(view) == self.__chunkBytes:
+                yield view
+                continue
+            pending += view
+            while len(pending) >= self.__chunkBytes:
+                yield bytes(pending[:self.__chunkBytes])
+                del pending[:self.__chunkBytes]
+
+        usable = len(pending) - len(pending) % self.__frameBytes
+        if usable:
+            yield bytes(pending[:usable])
+
+    def __Wait(self):
+        # seconds until the queued audio drops to leadTime, leaving one round trip for the send
+        if self.__playEnd == 0.0:
+            return 0.0
+        return self.__playEnd - time.monotonic() - self.__leadTime - self.__rtt
+
+    def __Send(self, chunk: Any):
+        sendTime = time.monotonic()
+        code, _ = self.__client.PlayStream(self.__appName, self.__streamId, chunk)
+        return self.__OnSent(code, sendTime, time.monotonic(), len(chunk))
+
+    async def __SendAsync(self, loop: asyncio.AbstractEventLoop, chunk: bytes):
+        wait = self.__Wait()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        sendTime = time.monotonic()
+        code, _ = await loop.run_in_executor(None, self.__client.PlayStream, self.__appName, self.__streamId, chunk)
+        return self.__OnSent(code, sendTime, time.monotonic(), len(chunk))
+
+    def __OnSent(self, code: int, sendTime: float, doneTime: float, size: int):
+        if code != 0:
+            self.__errors += 1
+            print("[AudioStream] play stream error. code:", code)
+            return code
+
+        rtt = doneTime - sendTime
+        # smoothed round trip, as the send margin
+        self.__rtt = rtt if self.__chunks == 0 else 0.8 * self.__rtt + 0.2 * rtt
+        self.__rttMax = max(self.__rttMax, rtt)
+
+        if self.__playEnd != 0.0 and doneTime > self.__playEnd:
+            # the robot ran out of audio before this chunk arrived
+            self.__gaps += 1
+        start = max(self.__playEnd, doneTime)
+        self.__playEnd = start + size / self.__bytesPerSecond
+
+        self.__chunks += 1
+        self.__bytes += size
+        return 0
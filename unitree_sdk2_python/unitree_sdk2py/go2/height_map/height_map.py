@@ -0,0 +1,298 @@
+import math
+import numpy as np
+
+from threading import Lock
+
+from ...idl.unitree_go.msg.dds_ import HeightMap_
+
+
+# cells at or above this height are reported as unknown by the utlidar service
+HEIGHT_MAP_INVALID_VALUE = 1.0e8
+
+
+"""
+" function HeightMapToArray. view HeightMap_.data as (height, width) float32 grid.
+"
+" numpy buffers (and anything exposing the buffer protocol) are viewed without
+" a copy. cyclonedds decodes sequence<float> into a Python list, which cannot
+" be viewed, so that case costs exactly one C-level conversion.
+"""
+def HeightMapToArray(msg: HeightMap_):
+    data = msg.data
+    if isinstance(data, np.ndarray):
+        grid = data if data.dtype == np.float32 else data.astype(np.float32)
+    elif isinstance(data, (bytes, bytearray, memoryview)):
+        grid = np.frombuffer(data, dtype=np.float32)
+    else:
+        grid = np.asarray(data, dtype=np.float32)
+
+    if grid.size != msg.width * msg.height:
+        raise ValueError("height map size mismatch. width: {}, height: {}, data: {}".format(msg.width, msg.height, grid.size))
+
+    return grid.reshape(msg.height, msg.width)
+
+
+"""
+" class HeightMapGrid. robot-centric rolling height map.
+"
+" cells are addressed by world cell index (floor(x / resolution)) and stored
+" modulo the grid size, so moving the window only clears the rows and columns
+" that scroll in and fusing a map only touches the cells it covers.
+" unknown cells are NaN. row index is y, column index is x.
+"""
+class HeightMapGrid:
+    def __init__(self, size: int = 200, resolution: float = None):
+        self.__size = size
+        self.__resolution = resolution
+        self.__grid = np.full((size, size), np.nan, dtype=np.float32)
+        self.__stamp = np.zeros((size, size), dtype=np.float64)
+        self.__originX = None
+        self.__originY = None
+        self.__lastStamp = 0.0
+        self.__lock = Lock()
+
+    def GetSize(self):
+        return self.__size
+
+    def GetResolution(self):
+        return self.__resolution
+
+    def GetLastStamp(self):
+        return self.__lastStamp
+
+    def Reset(self, resolution: float = None):
+        with self.__lock:
+            if resolution is not None:
+                self.__resolution = resolution
+            self.__grid.fill(np.nan)
+            self.__stamp.fill(0.0)
+            self.__originX = None
+            self.__originY = None
+
+    def Update(self, msg: HeightMap_, invalidValue: float = HEIGHT_MAP_INVALID_VALUE):
+        data = HeightMapToArray(msg)
+
+        with self.__lock:
+            if self.__resolution is None or not math.isclose(self.__resolution, msg.resolution, rel_tol=1e-4):
+                self.__ResetLocked(msg.resolution)
+
+            # incoming map origin as world cell index
+            gx0 = int(round(msg.origin[0] / self.__resolution))
+            gy0 = int(round(msg.origin[1] / self.__resolution))
+
+            # keep the window centered on the incoming map
+            self.__RecenterLocked(gx0 + msg.width // 2, gy0 + msg.height // 2)
+            self.__FuseLocked(data, gx0, gy0, msg.stamp, invalidValue)
+            self.__lastStamp = msg.stamp
+
+    def Recenter(self, x: float, y: float):
+        with self.__lock:
+            if self.__resolution is None:
+                return
+            self.__RecenterLocked(self.__CellIndex(x), self.__CellIndex(y))
+
+    def GetHeight(self, x: float, y: float):
+        with self.__lock:
+            gx, gy = self.__CellIndex(x), self.__CellIndex(y)
+            if not self.__Contains(gx, gy):
+                return math.nan
+            return float(self.__grid[gy % self.__size, gx % self.__size])
+
+    def GetWindow(self, x: float, y: float, radius: float):
+        with self.__lock:
+            return self.__WindowLocked(x, y, radius)
+
+    def GetGrid(self):
+        # world-aligned copy, row 0 is the lowest y of the window
+        with self.__lock:
+            return self.__GridLocked()
+
+    def GetOrigin(self):
+        with self.__lock:
+            if self.__originX is None:
+                return None
+            return self.__originX * self.__resolution, self.__originY * self.__resolution
+
+    def MaxStep(self, x: float, y: float, radius: float):
+        window = self.GetWindow(x, y, radius)
+        return self.__MaxStep(window)
+
+    def Slope(self, x: float, y: float, radius: float):
+        with self.__lock:
+            window = self.__WindowLocked(x, y, radius)
+            resolution = self.__resolution
+        return self.__Slope(window, resolution)
+
+    def Traversable(self, x: float, y: float, radius: float, maxStep: float, maxSlope: float, minKnownRatio: float = 0.5):
+        with self.__lock:
+            window = self.__WindowLocked(x, y, radius)
+            resolution = self.__resolution
+        if window.size == 0:
+            return False
+
+        known = np.count_nonzero(~np.isnan(window))
+        if known < minKnownRatio * window.size:
+            return False
+
+        return self.__MaxStep(window) <= maxStep and self.__Slope(window, resolution) <= maxSlope
+
+    def TraversabilityMap(self, maxStep: float, maxSlope: float):
+        with self.__lock:
+            grid = self.__GridLocked()
+            resolution = self.__resolution
+        if resolution is None:
+            # no map yet, nothing is known to be traversable
+            return np.zeros(grid.shape, dtype=bool)
+
+        step = np.zeros_like(grid)
+        dx = np.abs(np.diff(grid, axis=1))
+        dy = np.abs(np.diff(grid, axis=0))
+        np.fmax(step[:, 1:], dx, out=step[:, 1:])
+        np.fmax(step[:, :-1], dx, out=step[:, :-1])
+        np.fmax(step[1:, :], dy, out=step[1:, :])
+        np.fmax(step[:-1, :], dy, out=step[:-1, :])
+
+        gy, gx = np.gradient(grid, resolution)
+        slope = np.arctan(np.hypot(gx, gy))
+
+        with np.errstate(invalid="ignore"):
+            return (step <= maxStep) & (slope <= maxSlope) & ~np.isnan(grid)
+
+    def __ResetLocked(self, resolution: float):
+        self.__resolution = resolution
+        self.__grid.fill(np.nan)
+        self.__stamp.fill(0.0)
+        self.__originX = None
+        self.__originY = None
+
+    def __GridLocked(self):
+        if self.__originX is None:
+            return self.__grid.copy()
+        return np.roll(self.__grid, (-(self.__originY % self.__size), -(self.__originX % self.__size)), axis=(0, 1))
+
+    def __CellIndex(self, v: float):
+        return int(math.floor(v / self.__resolution))
+
+    def __Contains(self, gx: int, gy: int):
+        if self.__originX is None:
+            return False
+        return self.__originX <= gx < self.__originX + self.__size and \
+            self.__originY <= gy < self.__originY + self.__size
+
+    def __RecenterLocked(self, cx: int, cy: int):
+        newX = cx - self.__size // 2
+        newY = cy - self.__size // 2
+
+        if self.__originX is None:
+            self.__originX = newX
+            self.__originY = newY
+            return
+
+        dx = newX - self.__originX
+        dy = newY - self.__originY
+        if dx == 0 and dy == 0:
+            return
+
+        # clear only the storage rows/columns that now hold new world cells
+        if abs(dx) >= self.__size or abs(dy) >= self.__size:
+            self.__grid.fill(np.nan)
+            self.__stamp.fill(0.0)
+        else:
+            self.__ClearColumns(self.__originX, newX)
+            self.__ClearRows(self.__originY, newY)
+
+        self.__originX = newX
+        self.__originY = newY
+
+    def __ClearColumns(self, old: int, new: int):
+        if new > old:
+            enter = range(old + self.__size, new + self.__size)
+        else:
+            enter = range(new, old)
+        for g in enter:
+            self.__grid[:, g % self.__size] = np.nan
+            self.__stamp[:, g % self.__size] = 0.0
+
+    def __ClearRows(self, old: int, new: int):
+        if new > old:
+            enter = range(old + self.__size, new + self.__size)
+        else:
+            enter = range(new, old)
+        for g in enter:
+            self.__grid[g % self.__size, :] = np.nan
+            self.__stamp[g % self.__size, :] = 0.0
+
+    def __FuseLocked(self, data, gx0: int, gy0: int, stamp: float, invalidValue: float):
+        h, w = data.shape
+
+        # clip incoming map to the window
+        x0 = max(gx0, self.__originX)
+        y0 = max(gy0, self.__originY)
+        x1 = min(gx0 + w, self.__originX + self.__size)
+        y1 = min(gy0 + h, self.__originY + self.__size)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        src = data[y0 - gy0:y1 - gy0, x0 - gx0:x1 - gx0]
+
+        # a wrapped rectangle splits into at most 2x2 contiguous blocks
+        for ys, ye, srcY in self.__Split(y0, y1):
+            for xs, xe, srcX in self.__Split(x0, x1):
+                block = src[srcY:srcY + (ye - ys), srcX:srcX + (xe - xs)]
+                valid = np.isfinite(block) & (block < invalidValue)
+                np.copyto(self.__grid[ys:ye, xs:xe], block, where=valid)
+                self.__stamp[ys:ye, xs:xe][valid] = stamp
+
+    def __Split(self, g0: int, g1: int):
+        s0 = g0 % self.__size
+        n = g1 - g0
+        if s0 + n <= self.__size:
+            return [(s0, s0 + n, 0)]
+        first = self.__size - s0
+        return [(s0, self.__size, 0), (0, n - first, first)]
+
+    def __WindowLocked(self, x: float, y: float, radius: float):
+        if self.__resolution is None or self.__originX is None:
+            return np.empty((0, 0), dtype=np.float32)
+
+        r = int(math.ceil(radius / self.__resolution))
+        gx, gy = self.__CellIndex(x), self.__CellIndex(y)
+
+        xs = np.arange(max(gx - r, self.__originX), min(gx + r + 1, self.__originX + self.__size))
+        ys = np.arange(max(gy - r, self.__originY), min(gy + r + 1, self.__originY + self.__size))
+        if xs.size == 0 or ys.size == 0:
+            return np.empty((0, 0), dtype=np.float32)
+
+        return self.__grid[np.ix_(ys % self.__size, xs % self.__size)]
+
+    @staticmethod
+    def __MaxStep(window):
+        if window.size == 0:
+            return math.nan
+
+        steps = []
+        if window.shape[1] > 1:
+            steps.append(np.abs(np.diff(window, axis=1)).ravel())
+        if window.shape[0] > 1:
+            steps.append(np.abs(np.diff(window, axis=0)).ravel())
+        if not steps:
+            return 0.0
+
+        steps = np.concatenate(steps)
+        steps = steps[~np.isnan(steps)]
+        return float(steps.max()) if steps.size else math.nan
+
+    @staticmethod
+    def __Slope(window, resolution: float):
+        # least-squares plane z = a*x + b*y + c over the known cells
+        iy, ix = np.nonzero(~np.isnan(window))
+        if iy.size < 3:
+            return math.nan
+
+        z = window[iy, ix].astype(np.float64)
+        A = np.column_stack((ix * resolution, iy * resolution, np.ones(iy.size)))
+        coef, _, rank, _ = np.linalg.lstsq(A, z, rcond=None)
+        if rank < 3:
+            return math.nan
+
+        return float(math.atan(math.hypot(coef[0], coef[1])))
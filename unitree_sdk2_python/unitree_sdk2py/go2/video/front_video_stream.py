@@ -0,0 +1,227 @@
+import time
+import threading
+
+from collections import deque
+
+from ...core.channel import ChannelSubscriber
+from ...idl.default import unitree_go_msg_dds__Go2FrontVideoData_
+from ...idl.unitree_go.msg.dds_ import Go2FrontVideoData_
+from ...rpc.binary import UseOctetSequence
+from ...utils.bqueue import BQueue
+from ...utils.video_stream import VideoFrame
+
+try:
+    import av
+except ImportError:
+    av = None
+
+
+"""
+" topic of the front camera H.264 stream
+"""
+FRONT_VIDEO_TOPIC = "rt/frontvideostream"
+
+FRONT_VIDEO_RESOLUTIONS = ("720p", "360p", "180p")
+
+# H.264 NAL unit types that start a decodable sequence: IDR slice, SPS
+_H264_NAL_IDR = 5
+_H264_NAL_SPS = 7
+
+# longest time without a delivered frame while the decoder works through a backlog
+_FRONT_VIDEO_MAX_INTERVAL = 0.1
+
+# video payloads as bytes, not one Python int per byte
+UseOctetSequence(Go2FrontVideoData_, "video720p", unitree_go_msg_dds__Go2FrontVideoData_())
+UseOctetSequence(Go2FrontVideoData_, "video360p", unitree_go_msg_dds__Go2FrontVideoData_())
+UseOctetSequence(Go2FrontVideoData_, "video180p", unitree_go_msg_dds__Go2FrontVideoData_())
+
+
+def _HasKeyframe(data: bytes):
+    # scan Annex-B start codes for an IDR slice or SPS
+    pos = data.find(b"\x00\x00\x01")
+    while 0 <= pos < len(data) - 3:
+        if data[pos + 3] & 0x1F in (_H264_NAL_IDR, _H264_NAL_SPS):
+            return True
+        pos = data.find(b"\x00\x00\x01", pos + 3)
+    return False
+
+
+"""
+" class FrontVideoStream. go2 front camera frames from the rt/frontvideostream H.264 topic.
+"
+" DDS payloads are queued by the subscriber and fed to an in-process PyAV
+" (FFmpeg) decoder; its parser reassembles NAL units split across payloads.
+" decoded frames go to a latest-frame slot as BGR NumPy arrays.
+"
+" drop on lag: if the payload queue overflows, payloads are discarded until
+" the next keyframe, so the decoder never sees a broken reference chain.
+" while a backlog is queued, frames are decoded but only the newest is
+" converted to NumPy.
+"
+" needs PyAV: pip install av
+"""
+class FrontVideoStream:
+    def __init__(self, resolution: str = "720p", queueLen: int = 30):
+        if resolution not in FRONT_VIDEO_RESOLUTIONS:
+            raise ValueError("resolution must be one of " + ", ".join(FRONT_VIDEO_RESOLUTIONS))
+
+        self.__field = "video" + resolution
+        self.__queue = BQueue(queueLen)
+        self.__subscriber = None
+        self.__thread = None
+        self.__quit = threading.Event()
+        self.__codec = None
+
+        self.__lock = threading.Lock()
+        self.__condition = threading.Condition(self.__lock)
+        self.__latest = None
+        self.__lastRead = -1
+        self.__waitKeyframe = True
+
+        self.__received = 0
+        self.__decoded = 0
+        self.__delivered = 0
+        self.__dropped = 0
+        self.__resyncs = 0
+        self.__errors = 0
+        self.__deliverTimes = deque(maxlen=60)
+
+    def Init(self):
+        if av is None:
+            raise ImportError("FrontVideoStream needs PyAV, install it with: pip install av")
+
+        self.__codec = av.CodecContext.create("h264", "r")
+        self.__subscriber = ChannelSubscriber(FRONT_VIDEO_TOPIC, Go2FrontVideoData_)
+        self.__subscriber.Init(self.__OnVideoData)
+
+    def Start(self):
+        if self.__thread is not None:
+            return
+
+        self.__quit.clear()
+        self.__thread = threading.Thread(target=self.__DecodeThreadFunc, name="front_video_decode", daemon=True)
+        self.__thread.start()
+
+    def Stop(self):
+        self.__quit.set()
+        self.__queue.Interrupt()
+        with self.__condition:
+            self.__condition.notify_all()
+
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def Close(self):
+        self.Stop()
+        if self.__subscriber is not None:
+            self.__subscriber.Close()
+            self.__subscriber = None
+
+    def GetFrame(self, timeout: float = None):
+        # next frame newer than the last one returned, None on timeout or stop
+        with self.__condition:
+            if not self.__condition.wait_for(lambda: self.__quit.is_set() or
+                                             (self.__latest is not None and self.__latest.seq > self.__lastRead), timeout):
+                return None
+            if self.__quit.is_set():
+                return None
+            self.__lastRead = self.__latest.seq
+            return self.__latest
+
+    def GetLatestFrame(self):
+        with self.__lock:
+            return self.__latest
+
+    def GetStats(self):
+        with self.__lock:
+            fps = 0.0
+            if len(self.__deliverTimes) > 1:
+                span = self.__deliverTimes[-1] - self.__deliverTimes[0]
+                fps = (len(self.__deliverTimes) - 1) / span if span > 0 else 0.0
+            return {
+                "fps": fps,
+                "received": self.__received,
+                "decoded": self.__decoded,
+                "delivered": self.__delivered,
+                "dropped": self.__dropped,
+                "resyncs": self.__resyncs,
+                "errors": self.__errors,
+                "backlog": self.__queue.Size(),
+            }
+
+    def __OnVideoData(self, msg: Go2FrontVideoData_):
+        data = getattr(msg, self.__field)
+        if not data:
+            return
+        # list of int when the octet sequence patch is not active
+        if not isinstance(data, (bytes, bytearray)):
+            data = bytes(data)
+
+        receiveTime = time.monotonic()
+        with self.__lock:
+            self.__received += 1
+
+            if self.__waitKeyframe:
+                if not _HasKeyframe(data):
+                    self.__dropped += 1
+                    return
+                self.__waitKeyframe = False
+
+            if not self.__queue.Put((msg.time_frame, receiveTime, data)):
+                # decoder is behind: drop the backlog and restart at the next keyframe
+                self.__dropped += self.__queue.Size() + 1
+                self.__queue.Clear()
+                self.__waitKeyframe = True
+                self.__resyncs += 1
+
+    def __DecodeThreadFunc(self):
+        seq = 0
+        pending = None
+        lastDeliver = 0.0
+        while not self.__quit.is_set():
+            item = self.__queue.Get(0.5)
+            if item is None:
+                continue
+
+            stamp, receiveTime, data = item
+            try:
+                frames = []
+                for packet in self.__codec.parse(data):
+                    frames.extend(self.__codec.decode(packet))
+            except Exception as e:
+                # corrupt data: reset the decoder and wait for a keyframe
+                print("[FrontVideoStream] decode error. msg:", e)
+                self.__codec = av.CodecContext.create("h264", "r")
+                pending = None
+                with self.__lock:
+                    self.__errors += 1
+                    self.__waitKeyframe = True
+                    self.__queue.Clear()
+                continue
+
+            if frames:
+                with self.__lock:
+                    self.__decoded += len(frames)
+                    # frames superseded before conversion
+                    self.__dropped += len(frames) - 1 + (0 if pending is None else 1)
+                pending = (frames[-1], stamp, receiveTime)
+
+            # convert to NumPy only the newest frame, once the queue is drained,
+            # or at least every _FRONT_VIDEO_MAX_INTERVAL while a backlog persists
+            now = time.monotonic()
+            if pending is None or (self.__queue.Size() > 0 and now - lastDeliver < _FRONT_VIDEO_MAX_INTERVAL):
+                continue
+
+            videoFrame, stamp, receiveTime = pending
+            pending = None
+            image = videoFrame.to_ndarray(format="bgr24")
+            lastDeliver = time.monotonic()
+            frame = VideoFrame(seq, image, None, receiveTime, receiveTime, lastDeliver, stamp)
+            seq += 1
+
+            with self.__condition:
+                self.__delivered += 1
+                self.__deliverTimes.append(frame.decodeTime)
+                self.__latest = frame
+                self.__condition.notify_all()
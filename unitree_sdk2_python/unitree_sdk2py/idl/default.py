@@ -245,7 +245,7 @@ def unitree_api_msg_dds__RequestIdentity_():
     return RequestIdentity_(0, 0)
 
 def unitree_api_msg_dds__RequestLease_():
-    return RequestLease_(0, unitree_hg_msg_dds__IMUState_(), [], )
+    return RequestLease_(0)
 
 def unitree_api_msg_dds__RequestPolicy_():
     return RequestPolicy_(0, False)
@@ -264,5 +264,5 @@ def unitree_api_msg_dds__ResponseHeader_():
     return ResponseHeader_(unitree_api_msg_dds__RequestIdentity_(), unitree_api_msg_dds__ResponseStatus_())
 
 def unitree_api_msg_dds__Response_():
-    return Response_(unitree_api_msg_dds__ResponseHeader_(), "", [], 0, 0, [0, 0])
+    return Response_(unitree_api_msg_dds__ResponseHeader_(), "", [])
 
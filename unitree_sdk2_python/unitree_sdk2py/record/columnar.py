@@ -0,0 +1,157 @@
+import typing
+import numpy as np
+
+from typing import Any
+from cyclonedds.idl import IdlStruct
+from cyclonedds.idl.types import array, typedef
+from cyclonedds.idl._type_normalize import get_extended_type_hints, get_idl_annotations
+
+from .log_format import LogReader, ExpandLogFiles
+
+
+_PRIMITIVE_DTYPE = {
+    "int8": "i1", "uint8": "u1", "byte": "u1", "char": "S1",
+    "int16": "i2", "uint16": "u2",
+    "int32": "i4", "uint32": "u4",
+    "int64": "i8", "uint64": "u8",
+    "float32": "f4", "float64": "f8",
+}
+
+# CDR encapsulation identifier -> (byte order, max alignment)
+_ENCAPSULATION = {
+    0x0000: (">", 8), 0x0001: ("<", 8),
+    0x0006: (">", 4), 0x0007: ("<", 4),
+}
+
+
+"""
+" class CdrLayout. fixed CDR offsets of every leaf of a fixed-size final IDL struct.
+"
+" with the layout known, N recorded samples become an (N, size) byte matrix
+" and each column is a strided numpy read instead of N deserialize() calls.
+"""
+class CdrLayout:
+    def __init__(self, type: Any, byteOrder: str = "<", maxAlign: int = 8):
+        self.__byteOrder = byteOrder
+        self.__maxAlign = maxAlign
+        self.__leaves = {}
+        self.size = self.__Walk(type, "", (), 0)
+
+    @classmethod
+    def IsFixedSize(cls, type: Any):
+        try:
+            cls(type)
+            return True
+        except TypeError:
+            return False
+
+    def GetColumns(self):
+        # name -> (dtype, shape, offsets in index order)
+        columns = {}
+        for name, leaves in self.__leaves.items():
+            dtype = leaves[0][2]
+            shape = tuple(d + 1 for d in np.max([l[0] for l in leaves], axis=0)) if leaves[0][0] else ()
+            offsets = [l[1] for l in sorted(leaves, key=lambda l: l[0])]
+            columns[name] = (dtype, shape, offsets)
+        return columns
+
+    def __Walk(self, hint: Any, name: str, index: tuple, offset: int):
+        if isinstance(hint, typedef):
+            return self.__Walk(hint.subtype, name, index, offset)
+
+        if isinstance(hint, array):
+            for i in range(hint.length):
+                offset = self.__Walk(hint.subtype, name, index + (i,), offset)
+            return offset
+
+        if isinstance(hint, type) and issubclass(hint, IdlStruct):
+            if get_idl_annotations(hint).get("extensibility", "final") != "final":
+                raise TypeError("only final structs have a fixed layout: " + hint.__name__)
+            for field, fieldHint in get_extended_type_hints(hint).items():
+                offset = self.__Walk(fieldHint, name + "." + field if name else field, index, offset)
+            return offset
+
+        dtype = self.__PrimitiveDtype(hint)
+        size = dtype.itemsize
+        align = min(size, self.__maxAlign)
+        offset = (offset + align - 1) // align * align
+        self.__leaves.setdefault(name, []).append((index, offset, dtype))
+        return offset + size
+
+    def __PrimitiveDtype(self, hint: Any):
+        if hint is bool:
+            return np.dtype("?")
+        if hint is float:
+            return np.dtype(self.__byteOrder + "f8")
+        if hint is int:
+            return np.dtype(self.__byteOrder + "i8")
+
+        args = typing.get_args(hint)
+        if len(args) == 2 and isinstance(args[1], str) and args[1] in _PRIMITIVE_DTYPE:
+            return np.dtype(self.__byteOrder + _PRIMITIVE_DTYPE[args[1]])
+
+        raise TypeError("field is not fixed-size: {}".format(hint))
+
+
+"""
+" function ExportColumns. columnar numpy export of one topic of a fixed-size type.
+"
+" returns {"timestamp": int64[N], "<field path>": array[N, ...]}, e.g.
+" "motor_state.q" -> float32[N, 20] for LowState_.
+"""
+def ExportColumns(path, topicName: str):
+    stamps = []
+    rows = []
+    layout = None
+    topicType = None
+
+    for filename in ExpandLogFiles(path):
+        reader = LogReader(filename)
+        reader.Open()
+        try:
+            topic = reader.GetTopic(topicName)
+            if topic is None:
+                continue
+
+            topicType = topic.GetType()
+            buf = reader.GetBuffer()
+            for _, timestamp, offset, length in reader.ReadRecords({topic.id}):
+                if layout is None:
+                    header = int.from_bytes(buf[offset:offset + 2], "big")
+                    if header not in _ENCAPSULATION:
+                        raise TypeError("unsupported CDR encapsulation: {:#06x}".format(header))
+                    layout = CdrLayout(topicType, *_ENCAPSULATION[header])
+
+                if length - 4 != layout.size:
+                    raise ValueError("sample size mismatch in {}: {} != {}".format(filename, length - 4, layout.size))
+
+                stamps.append(timestamp)
+                rows.append(buf[offset + 4:offset + length])
+        finally:
+            reader.Close()
+
+    columns = {"timestamp": np.array(stamps, dtype=np.int64)}
+    if layout is None:
+        return columns
+
+    data = np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), layout.size)
+    for name, (dtype, shape, offsets) in layout.GetColumns().items():
+        col = np.empty((len(rows),) + shape, dtype=dtype.newbyteorder("="))
+        flat = col.reshape(len(rows), -1)
+        for i, off in enumerate(offsets):
+            flat[:, i] = np.ndarray((len(rows),), dtype=dtype, buffer=data, offset=off, strides=(layout.size,))
+        columns[name] = col
+
+    return columns
+
+
+"""
+" function ExportNpz
+"""
+def ExportNpz(path, topicName: str, filename: str, compressed: bool = False):
+    columns = ExportColumns(path, topicName)
+    if compressed:
+        np.savez_compressed(filename, **columns)
+    else:
+        np.savez(filename, **columns)
+    return len(columns["timestamp"])
@@ -0,0 +1,445 @@
+import os
+import glob
+import json
+import mmap
+import struct
+import bisect
+import importlib
+
+from typing import Any
+
+
+"""
+" log file layout (little-endian)
+"
+"   file    := FileHeader TopicBlock Chunk* [IndexBlock Trailer]
+"   block   := BlockHeader body
+"   chunk   := BlockHeader("CHNK") ChunkHeader Record*
+"   record  := RecordHeader payload          payload is a CDR sample from serialize()
+"
+" the index block and trailer are written on Close(). a file without them
+" (e.g. recorder killed) is still readable: the chunk index is rebuilt by
+" walking the chunk headers.
+"
+" since version 2 the index block also holds, per chunk, a per-topic table
+" (count and time range) and a sparse time index (every Nth record of each
+" topic), so a time range query touches only the chunks and record spans
+" it needs.
+"""
+LOG_MAGIC = b"UNTRLOG1"
+LOG_TRAILER_MAGIC = b"UNTRLEND"
+LOG_VERSION = 2
+LOG_FILE_EXT = ".utlog"
+
+BLOCK_TAG_TOPIC = b"TOPC"
+BLOCK_TAG_CHUNK = b"CHNK"
+BLOCK_TAG_INDEX = b"INDX"
+
+# magic, version, flags, create time ns
+FILE_HEADER = struct.Struct("<8sIIq")
+# tag, reserved, body length
+BLOCK_HEADER = struct.Struct("<4sIQ")
+# first timestamp ns, last timestamp ns, record count
+CHUNK_HEADER = struct.Struct("<qqI4x")
+# payload length, topic id, reserved, timestamp ns
+RECORD_HEADER = struct.Struct("<IHHq")
+# chunk count
+INDEX_HEADER = struct.Struct("<I4x")
+# chunk block offset, chunk body length, first timestamp ns, last timestamp ns, record count
+INDEX_ENTRY = struct.Struct("<QQqqI4x")
+# per-topic table entry count, sparse index entry count (version 2)
+INDEX_TOPIC_HEADER = struct.Struct("<II")
+# chunk number, topic id, record count, first timestamp ns, last timestamp ns
+INDEX_TOPIC_ENTRY = struct.Struct("<IH2xIqq")
+# chunk number, topic id, timestamp ns, record header offset
+INDEX_SPARSE_ENTRY = struct.Struct("<IH2xqQ")
+# index block offset, magic
+TRAILER = struct.Struct("<Q8s")
+
+# sparse time index stride
+LOG_SPARSE_INTERVAL = 64
+
+
+"""
+" class TopicInfo
+"""
+class TopicInfo:
+    def __init__(self, id: int, name: str, typeName: str, typePath: str):
+        self.id = id
+        self.name = name
+        self.typeName = typeName
+        self.typePath = typePath
+        self.__type = None
+
+    @classmethod
+    def FromType(cls, id: int, name: str, type: Any):
+        return cls(id, name, type.__idl_typename__, type.__module__ + ":" + type.__qualname__)
+
+    def SetType(self, type: Any):
+        self.__type = type
+
+    def GetType(self):
+        if self.__type is None:
+            from .type_registry import TypeRegistry
+            self.__type = TypeRegistry().Get(self.typeName)
+
+        if self.__type is None:
+            moduleName, _, qualName = self.typePath.partition(":")
+            obj = importlib.import_module(moduleName)
+            for attr in qualName.split("."):
+                obj = getattr(obj, attr)
+            self.__type = obj
+        return self.__type
+
+    def ToDict(self):
+        return {"id": self.id, "name": self.name, "type": self.typeName, "path": self.typePath}
+
+    @classmethod
+    def FromDict(cls, d: dict):
+        return cls(d["id"], d["name"], d["type"], d["path"])
+
+
+"""
+" class ChunkIndex
+"""
+class ChunkIndex:
+    def __init__(self, offset: int, size: int, timeStart: int, timeEnd: int, count: int):
+        self.offset = offset
+        self.size = size
+        self.timeStart = timeStart
+        self.timeEnd = timeEnd
+        self.count = count
+        # topic id -> TopicChunkIndex, None when the file has no version 2 index
+        self.topics = None
+
+
+"""
+" class TopicChunkIndex
+"""
+class TopicChunkIndex:
+    def __init__(self, count: int, timeStart: int, timeEnd: int):
+        self.count = count
+        self.timeStart = timeStart
+        self.timeEnd = timeEnd
+        # sparse time index, parallel lists sorted by time
+        self.sparseTimes = []
+        self.sparseOffsets = []
+
+    def Add(self, timestamp: int, offset: int):
+        self.sparseTimes.append(timestamp)
+        self.sparseOffsets.append(offset)
+
+
+"""
+" class LogWriter
+"""
+class LogWriter:
+    def __init__(self, filename: str, topics: list, chunkSize: int = 1 << 20, sparseInterval: int = LOG_SPARSE_INTERVAL):
+        self.__filename = filename
+        self.__topics = topics
+        self.__chunkSize = chunkSize
+        self.__sparseInterval = sparseInterval
+        self.__chunkTopics = {}
+        self.__file = None
+        self.__chunk = bytearray()
+        self.__chunkCount = 0
+        self.__chunkStart = 0
+        self.__chunkEnd = 0
+        self.__index = []
+        self.__size = 0
+
+    def Open(self):
+        self.__file = open(self.__filename, "wb")
+        self.__file.write(FILE_HEADER.pack(LOG_MAGIC, LOG_VERSION, 0, 0))
+
+        body = json.dumps([t.ToDict() for t in self.__topics]).encode("utf-8")
+        self.__file.write(BLOCK_HEADER.pack(BLOCK_TAG_TOPIC, 0, len(body)))
+        self.__file.write(body)
+        self.__size = self.__file.tell()
+
+    def GetFilename(self):
+        return self.__filename
+
+    def GetSize(self):
+        return self.__size + len(self.__chunk)
+
+    def Write(self, topicId: int, timestamp: int, payload: bytes):
+        if self.__chunkCount == 0:
+            self.__chunkStart = timestamp
+            self.__chunkEnd = timestamp
+        self.__chunkStart = min(self.__chunkStart, timestamp)
+        self.__chunkEnd = max(self.__chunkEnd, timestamp)
+        self.__chunkCount += 1
+
+        # record offset relative to the chunk body, fixed up on Flush()
+        topic = self.__chunkTopics.get(topicId)
+        if topic is None:
+            topic = TopicChunkIndex(0, timestamp, timestamp)
+            self.__chunkTopics[topicId] = topic
+        if topic.count % self.__sparseInterval == 0:
+            topic.Add(timestamp, len(self.__chunk))
+        topic.count += 1
+        topic.timeStart = min(topic.timeStart, timestamp)
+        topic.timeEnd = max(topic.timeEnd, timestamp)
+
+        self.__chunk += RECORD_HEADER.pack(len(payload), topicId, 0, timestamp)
+        self.__chunk += payload
+
+        if len(self.__chunk) >= self.__chunkSize:
+            self.Flush()
+
+    def Flush(self):
+        if self.__chunkCount == 0:
+            return
+
+        offset = self.__file.tell()
+        size = CHUNK_HEADER.size + len(self.__chunk)
+        self.__file.write(BLOCK_HEADER.pack(BLOCK_TAG_CHUNK, 0, size))
+        self.__file.write(CHUNK_HEADER.pack(self.__chunkStart, self.__chunkEnd, self.__chunkCount))
+        self.__file.write(self.__chunk)
+
+        chunk = ChunkIndex(offset, size, self.__chunkStart, self.__chunkEnd, self.__chunkCount)
+        base = offset + BLOCK_HEADER.size + CHUNK_HEADER.size
+        for topic in self.__chunkTopics.values():
+            topic.sparseOffsets = [base + o for o in topic.sparseOffsets]
+        chunk.topics = self.__chunkTopics
+        self.__index.append(chunk)
+        self.__size = self.__file.tell()
+
+        self.__chunk = bytearray()
+        self.__chunkCount = 0
+        self.__chunkTopics = {}
+
+    def Close(self):
+        if self.__file is None:
+            return
+
+        self.Flush()
+
+        offset = self.__file.tell()
+        body = bytearray(INDEX_HEADER.pack(len(self.__index)))
+        for c in self.__index:
+            body += INDEX_ENTRY.pack(c.offset, c.size, c.timeStart, c.timeEnd, c.count)
+
+        topicEntries = bytearray()
+        sparseEntries = bytearray()
+        topicCount = 0
+        sparseCount = 0
+        for i, c in enumerate(self.__index):
+            for topicId, t in c.topics.items():
+                topicEntries += INDEX_TOPIC_ENTRY.pack(i, topicId, t.count, t.timeStart, t.timeEnd)
+                topicCount += 1
+                for timestamp, recordOffset in zip(t.sparseTimes, t.sparseOffsets):
+                    sparseEntries += INDEX_SPARSE_ENTRY.pack(i, topicId, timestamp, recordOffset)
+                    sparseCount += 1
+
+        body += INDEX_TOPIC_HEADER.pack(topicCount, sparseCount)
+        body += topicEntries
+        body += sparseEntries
+
+        self.__file.write(BLOCK_HEADER.pack(BLOCK_TAG_INDEX, 0, len(body)))
+        self.__file.write(body)
+        self.__file.write(TRAILER.pack(offset, LOG_TRAILER_MAGIC))
+        self.__file.close()
+        self.__file = None
+
+
+"""
+" class LogReader
+"""
+class LogReader:
+    def __init__(self, filename: str):
+        self.__filename = filename
+        self.__file = None
+        self.__mmap = None
+        self.__topics = {}
+        self.__chunks = []
+
+    def Open(self):
+        self.__file = open(self.__filename, "rb")
+        self.__mmap = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, _ = FILE_HEADER.unpack_from(self.__mmap, 0)
+        if magic != LOG_MAGIC:
+            self.Close()
+            raise ValueError("not a unitree log file: " + self.__filename)
+        if version > LOG_VERSION:
+            self.Close()
+            raise ValueError("unsupported log version: {}".format(version))
+
+        offset = FILE_HEADER.size
+        tag, _, length = BLOCK_HEADER.unpack_from(self.__mmap, offset)
+        if tag != BLOCK_TAG_TOPIC:
+            self.Close()
+            raise ValueError("log topic block missing: " + self.__filename)
+
+        offset += BLOCK_HEADER.size
+        for d in json.loads(bytes(self.__mmap[offset:offset + length]).decode("utf-8")):
+            topic = TopicInfo.FromDict(d)
+            self.__topics[topic.id] = topic
+
+        if not self.__ReadIndex():
+            self.__ScanChunks(offset + length)
+
+    def Close(self):
+        if self.__mmap is not None:
+            self.__mmap.close()
+            self.__mmap = None
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def GetFilename(self):
+        return self.__filename
+
+    def GetTopics(self):
+        return list(self.__topics.values())
+
+    def GetTopic(self, name: str):
+        for topic in self.__topics.values():
+            if topic.name == name:
+                return topic
+        return None
+
+    def GetChunks(self):
+        return self.__chunks
+
+    def GetTimeRange(self):
+        if not self.__chunks:
+            return None, None
+        return self.__chunks[0].timeStart, self.__chunks[-1].timeEnd
+
+    def GetBuffer(self):
+        return self.__mmap
+
+    def ReadRecords(self, topicIds: set = None, chunks: list = None):
+        # yields (topic id, timestamp ns, payload offset, payload length)
+        buf = self.__mmap
+        for c in (self.__chunks if chunks is None else chunks):
+            offset = c.offset + BLOCK_HEADER.size + CHUNK_HEADER.size
+            end = c.offset + BLOCK_HEADER.size + c.size
+            while offset < end:
+                length, topicId, _, timestamp = RECORD_HEADER.unpack_from(buf, offset)
+                offset += RECORD_HEADER.size
+                if topicIds is None or topicId in topicIds:
+                    yield topicId, timestamp, offset, length
+                offset += length
+
+    def ReadRange(self, topicIds: set = None, timeStart: int = None, timeEnd: int = None):
+        # like ReadRecords, limited to [timeStart, timeEnd] (ns, inclusive, None for open)
+        lo = -(1 << 63) if timeStart is None else timeStart
+        hi = (1 << 63) - 1 if timeEnd is None else timeEnd
+
+        buf = self.__mmap
+        for c in self.__chunks:
+            if c.timeEnd < lo or c.timeStart > hi:
+                continue
+
+            begin = c.offset + BLOCK_HEADER.size + CHUNK_HEADER.size
+            end = c.offset + BLOCK_HEADER.size + c.size
+
+            if c.topics is not None:
+                begin, end = self.__NarrowSpan(c, topicIds, lo, hi, begin, end)
+                if begin >= end:
+                    continue
+
+            offset = begin
+            while offset < end:
+                length, topicId, _, timestamp = RECORD_HEADER.unpack_from(buf, offset)
+                offset += RECORD_HEADER.size
+                if (topicIds is None or topicId in topicIds) and lo <= timestamp <= hi:
+                    yield topicId, timestamp, offset, length
+                offset += length
+
+    def ReadPayload(self, offset: int, length: int):
+        return self.__mmap[offset:offset + length]
+
+    def __NarrowSpan(self, chunk: ChunkIndex, topicIds: set, lo: int, hi: int, begin: int, end: int):
+        # record span of the chunk that can hold matching records, from the sparse index
+        spanBegin = end
+        spanEnd = begin
+
+        for topicId, t in chunk.topics.items():
+            if topicIds is not None and topicId not in topicIds:
+                continue
+            if t.timeEnd < lo or t.timeStart > hi:
+                continue
+
+            # last sparse entry strictly before lo, first one strictly after hi
+            i = bisect.bisect_left(t.sparseTimes, lo) - 1
+            j = bisect.bisect_right(t.sparseTimes, hi)
+            spanBegin = min(spanBegin, t.sparseOffsets[i] if i >= 0 else begin)
+            spanEnd = max(spanEnd, t.sparseOffsets[j] if j < len(t.sparseOffsets) else end)
+
+        return spanBegin, spanEnd
+
+    def __ReadIndex(self):
+        size = len(self.__mmap)
+        if size < FILE_HEADER.size + TRAILER.size:
+            return False
+
+        offset, magic = TRAILER.unpack_from(self.__mmap, size - TRAILER.size)
+        if magic != LOG_TRAILER_MAGIC:
+            return False
+
+        tag, _, length = BLOCK_HEADER.unpack_from(self.__mmap, offset)
+        if tag != BLOCK_TAG_INDEX:
+            return False
+
+        offset += BLOCK_HEADER.size
+        end = offset + length
+
+        count, = INDEX_HEADER.unpack_from(self.__mmap, offset)
+        offset += INDEX_HEADER.size
+        for _ in range(count):
+            self.__chunks.append(ChunkIndex(*INDEX_ENTRY.unpack_from(self.__mmap, offset)))
+            offset += INDEX_ENTRY.size
+
+        # version 1 files stop here
+        if offset + INDEX_TOPIC_HEADER.size > end:
+            return True
+
+        topicCount, sparseCount = INDEX_TOPIC_HEADER.unpack_from(self.__mmap, offset)
+        offset += INDEX_TOPIC_HEADER.size
+        for c in self.__chunks:
+            c.topics = {}
+
+        for chunkNo, topicId, n, timeStart, timeEnd in INDEX_TOPIC_ENTRY.iter_unpack(self.__mmap[offset:offset + topicCount * INDEX_TOPIC_ENTRY.size]):
+            self.__chunks[chunkNo].topics[topicId] = TopicChunkIndex(n, timeStart, timeEnd)
+        offset += topicCount * INDEX_TOPIC_ENTRY.size
+
+        for chunkNo, topicId, timestamp, recordOffset in INDEX_SPARSE_ENTRY.iter_unpack(self.__mmap[offset:offset + sparseCount * INDEX_SPARSE_ENTRY.size]):
+            self.__chunks[chunkNo].topics[topicId].Add(timestamp, recordOffset)
+
+        return True
+
+    def __ScanChunks(self, offset: int):
+        size = len(self.__mmap)
+        while offset + BLOCK_HEADER.size + CHUNK_HEADER.size <= size:
+            tag, _, length = BLOCK_HEADER.unpack_from(self.__mmap, offset)
+            if tag != BLOCK_TAG_CHUNK or offset + BLOCK_HEADER.size + length > size:
+                # truncated tail
+                break
+            timeStart, timeEnd, count = CHUNK_HEADER.unpack_from(self.__mmap, offset + BLOCK_HEADER.size)
+            self.__chunks.append(ChunkIndex(offset, length, timeStart, timeEnd, count))
+            offset += BLOCK_HEADER.size + length
+
+
+"""
+" function ExpandLogFiles. a rotated log "run.utlog" is stored as run_0000.utlog, run_0001.utlog, ...
+"""
+def ExpandLogFiles(path):
+    if isinstance(path, (list, tuple)):
+        files = []
+        for p in path:
+            files.extend(ExpandLogFiles(p))
+        return files
+
+    if os.path.isfile(path):
+        return [path]
+
+    base, ext = os.path.splitext(path)
+    files = sorted(glob.glob(glob.escape(base) + "_[0-9][0-9][0-9][0-9]" + (ext or LOG_FILE_EXT)))
+    if not files:
+        raise FileNotFoundError(path)
+    return files
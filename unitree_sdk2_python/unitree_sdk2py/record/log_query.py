@@ -0,0 +1,80 @@
+from typing import Any
+
+from .log_format import LogReader, ExpandLogFiles
+
+
+"""
+" class LogQuery. time range reads over one log or a rotated set, e.g.
+"
+"   query = LogQuery("run.utlog")
+"   query.Open()
+"   for timestamp, state in query.Read(SportModeState_, t0, t1):
+"       ...
+"
+" only chunks overlapping [t0, t1] are touched, and inside a chunk the scan
+" starts and stops at the nearest sparse index entries of the queried topics.
+"""
+class LogQuery:
+    def __init__(self, path):
+        self.__files = ExpandLogFiles(path)
+        self.__readers = []
+
+    def Open(self):
+        for filename in self.__files:
+            reader = LogReader(filename)
+            reader.Open()
+            self.__readers.append(reader)
+
+        # rotated files in time order
+        self.__readers.sort(key=lambda r: r.GetTimeRange()[0] or 0)
+
+    def Close(self):
+        for reader in self.__readers:
+            reader.Close()
+        self.__readers = []
+
+    def GetTopics(self):
+        names = {}
+        for reader in self.__readers:
+            for topic in reader.GetTopics():
+                names.setdefault(topic.name, topic.typeName)
+        return names
+
+    def GetTimeRange(self):
+        starts = [r.GetTimeRange()[0] for r in self.__readers if r.GetChunks()]
+        ends = [r.GetTimeRange()[1] for r in self.__readers if r.GetChunks()]
+        if not starts:
+            return None, None
+        return min(starts), max(ends)
+
+    def ReadRaw(self, topic: Any, timeStart: int = None, timeEnd: int = None):
+        # yields (topic name, timestamp ns, CDR payload bytes)
+        for reader in self.__readers:
+            topics = self.__Match(reader, topic)
+            if not topics:
+                continue
+
+            for topicId, timestamp, offset, length in reader.ReadRange(set(topics.keys()), timeStart, timeEnd):
+                yield topics[topicId].name, timestamp, reader.ReadPayload(offset, length)
+
+    def Read(self, topic: Any, timeStart: int = None, timeEnd: int = None):
+        # yields (timestamp ns, sample)
+        for reader in self.__readers:
+            topics = self.__Match(reader, topic)
+            if not topics:
+                continue
+
+            types = {id: t.GetType() for id, t in topics.items()}
+            for topicId, timestamp, offset, length in reader.ReadRange(set(topics.keys()), timeStart, timeEnd):
+                yield timestamp, types[topicId].deserialize(reader.ReadPayload(offset, length))
+
+    def ReadAll(self, topic: Any, timeStart: int = None, timeEnd: int = None):
+        return list(self.Read(topic, timeStart, timeEnd))
+
+    def __Match(self, reader: LogReader, topic: Any):
+        # topic: topic name, DDS typename, or IDL class
+        if isinstance(topic, str):
+            return {t.id: t for t in reader.GetTopics() if t.name == topic or t.typeName == topic}
+
+        typeName = getattr(topic, "__idl_typename__", None)
+        return {t.id: t for t in reader.GetTopics() if t.typeName == typeName}
@@ -0,0 +1,117 @@
+import time
+
+from threading import Thread, Event
+
+from ..core.channel import ChannelPublisher
+from .log_format import LogReader, ExpandLogFiles
+
+
+"""
+" class Player
+"""
+class Player:
+    def __init__(self, path, rate: float = 1.0, loop: bool = False, topics: list = None):
+        self.__files = ExpandLogFiles(path)
+        self.__rate = rate
+        self.__loop = loop
+        self.__topicFilter = None if topics is None else set(topics)
+        self.__publishers = {}
+        self.__thread = None
+        self.__quit = Event()
+
+        self.__count = 0
+        self.__lateMax = 0.0
+        self.__lateSum = 0.0
+
+    def Init(self):
+        # publishers are shared across files by topic name
+        for filename in self.__files:
+            reader = LogReader(filename)
+            reader.Open()
+            for topic in reader.GetTopics():
+                if self.__topicFilter is not None and topic.name not in self.__topicFilter:
+                    continue
+                if topic.name not in self.__publishers:
+                    publisher = ChannelPublisher(topic.name, topic.GetType())
+                    publisher.Init()
+                    self.__publishers[topic.name] = publisher
+            reader.Close()
+
+    def SetRate(self, rate: float):
+        self.__rate = rate
+
+    def Play(self):
+        while not self.__quit.is_set():
+            self.__PlayOnce()
+            if not self.__loop:
+                break
+
+    def Start(self):
+        self.__quit.clear()
+        self.__thread = Thread(target=self.Play, name="log_player", daemon=True)
+        self.__thread.start()
+
+    def Stop(self):
+        self.__quit.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def Wait(self, timeout: float = None):
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+
+    def GetStats(self):
+        mean = self.__lateSum / self.__count if self.__count else 0.0
+        return {"count": self.__count, "late_max": self.__lateMax, "late_mean": mean}
+
+    def __PlayOnce(self):
+        logStart = None
+        wallStart = None
+
+        for filename in self.__files:
+            reader = LogReader(filename)
+            reader.Open()
+
+            topics = {}
+            for topic in reader.GetTopics():
+                if topic.name in self.__publishers:
+                    topics[topic.id] = (topic.GetType(), self.__publishers[topic.name])
+
+            try:
+                for topicId, timestamp, offset, length in reader.ReadRecords(set(topics.keys())):
+                    if self.__quit.is_set():
+                        return
+
+                    if logStart is None:
+                        logStart = timestamp
+                        wallStart = time.monotonic()
+
+                    type, publisher = topics[topicId]
+                    sample = type.deserialize(reader.ReadPayload(offset, length))
+
+                    target = wallStart + (timestamp - logStart) / 1e9 / self.__rate
+                    if not self.__SleepUntil(target):
+                        return
+                    publisher.Write(sample)
+            finally:
+                reader.Close()
+
+    def __SleepUntil(self, target: float):
+        # coarse sleep then spin the last millisecond for pacing accuracy.
+        # returns False when Stop() interrupted the wait
+        while True:
+            if self.__quit.is_set():
+                return False
+            remain = target - time.monotonic()
+            if remain <= 0.0:
+                break
+            if remain > 0.002 and self.__quit.wait(remain - 0.001):
+                return False
+
+        late = -remain
+        self.__count += 1
+        self.__lateSum += late
+        if late > self.__lateMax:
+            self.__lateMax = late
+        return True
@@ -0,0 +1,112 @@
+import os
+import time
+
+from threading import Lock
+from typing import Any
+
+from ..core.channel import ChannelSubscriber
+from .log_format import LogWriter, TopicInfo, LOG_FILE_EXT
+
+
+"""
+" class Recorder
+"""
+class Recorder:
+    def __init__(self, filename: str, chunkSize: int = 1 << 20, maxFileSize: int = 0):
+        self.__filename = filename
+        self.__chunkSize = chunkSize
+        self.__maxFileSize = maxFileSize
+        self.__topics = []
+        self.__queueLens = []
+        self.__subscribers = []
+        self.__writer = None
+        self.__fileIndex = 0
+        self.__files = []
+        self.__lock = Lock()
+        self.__running = False
+
+        self.__count = {}
+        self.__bytes = 0
+        self.__errors = 0
+
+    def AddTopic(self, name: str, type: Any, queueLen: int = 100):
+        if self.__running:
+            raise RuntimeError("recorder topics must be added before Start")
+        self.__topics.append(TopicInfo.FromType(len(self.__topics), name, type))
+        self.__queueLens.append(queueLen)
+
+    def Start(self):
+        if self.__running:
+            return
+
+        self.__writer = self.__OpenWriter()
+        self.__running = True
+
+        for topic, queueLen in zip(self.__topics, self.__queueLens):
+            self.__count[topic.name] = 0
+            subscriber = ChannelSubscriber(topic.name, topic.GetType())
+            subscriber.Init(self.__MakeHandler(topic), queueLen)
+            self.__subscribers.append(subscriber)
+
+        print("[Recorder] recording", len(self.__topics), "topics to", self.__writer.GetFilename())
+
+    def Stop(self):
+        if not self.__running:
+            return
+
+        for subscriber in self.__subscribers:
+            subscriber.Close()
+        self.__subscribers = []
+
+        with self.__lock:
+            self.__running = False
+            self.__writer.Close()
+            self.__writer = None
+
+        print("[Recorder] stopped. records:", sum(self.__count.values()), ", bytes:", self.__bytes)
+
+    def GetFiles(self):
+        return list(self.__files)
+
+    def GetStats(self):
+        with self.__lock:
+            return {"count": dict(self.__count), "bytes": self.__bytes, "errors": self.__errors, "files": len(self.__files)}
+
+    def __MakeHandler(self, topic: TopicInfo):
+        def handler(sample: Any):
+            self.__OnSample(topic, sample)
+        return handler
+
+    def __OnSample(self, topic: TopicInfo, sample: Any):
+        try:
+            payload = sample.serialize()
+        except Exception as e:
+            with self.__lock:
+                self.__errors += 1
+            print("[Recorder] serialize error. topic:", topic.name, ", msg:", e)
+            return
+
+        with self.__lock:
+            if not self.__running:
+                return
+
+            # stamp under the lock so records from all listener threads stay time-ordered
+            self.__writer.Write(topic.id, time.time_ns(), payload)
+            self.__count[topic.name] += 1
+            self.__bytes += len(payload)
+
+            if self.__maxFileSize > 0 and self.__writer.GetSize() >= self.__maxFileSize:
+                self.__writer.Close()
+                self.__writer = self.__OpenWriter()
+
+    def __OpenWriter(self):
+        filename = self.__filename
+        if self.__maxFileSize > 0:
+            base, ext = os.path.splitext(self.__filename)
+            filename = "{}_{:04d}{}".format(base, self.__fileIndex, ext or LOG_FILE_EXT)
+            self.__fileIndex += 1
+
+        writer = LogWriter(filename, self.__topics, self.__chunkSize)
+        writer.Open()
+        self.__files.append(filename)
+        return writer
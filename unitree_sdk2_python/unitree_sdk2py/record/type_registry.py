@@ -0,0 +1,68 @@
+import pkgutil
+import importlib
+import threading
+
+from typing import Any
+from cyclonedds.idl import IdlStruct
+
+from ..utils.singleton import Singleton
+
+
+"""
+" class TypeRegistry. DDS typename -> IDL class, e.g.
+" "unitree_go.msg.dds_.SportModeState_" -> unitree_sdk2py.idl.unitree_go.msg.dds_.SportModeState_
+"
+" all structs under unitree_sdk2py.idl are found on first lookup. types
+" defined elsewhere are added with Register().
+"""
+class TypeRegistry(Singleton):
+    __types = {}
+    __scanned = False
+    __lock = threading.Lock()
+
+    def __init__(self):
+        super().__init__()
+
+    def Register(self, type: Any):
+        with self.__class__.__lock:
+            self.__class__.__types[type.__idl_typename__] = type
+
+    def Get(self, typeName: str):
+        self.__Scan()
+        return self.__class__.__types.get(typeName)
+
+    def GetTypeNames(self):
+        self.__Scan()
+        return sorted(self.__class__.__types.keys())
+
+    def __Scan(self):
+        if self.__class__.__scanned:
+            return
+
+        with self.__class__.__lock:
+            if self.__class__.__scanned:
+                return
+
+            package = importlib.import_module("unitree_sdk2py.idl")
+            for info in pkgutil.walk_packages(package.__path__, package.__name__ + "."):
+                try:
+                    module = importlib.import_module(info.name)
+                except Exception as e:
+                    print("[TypeRegistry] import error. module:", info.name, ", msg:", e)
+                    continue
+
+                for obj in vars(module).values():
+                    if isinstance(obj, type) and issubclass(obj, IdlStruct) and obj is not IdlStruct \
+                            and obj.__module__ == module.__name__:
+                        # explicit Register() wins over the scan
+                        self.__class__.__types.setdefault(obj.__idl_typename__, obj)
+
+            self.__class__.__scanned = True
+
+
+"""
+" function RegisterType. decorator form, for IDL structs defined outside unitree_sdk2py.idl
+"""
+def RegisterType(type: Any):
+    TypeRegistry().Register(type)
+    return type
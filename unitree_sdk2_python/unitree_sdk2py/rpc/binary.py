@@ -0,0 +1,108 @@
+from typing import Any
+
+from cyclonedds.idl import types
+
+try:
+    # private cyclonedds module, checked by a round trip in UseOctetSequence
+    from cyclonedds.idl._machinery import PlainCdrV2SequenceOfPrimitiveMachine
+except ImportError:
+    PlainCdrV2SequenceOfPrimitiveMachine = None
+
+from ..idl.unitree_api.msg.dds_ import Request_ as Request
+from ..idl.unitree_api.msg.dds_ import Response_ as Response
+from ..idl.default import unitree_api_msg_dds__Request_, unitree_api_msg_dds__Response_
+
+
+"""
+" class OctetSequenceMachine. sequence<uint8> with the same CDR layout
+" (uint32 length + raw bytes), but serialized from any buffer in one copy and
+" deserialized to bytes, instead of going through one Python int per byte.
+"""
+class OctetSequenceMachine(PlainCdrV2SequenceOfPrimitiveMachine or object):
+    def __init__(self, max_length: int = None):
+        super().__init__(types.uint8, max_length=max_length)
+
+    # extra arguments (key handling) differ between cyclonedds versions and do not apply here
+    def serialize(self, buffer, value, *args, **kwargs):
+        data = ToBinary(value)
+        assert self.max_length is None or len(data) <= self.max_length
+        buffer.align(4)
+        buffer.write('I', 4, len(data))
+        if len(data):
+            buffer.write_bytes(data)
+
+    def deserialize(self, buffer, *args, **kwargs):
+        buffer.align(4)
+        length = buffer.read('I', 4)
+        if length:
+            return buffer.read_bytes(length)
+        else:
+            return b""
+
+    def default_initialize(self):
+        return b""
+
+
+"""
+" function ToBinary. bytes, bytearray, memoryview, NumPy array or list of int -> bytes-like
+"""
+def ToBinary(data: Any):
+    if isinstance(data, (bytes, bytearray)):
+        return data
+    if isinstance(data, (list, tuple)):
+        return bytes(data)
+    # memoryview / NumPy array / any buffer, viewed as raw bytes without copying
+    view = memoryview(data)
+    if not view.c_contiguous:
+        raise ValueError("binary data must be C-contiguous")
+    return view.cast("B") if view.format != "B" or view.ndim != 1 else view
+
+
+"""
+" function UseOctetSequence. switch a sequence<uint8> member of an IDL struct
+" to OctetSequenceMachine. wire format and type information are unchanged.
+"
+" the machine classes are cyclonedds internals (tested with 0.10.2 and 11.0):
+" the patch is verified with a serialize / deserialize round trip of sample
+" and undone when that fails, leaving the stock list-of-int machine.
+"""
+def UseOctetSequence(type: Any, member: str, sample: Any = None):
+    if PlainCdrV2SequenceOfPrimitiveMachine is None:
+        print("[UseOctetSequence] cyclonedds machinery not found, keep default for", member)
+        return False
+
+    idl = type.__idl__
+    idl.populate()
+
+    # v0 (cyclonedds 0.10) or v1 (later) plain CDR machine, and the xcdr2 machine
+    patched = []
+    for attr in ("v0_machine", "v1_machine", "v2_machine"):
+        machine = getattr(idl, attr, None)
+        if machine is None or not hasattr(machine, "members_machines"):
+            continue
+
+        current = machine.members_machines.get(member)
+        if isinstance(current, PlainCdrV2SequenceOfPrimitiveMachine) and current.size == 1 \
+                and not isinstance(current, OctetSequenceMachine):
+            machine.members_machines[member] = OctetSequenceMachine(current.max_length)
+            patched.append((machine, current))
+
+    if not patched or sample is None:
+        return bool(patched)
+
+    try:
+        setattr(sample, member, b"\x01\x02\xff")
+        ok = getattr(type.deserialize(sample.serialize()), member) == b"\x01\x02\xff"
+    except Exception as e:
+        print("[UseOctetSequence] round trip error:", e)
+        ok = False
+
+    if not ok:
+        for machine, original in patched:
+            machine.members_machines[member] = original
+        print("[UseOctetSequence] unsupported cyclonedds version, keep default for", member)
+    return ok
+
+
+UseOctetSequence(Request, "binary", unitree_api_msg_dds__Request_())
+UseOctetSequence(Response, "binary", unitree_api_msg_dds__Response_())
@@ -1,3 +1,5 @@
+from typing import Any
+
 from .client_base import ClientBase
 from .lease_client import LeaseClient
 from .internal import *
@@ -57,7 +59,7 @@ class Client(ClientBase):
             return RPC_ERR_CLIENT_API_NOT_REG
     
     def _CallRequestWithParamAndBin(self, apiId: int, requestParamter: str,
-                                    requestBinary: list):
+                                    requestBinary: Any):
         ret, proirity, leaseId = self.__CheckApi(apiId)
         if ret == 0:
             return self._CallRequestWithParamAndBinBase(apiId, requestParamter,
@@ -67,7 +69,7 @@ class Client(ClientBase):
             return RPC_ERR_CLIENT_API_NOT_REG, None
 
     def _CallRequestWithParamAndBinNoReply(self, apiId: int, requestParamter: str,
-                                           requestBinary: list):
+                                           requestBinary: Any):
         ret, proirity, leaseId = self.__CheckApi(apiId)
         if ret == 0:
             return self._CallRequestWithParamAndBinNoReplyBase(apiId,
@@ -78,14 +80,14 @@ class Client(ClientBase):
         else:
             return RPC_ERR_CLIENT_API_NOT_REG
 
-    def _CallBinary(self, apiId: int, parameter: list):
+    def _CallBinary(self, apiId: int, parameter: Any):
         ret, proirity, leaseId = self.__CheckApi(apiId)
         if ret == 0:
             return self._CallBinaryBase(apiId, parameter, proirity, leaseId)
         else:
             return RPC_ERR_CLIENT_API_NOT_REG, None
 
-    def _CallBinaryNoReply(self, apiId: int, parameter: list):
+    def _CallBinaryNoReply(self, apiId: int, parameter: Any):
         ret, proirity, leaseId = self.__CheckApi(apiId)
         if ret == 0:
             return self._CallBinaryNoReplyBase(apiId, parameter, proirity, leaseId)
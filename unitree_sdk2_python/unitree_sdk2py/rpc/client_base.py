@@ -1,5 +1,7 @@
 import time
 
+from typing import Any
+
 from ..idl.unitree_api.msg.dds_ import Request_ as Request
 from ..idl.unitree_api.msg.dds_ import RequestHeader_ as RequestHeader
 from ..idl.unitree_api.msg.dds_ import RequestLease_ as RequestLease
@@ -9,6 +11,7 @@ from ..idl.unitree_api.msg.dds_ import RequestPolicy_ as RequestPolicy
 from ..utils.future import FutureResult
 
 from .client_stub import ClientStub
+from .binary import ToBinary
 from .internal import *
 
 
@@ -27,7 +30,7 @@ class ClientBase:
     def _CallBase(self, apiId: int, parameter: str, proirity: int = 0, leaseId: int = 0):
         # print("[CallBase] call apiId:", apiId, ", proirity:", proirity, ", leaseId:", leaseId)
         header = self.__SetHeader(apiId, leaseId, proirity, False)
-        request = Request(header, parameter, [])
+        request = Request(header, parameter, b"")
 
         future = self.__stub.SendRequest(request, self.__timeout)
         if future is None:
@@ -49,7 +52,7 @@ class ClientBase:
 
     def _CallNoReplyBase(self, apiId: int, parameter: str, proirity: int, leaseId: int):
         header = self.__SetHeader(apiId, leaseId, proirity, True)
-        request = Request(header, parameter, [])
+        request = Request(header, parameter, b"")
 
         if self.__stub.Send(request, self.__timeout):
             return 0
@@ -57,10 +60,10 @@ class ClientBase:
             return RPC_ERR_CLIENT_SEND
 
     def _CallRequestWithParamAndBinBase(self, apiId: int, requestParamter: str,
-                                        requestBinary: list, proirity: int = 0,
+                                        requestBinary: Any, proirity: int = 0,
                                         leaseId: int = 0):
         header = self.__SetHeader(apiId, leaseId, proirity, False)
-        request = Request(header, requestParamter, requestBinary)
+        request = Request(header, requestParamter, ToBinary(requestBinary))
 
         future = self.__stub.SendRequest(request, self.__timeout)
         if future is None:
@@ -81,19 +84,20 @@ class ClientBase:
             return response.header.status.code, response.data
 
     def _CallRequestWithParamAndBinNoReplyBase(self, apiId: int, requestParamter: str,
-                                               requestBinary: list, proirity: int,
+                                               requestBinary: Any, proirity: int,
                                                leaseId: int):
         header = self.__SetHeader(apiId, leaseId, proirity, True)
-        request = Request(header, requestParamter, request_binary)
+        request = Request(header, requestParamter, ToBinary(requestBinary))
 
         if self.__stub.Send(request, self.__timeout):
             return 0
         else:
             return RPC_ERR_CLIENT_SEND
 
-    def _CallBinaryBase(self, apiId: int, parameter: list, proirity: int, leaseId: int):
+    def _CallBinaryBase(self, apiId: int, parameter: Any, proirity: int, leaseId: int):
+        # parameter: bytes, bytearray, memoryview, NumPy array or list of int. returns bytes
         header = self.__SetHeader(apiId, leaseId, proirity, False)
-        request = Request(header, "", parameter)
+        request = Request(header, "", ToBinary(parameter))
         
         future = self.__stub.SendRequest(request, self.__timeout)
         if future is None:
@@ -112,9 +116,9 @@ class ClientBase:
         else:
             return response.header.status.code, response.binary
 
-    def _CallBinaryNoReplyBase(self, apiId: int, parameter: list, proirity: int, leaseId: int):
+    def _CallBinaryNoReplyBase(self, apiId: int, parameter: Any, proirity: int, leaseId: int):
         header = self.__SetHeader(apiId, leaseId, proirity, True)
-        request = Request(header, "", parameter)
+        request = Request(header, "", ToBinary(parameter))
 
         if self.__stub.Send(request, self.__timeout):
             return 0
@@ -19,7 +19,7 @@ class Server(ServerBase):
         self.__apiVersion = ""
         self.__apiHandlerMapping = {}
         self.__apiBinaryHandlerMapping = {}
-        self.__apiBinarySet = {}
+        self.__apiBinarySet = set()
         self.__enableLease = False
         self.__leaseServer = None
         super().__init__(name)
@@ -82,7 +82,7 @@ class Server(ServerBase):
 
         code = 0
         data = ""
-        dataBinary = []
+        dataBinary = b""
 
         if apiId == RPC_API_ID_INTERNAL_API_VERSION:
             data = self.__apiVersion
@@ -109,7 +109,7 @@ class Server(ServerBase):
                     else:
                         code, dataBinary = binaryRequestHandler(parameterBinary)
                         if code != 0:
-                            dataBinary = []
+                            dataBinary = b""
                 except:
                     code = RPC_ERR_SERVER_INTERNAL
 
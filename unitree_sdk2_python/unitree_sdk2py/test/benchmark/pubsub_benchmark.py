@@ -0,0 +1,343 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import threading
+
+from unitree_sdk2py.core.channel import ChannelPublisher, ChannelSubscriber
+from unitree_sdk2py.core.channel import ChannelFactoryInitialize, ChannelFactoryInitializeLoopback
+from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_, unitree_go_msg_dds__LowState_
+from unitree_sdk2py.idl.default import unitree_hg_msg_dds__LowState_, std_msgs_msg_dds__String_
+from unitree_sdk2py.idl.default import std_msgs_msg_dds__Header_
+from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowCmd_, LowState_
+from unitree_sdk2py.idl.unitree_hg.msg.dds_ import LowState_ as HGLowState_
+from unitree_sdk2py.idl.sensor_msgs.msg.dds_ import PointCloud2_, PointField_
+from unitree_sdk2py.idl.std_msgs.msg.dds_ import String_
+
+
+"""
+" pub/sub benchmark. ChannelPublisher.Write -> ChannelSubscriber handler for
+" LowCmd_, LowState_, HGLowState_, PointCloud2_ and String_, in direct
+" callback and queueLen > 0 modes.
+"
+" per type and mode it measures:
+"   serialize / deserialize cost
+"   end-to-end latency at a fixed rate, from a send timestamp embedded in the sample
+"   max sustainable rate: highest rate in a doubling ramp with loss <= --max-loss
+"
+" usage:
+"   python3 pubsub_benchmark.py [--loopback] [--interface eth0] [--json result.json]
+"
+" send and receive run in one process, so the embedded timestamp needs no clock sync.
+"""
+MASK32 = 0xFFFFFFFF
+
+
+def make_lowcmd(size: int):
+    return unitree_go_msg_dds__LowCmd_()
+
+
+def stamp_lowcmd(sample, seq: int, ns: int):
+    sample.sn = [ns & MASK32, ns >> 32]
+    sample.reserve = seq & MASK32
+
+
+def read_lowcmd(sample):
+    return sample.reserve, sample.sn[0] | (sample.sn[1] << 32)
+
+
+def make_lowstate(size: int):
+    return unitree_go_msg_dds__LowState_()
+
+
+def stamp_lowstate(sample, seq: int, ns: int):
+    sample.sn = [ns & MASK32, ns >> 32]
+    sample.tick = seq & MASK32
+
+
+def read_lowstate(sample):
+    return sample.tick, sample.sn[0] | (sample.sn[1] << 32)
+
+
+def make_hg_lowstate(size: int):
+    return unitree_hg_msg_dds__LowState_()
+
+
+def stamp_hg_lowstate(sample, seq: int, ns: int):
+    sample.reserve = [ns & MASK32, ns >> 32, 0, 0]
+    sample.tick = seq & MASK32
+
+
+def read_hg_lowstate(sample):
+    return sample.tick, sample.reserve[0] | (sample.reserve[1] << 32)
+
+
+def make_pointcloud(size: int):
+    # xyz + intensity float32 points, like rt/utlidar/cloud
+    points = max(1, size // 16)
+    fields = [PointField_(name, 4 * i, 7, 1) for i, name in enumerate(["x", "y", "z", "intensity"])]
+    return PointCloud2_(std_msgs_msg_dds__Header_(), 1, points, fields, False, 16, 16 * points,
+                        list(os.urandom(16 * points)), True)
+
+
+def stamp_pointcloud(sample, seq: int, ns: int):
+    sample.header.stamp.sec = ns // 1000000000
+    sample.header.stamp.nanosec = ns % 1000000000
+    sample.header.frame_id = str(seq)
+
+
+def read_pointcloud(sample):
+    return int(sample.header.frame_id), sample.header.stamp.sec * 1000000000 + sample.header.stamp.nanosec
+
+
+def make_string(size: int):
+    sample = std_msgs_msg_dds__String_()
+    sample.data = "x" * size
+    return sample
+
+
+def stamp_string(sample, seq: int, ns: int):
+    head = "{} {} ".format(seq, ns)
+    sample.data = head + sample.data[len(head):]
+
+
+def read_string(sample):
+    seq, ns, _ = sample.data.split(" ", 2)
+    return int(seq), int(ns)
+
+
+# name -> (type, make, stamp, read, default payload size)
+BENCH_TYPES = {
+    "LowCmd_": (LowCmd_, make_lowcmd, stamp_lowcmd, read_lowcmd, 0),
+    "LowState_": (LowState_, make_lowstate, stamp_lowstate, read_lowstate, 0),
+    "HGLowState_": (HGLowState_, make_hg_lowstate, stamp_hg_lowstate, read_hg_lowstate, 0),
+    "PointCloud2_": (PointCloud2_, make_pointcloud, stamp_pointcloud, read_pointcloud, 64 << 10),
+    "String_": (String_, make_string, stamp_string, read_string, 256),
+}
+
+
+def percentile(sorted_values: list, p: float):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+"""
+" class Probe. subscriber side: counts samples and latency per run.
+"""
+class Probe:
+    def __init__(self, read):
+        self.__read = read
+        self.__lock = threading.Lock()
+        self.__latencies = []
+        self.__received = 0
+        self.__lastSeq = -1
+        self.__reordered = 0
+
+    def Reset(self):
+        with self.__lock:
+            self.__latencies = []
+            self.__received = 0
+            self.__lastSeq = -1
+            self.__reordered = 0
+
+    def Handler(self, sample):
+        now = time.time_ns()
+        seq, ns = self.__read(sample)
+        with self.__lock:
+            self.__received += 1
+            self.__latencies.append(now - ns)
+            if seq < self.__lastSeq:
+                self.__reordered += 1
+            self.__lastSeq = seq
+
+    def Get(self):
+        with self.__lock:
+            return self.__received, sorted(self.__latencies), self.__reordered
+
+
+def measure_codec(type, sample, iterations: int):
+    payload = sample.serialize()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        sample.serialize()
+    ser = (time.perf_counter() - start) / iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        type.deserialize(payload)
+    de = (time.perf_counter() - start) / iterations
+
+    return {"bytes": len(payload), "serialize_us": ser * 1e6, "deserialize_us": de * 1e6}
+
+
+def publish_at(publisher, sample, stamp, rate: float, duration: float, seq0: int):
+    # paced publish, busy-waits between samples so high rates stay accurate
+    count = max(1, int(rate * duration))
+    period = 1.0 / rate
+    start = time.perf_counter()
+    for i in range(count):
+        target = start + i * period
+        while True:
+            remain = target - time.perf_counter()
+            if remain <= 0.0:
+                break
+            if remain > 0.002:
+                time.sleep(remain - 0.001)
+        stamp(sample, seq0 + i, time.time_ns())
+        publisher.Write(sample)
+    achieved = count / max(time.perf_counter() - start, 1e-9)
+    return count, achieved
+
+
+def drain(probe: Probe, sent: int, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if probe.Get()[0] >= sent:
+            break
+        time.sleep(0.01)
+
+
+def wait_matched(publisher, probe: Probe, sample, stamp, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stamp(sample, 0, time.time_ns())
+        publisher.Write(sample)
+        time.sleep(0.05)
+        if probe.Get()[0] > 0:
+            return True
+    return False
+
+
+def run_case(name: str, mode: str, queue_len: int, args):
+    type, make, stamp, read, default_size = BENCH_TYPES[name]
+    size = args.size if args.size is not None else default_size
+    sample = make(size)
+
+    result = {"type": name, "mode": mode, "queue_len": queue_len}
+    result.update(measure_codec(type, sample, args.codec_iterations))
+
+    topic = "rt/bench/{}/{}".format(name.lower(), mode)
+    probe = Probe(read)
+
+    subscriber = ChannelSubscriber(topic, type)
+    subscriber.Init(probe.Handler, queue_len)
+    publisher = ChannelPublisher(topic, type)
+    publisher.Init()
+
+    if not wait_matched(publisher, probe, sample, stamp):
+        print("[PubSubBenchmark] no match on", topic)
+        result["error"] = "not matched"
+        subscriber.Close()
+        publisher.Close()
+        return result
+
+    time.sleep(0.2)
+
+    # latency at a fixed rate
+    probe.Reset()
+    sent, _ = publish_at(publisher, sample, stamp, args.rate, args.duration, 1)
+    drain(probe, sent, 1.0)
+    received, latencies, reordered = probe.Get()
+    result["latency"] = {
+        "rate_hz": args.rate,
+        "sent": sent,
+        "received": received,
+        "reordered": reordered,
+        "p50_us": percentile(latencies, 0.50) / 1e3,
+        "p99_us": percentile(latencies, 0.99) / 1e3,
+        "p999_us": percentile(latencies, 0.999) / 1e3,
+        "max_us": (latencies[-1] if latencies else 0) / 1e3,
+    }
+
+    # max sustainable rate, doubling ramp
+    steps = []
+    best = 0.0
+    rate = args.ramp_start
+    while rate <= args.ramp_max:
+        probe.Reset()
+        sent, achieved = publish_at(publisher, sample, stamp, rate, args.ramp_duration, 1)
+        drain(probe, sent, 1.0)
+        received, latencies, _ = probe.Get()
+        loss = 1.0 - received / sent
+        steps.append({"rate_hz": rate, "achieved_hz": achieved, "sent": sent, "received": received,
+                      "loss": loss, "p99_us": percentile(latencies, 0.99) / 1e3})
+
+        # stop when samples drop or the publisher itself cannot keep up
+        if loss > args.max_loss or achieved < rate * 0.9:
+            break
+        best = rate
+        rate *= 2
+
+    result["max_rate_hz"] = best
+    result["ramp"] = steps
+
+    subscriber.Close()
+    publisher.Close()
+    return result
+
+
+def print_result(r: dict):
+    if "error" in r:
+        print("{:<13} {:<7} {}".format(r["type"], r["mode"], r["error"]))
+        return
+    l = r["latency"]
+    print("{:<13} {:<7} {:>8} B  ser {:>8.1f} us  de {:>8.1f} us  lat p50 {:>8.1f} p99 {:>8.1f} us  recv {}/{}  max rate {:>8.0f} Hz".format(
+        r["type"], r["mode"], r["bytes"], r["serialize_us"], r["deserialize_us"],
+        l["p50_us"], l["p99_us"], l["received"], l["sent"], r["max_rate_hz"]))
+
+
+def host_info(args):
+    return {
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "node": platform.node(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "backend": "loopback" if args.loopback else "dds",
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="unitree sdk2 pub/sub benchmark")
+    parser.add_argument("--loopback", action="store_true", help="in-process loopback channel instead of DDS")
+    parser.add_argument("--interface", default=None, help="DDS network interface, e.g. eth0")
+    parser.add_argument("--domain", type=int, default=0)
+    parser.add_argument("--types", nargs="*", default=list(BENCH_TYPES.keys()), choices=list(BENCH_TYPES.keys()))
+    parser.add_argument("--modes", nargs="*", default=["direct", "queue"], choices=["direct", "queue"])
+    parser.add_argument("--queue-len", type=int, default=10, help="subscriber queue length for queue mode")
+    parser.add_argument("--size", type=int, default=None, help="payload bytes for PointCloud2_/String_")
+    parser.add_argument("--rate", type=float, default=500.0, help="latency test rate, Hz")
+    parser.add_argument("--duration", type=float, default=2.0, help="latency test seconds")
+    parser.add_argument("--ramp-start", type=float, default=100.0)
+    parser.add_argument("--ramp-max", type=float, default=102400.0)
+    parser.add_argument("--ramp-duration", type=float, default=1.0)
+    parser.add_argument("--max-loss", type=float, default=0.001, help="loss ratio still counted as sustainable")
+    parser.add_argument("--codec-iterations", type=int, default=200)
+    parser.add_argument("--json", default=None, help="write results to this file, - for stdout")
+    args = parser.parse_args()
+
+    if args.loopback:
+        ChannelFactoryInitializeLoopback()
+    else:
+        ChannelFactoryInitialize(args.domain, args.interface)
+
+    results = []
+    for name in args.types:
+        for mode in args.modes:
+            r = run_case(name, mode, args.queue_len if mode == "queue" else 0, args)
+            results.append(r)
+            if args.json != "-":
+                print_result(r)
+
+    report = {"host": host_info(args), "args": vars(args), "results": results}
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,255 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+
+from unitree_sdk2py.core.channel import ChannelFactoryInitialize, ChannelFactoryInitializeLoopback
+from unitree_sdk2py.rpc.server import Server
+from unitree_sdk2py.rpc.client import Client
+
+
+"""
+" rpc benchmark. one Server with echo, binary echo and large-payload handlers,
+" driven by a Client in sequential, threaded, no-reply and binary modes.
+"
+" usage:
+"   python3 rpc_benchmark.py --loopback                     server and client in one process, no network
+"   python3 rpc_benchmark.py --role server [--interface eth0]
+"   python3 rpc_benchmark.py --role client [--interface eth0] [--json out.json]
+"
+" cpu/call is process cpu time over calls, so with --role both it includes the server side.
+"""
+BENCH_SERVICE_NAME = "rpc_bench"
+BENCH_API_VERSION = "1.0.0.0"
+
+BENCH_API_ID_ECHO = 1001
+BENCH_API_ID_BINARY_ECHO = 1002
+BENCH_API_ID_PAYLOAD = 1003
+BENCH_API_ID_NOREPLY = 1004
+
+BINARY_SIZES = [1 << 10, 16 << 10, 256 << 10, 1 << 20, 4 << 20]
+
+
+"""
+" class BenchServer
+"""
+class BenchServer(Server):
+    def __init__(self):
+        super().__init__(BENCH_SERVICE_NAME)
+        self.__noReplyCount = 0
+        self.__lock = threading.Lock()
+
+    def Init(self):
+        self._RegistHandler(BENCH_API_ID_ECHO, self.Echo, 0)
+        self._RegistHandler(BENCH_API_ID_PAYLOAD, self.Payload, 0)
+        self._RegistHandler(BENCH_API_ID_NOREPLY, self.NoReply, 0)
+        self._RegistBinaryHandler(BENCH_API_ID_BINARY_ECHO, self.BinaryEcho, 0)
+        self._SetApiVersion(BENCH_API_VERSION)
+
+    def Echo(self, parameter: str):
+        return 0, parameter
+
+    def Payload(self, parameter: str):
+        # large string response of the requested size
+        return 0, "x" * json.loads(parameter)["size"]
+
+    def NoReply(self, parameter: str):
+        with self.__lock:
+            self.__noReplyCount += 1
+        return 0, ""
+
+    def BinaryEcho(self, parameter: bytes):
+        return 0, parameter
+
+    def GetNoReplyCount(self):
+        with self.__lock:
+            return self.__noReplyCount
+
+
+"""
+" class BenchClient
+"""
+class BenchClient(Client):
+    def __init__(self):
+        super().__init__(BENCH_SERVICE_NAME)
+
+    def Init(self):
+        self._RegistApi(BENCH_API_ID_ECHO, 0)
+        self._RegistApi(BENCH_API_ID_PAYLOAD, 0)
+        self._RegistApi(BENCH_API_ID_NOREPLY, 0)
+        self._RegistApi(BENCH_API_ID_BINARY_ECHO, 0)
+        self._SetApiVerson(BENCH_API_VERSION)
+
+    def Echo(self, parameter: str):
+        code, _ = self._Call(BENCH_API_ID_ECHO, parameter)
+        return code
+
+    def Payload(self, size: int):
+        code, data = self._Call(BENCH_API_ID_PAYLOAD, json.dumps({"size": size}))
+        return code if code != 0 or len(data) == size else -1
+
+    def NoReply(self, parameter: str):
+        return self._CallNoReply(BENCH_API_ID_NOREPLY, parameter)
+
+    def BinaryEcho(self, data: bytes):
+        code, _ = self._CallBinary(BENCH_API_ID_BINARY_ECHO, data)
+        return code
+
+
+def percentile(sorted_values: list, p: float):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * p))
+    return sorted_values[index]
+
+
+def summarize(name: str, latencies: list, errors: int, wall: float, cpu: float, extra: dict = None):
+    latencies.sort()
+    calls = len(latencies)
+    result = {
+        "name": name,
+        "calls": calls,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 0.50) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+        "p999_ms": percentile(latencies, 0.999) * 1e3,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1e3,
+        "calls_per_sec": calls / wall if wall > 0 else 0.0,
+        "cpu_us_per_call": cpu / calls * 1e6 if calls else 0.0,
+    }
+    if extra:
+        result.update(extra)
+    return result
+
+
+def run_calls(name: str, call, count: int, threads: int = 1, extra: dict = None):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def worker(n: int):
+        local = []
+        local_errors = 0
+        for _ in range(n):
+            start = time.perf_counter()
+            code = call()
+            elapsed = time.perf_counter() - start
+            if code == 0:
+                local.append(elapsed)
+            else:
+                local_errors += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    per_thread = max(1, count // threads)
+    workers = [threading.Thread(target=worker, args=(per_thread,)) for _ in range(threads)]
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    return summarize(name, latencies, errors[0], wall, cpu, extra)
+
+
+def print_result(r: dict):
+    print("{:<28} calls {:>6}  err {:>4}  p50 {:>8.3f}  p99 {:>8.3f}  p999 {:>8.3f} ms  {:>9.1f} call/s  {:>8.1f} us cpu/call".format(
+        r["name"], r["calls"], r["errors"], r["p50_ms"], r["p99_ms"], r["p999_ms"], r["calls_per_sec"], r["cpu_us_per_call"]))
+    if "delivered" in r:
+        print("{:<28} delivered {} of {}".format("", r["delivered"], r["calls"]))
+
+
+def run_client(args, server: BenchServer = None):
+    client = BenchClient()
+    client.Init()
+    client.SetTimeout(args.timeout)
+
+    code, version = client.GetServerApiVersion()
+    if code != 0:
+        print("server not reachable. code:", code)
+        return []
+
+    results = []
+
+    # warm up
+    for _ in range(10):
+        client.Echo("{}")
+
+    results.append(run_calls("echo sequential", lambda: client.Echo("{}"), args.count))
+
+    for threads in args.threads:
+        results.append(run_calls("echo threads={}".format(threads), lambda: client.Echo("{}"), args.count, threads,
+                                 {"threads": threads}))
+
+    # no-reply: latency is send cost, delivery is checked on the server when in-process
+    before = server.GetNoReplyCount() if server is not None else None
+    r = run_calls("noreply sequential", lambda: client.NoReply("{}"), args.count)
+    if server is not None:
+        time.sleep(0.5)
+        r["delivered"] = server.GetNoReplyCount() - before
+    results.append(r)
+
+    for size in args.sizes:
+        data = os.urandom(size)
+        count = max(3, args.count * 1024 // max(size, 1024) // 4)
+        results.append(run_calls("binary echo {}B".format(size), lambda: client.BinaryEcho(data), count,
+                                 extra={"bytes": size, "mb_per_sec": 0.0}))
+        r = results[-1]
+        r["mb_per_sec"] = r["calls_per_sec"] * size * 2 / 1e6
+
+    for size in args.sizes:
+        count = max(3, args.count * 1024 // max(size, 1024) // 4)
+        results.append(run_calls("string payload {}B".format(size), lambda: client.Payload(size), count,
+                                 extra={"bytes": size}))
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="unitree sdk2 rpc benchmark")
+    parser.add_argument("--role", choices=["both", "server", "client"], default="both")
+    parser.add_argument("--loopback", action="store_true", help="in-process loopback channel instead of DDS")
+    parser.add_argument("--latency", type=float, default=0.0, help="loopback latency, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="loopback jitter, seconds")
+    parser.add_argument("--loss", type=float, default=0.0, help="loopback loss probability")
+    parser.add_argument("--interface", default=None, help="DDS network interface, e.g. eth0")
+    parser.add_argument("--domain", type=int, default=0)
+    parser.add_argument("--count", type=int, default=1000, help="calls per echo mode")
+    parser.add_argument("--threads", type=int, nargs="*", default=[2, 4, 8])
+    parser.add_argument("--sizes", type=int, nargs="*", default=BINARY_SIZES, help="binary payload sizes, bytes")
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--json", default=None, help="write results to this file")
+    args = parser.parse_args()
+
+    if args.loopback:
+        if args.role != "both":
+            print("--loopback needs --role both")
+            sys.exit(1)
+        ChannelFactoryInitializeLoopback(args.latency, args.jitter, args.loss)
+    else:
+        ChannelFactoryInitialize(args.domain, args.interface)
+
+    server = None
+    if args.role in ("both", "server"):
+        server = BenchServer()
+        server.Init()
+        server.Start(False)
+
+    if args.role == "server":
+        while True:
+            time.sleep(10)
+
+    results = run_client(args, server)
+    for r in results:
+        print_result(r)
+
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump({"backend": "loopback" if args.loopback else "dds", "results": results}, f, indent=2)
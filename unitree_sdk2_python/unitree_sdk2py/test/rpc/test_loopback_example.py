@@ -0,0 +1,51 @@
+import sys
+import time
+
+from unitree_sdk2py.core.channel import ChannelFactoryInitializeLoopback
+from unitree_sdk2py.core.channel_loopback import LoopbackBus
+
+from test_server_example import TestServer
+from test_client_example import TestClient
+
+
+"""
+" server and client in one process over the loopback channel, no DDS domain needed.
+" usage: python3 test_loopback_example.py [latency_s] [jitter_s] [loss]
+"""
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.001
+    jitter = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0005
+    loss = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+
+    # initialize loopback channel factory.
+    ChannelFactoryInitializeLoopback(latency, jitter, loss, seed=0)
+
+    # create server
+    server = TestServer()
+    server.Init()
+    server.Start(False)
+
+    # create client
+    client = TestClient()
+    client.Init()
+    client.SetTimeout(1.0)
+
+    code, serverApiVersion = client.GetServerApiVersion()
+    print("server api version:", serverApiVersion)
+
+    latencies = []
+    errors = 0
+    for i in range(100):
+        start = time.perf_counter()
+        code = client.Stop()
+        if code == 0:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors += 1
+
+    latencies.sort()
+    if latencies:
+        print("calls ok:", len(latencies), ", errors:", errors)
+        print("latency p50: {:.3f} ms, p99: {:.3f} ms".format(
+            latencies[len(latencies) // 2] * 1e3, latencies[int(len(latencies) * 0.99) - 1] * 1e3))
+    print("bus stats:", LoopbackBus().GetStats())
@@ -0,0 +1,209 @@
+import time
+import threading
+import numpy as np
+import cv2
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from .bqueue import BQueue
+
+
+"""
+" class VideoFrame
+"""
+class VideoFrame:
+    def __init__(self, seq: int, image: Any, data: bytes, requestTime: float, receiveTime: float, decodeTime: float,
+                 stamp: int = 0):
+        self.seq = seq
+        # source timestamp carried by the stream, if any
+        self.stamp = stamp
+        self.image = image
+        self.data = data
+        # time.monotonic() when the request was sent, the JPEG arrived, and the frame was decoded
+        self.requestTime = requestTime
+        self.receiveTime = receiveTime
+        self.decodeTime = decodeTime
+
+    def GetLatency(self):
+        return self.decodeTime - self.requestTime
+
+
+"""
+" class VideoStream. continuous frames from an image sample RPC client.
+"
+" client is any client with GetImageSample(), e.g. go2 VideoClient, b2
+" FrontVideoClient or BackVideoClient, already Init()ed. fetchers threads keep
+" that many requests in flight, JPEGs are decoded on a pool of decoders
+" threads (cv2.imdecode releases the GIL), and frames are delivered in
+" request order through a latest-frame slot (queueLen 0) or a bounded queue.
+" frames that finish decoding after a newer one was delivered are dropped.
+"""
+class VideoStream:
+    def __init__(self, client: Any, fetchers: int = 2, decoders: int = 2, queueLen: int = 0, decode: bool = True):
+        self.__client = client
+        self.__fetchers = fetchers
+        self.__decoders = decoders
+        self.__queueLen = queueLen
+        self.__decode = decode
+
+        self.__threads = []
+        self.__pool = None
+        self.__quit = threading.Event()
+
+        self.__lock = threading.Lock()
+        self.__condition = threading.Condition(self.__lock)
+        self.__seq = 0
+        self.__pending = 0
+        self.__lastDelivered = -1
+        self.__lastRead = -1
+        self.__latest = None
+        self.__queue = None
+
+        self.__fetched = 0
+        self.__delivered = 0
+        self.__dropped = 0
+        self.__errors = 0
+        self.__latencySum = 0.0
+        self.__latencyMax = 0.0
+        self.__deliverTimes = deque(maxlen=60)
+
+    def Start(self):
+        if self.__threads:
+            return
+
+        self.__quit.clear()
+        if self.__queueLen > 0:
+            self.__queue = BQueue(self.__queueLen)
+        if self.__decode:
+            self.__pool = ThreadPoolExecutor(max_workers=self.__decoders, thread_name_prefix="video_decode")
+
+        for i in range(self.__fetchers):
+            thread = threading.Thread(target=self.__FetchThreadFunc, name="video_fetch_{}".format(i), daemon=True)
+            thread.start()
+            self.__threads.append(thread)
+
+    def Stop(self):
+        self.__quit.set()
+        with self.__condition:
+            self.__condition.notify_all()
+        if self.__queue is not None:
+            self.__queue.Interrupt(True)
+
+        for thread in self.__threads:
+            thread.join()
+        self.__threads = []
+
+        if self.__pool is not None:
+            self.__pool.shutdown(wait=True)
+            self.__pool = None
+
+    def GetFrame(self, timeout: float = None):
+        # next frame newer than the last one returned, None on timeout or stop
+        if self.__queue is not None:
+            return self.__queue.Get(timeout)
+
+        with self.__condition:
+            if not self.__condition.wait_for(lambda: self.__quit.is_set() or
+                                             (self.__latest is not None and self.__latest.seq > self.__lastRead), timeout):
+                return None
+            if self.__quit.is_set():
+                return None
+            self.__lastRead = self.__latest.seq
+            return self.__latest
+
+    def GetLatestFrame(self):
+        # non-blocking peek at the latest-frame slot
+        with self.__lock:
+            return self.__latest
+
+    def GetStats(self):
+        with self.__lock:
+            fps = 0.0
+            if len(self.__deliverTimes) > 1:
+                span = self.__deliverTimes[-1] - self.__deliverTimes[0]
+                fps = (len(self.__deliverTimes) - 1) / span if span > 0 else 0.0
+            return {
+                "fps": fps,
+                "fetched": self.__fetched,
+                "delivered": self.__delivered,
+                "dropped": self.__dropped,
+                "errors": self.__errors,
+                "latency_mean": self.__latencySum / self.__delivered if self.__delivered else 0.0,
+                "latency_max": self.__latencyMax,
+            }
+
+    def __FetchThreadFunc(self):
+        while not self.__quit.is_set():
+            with self.__lock:
+                seq = self.__seq
+                self.__seq += 1
+
+            requestTime = time.monotonic()
+            try:
+                code, data = self.__client.GetImageSample()
+            except Exception as e:
+                code, data = -1, None
+                print("[VideoStream] get image sample error. msg:", e)
+
+            receiveTime = time.monotonic()
+            if code != 0 or not data:
+                with self.__lock:
+                    self.__errors += 1
+                # back off, the service may be down
+                self.__quit.wait(0.1)
+                continue
+
+            with self.__lock:
+                self.__fetched += 1
+                # bound decode backlog, latency matters more than every frame
+                if self.__pool is not None and self.__pending >= self.__decoders * 2:
+                    self.__dropped += 1
+                    continue
+                self.__pending += 1
+
+            if self.__pool is None:
+                self.__Deliver(VideoFrame(seq, None, data, requestTime, receiveTime, receiveTime))
+            else:
+                try:
+                    self.__pool.submit(self.__DecodeTask, seq, data, requestTime, receiveTime)
+                except RuntimeError:
+                    # pool shut down while stopping
+                    break
+
+    def __DecodeTask(self, seq: int, data: bytes, requestTime: float, receiveTime: float):
+        try:
+            image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        except Exception as e:
+            image = None
+            print("[VideoStream] decode error. msg:", e)
+
+        if image is None:
+            with self.__lock:
+                self.__pending -= 1
+                self.__errors += 1
+            return
+
+        self.__Deliver(VideoFrame(seq, image, data, requestTime, receiveTime, time.monotonic()))
+
+    def __Deliver(self, frame: VideoFrame):
+        with self.__condition:
+            self.__pending -= 1
+            if frame.seq < self.__lastDelivered:
+                self.__dropped += 1
+                return
+
+            self.__lastDelivered = frame.seq
+            self.__delivered += 1
+            latency = frame.GetLatency()
+            self.__latencySum += latency
+            self.__latencyMax = max(self.__latencyMax, latency)
+            self.__deliverTimes.append(frame.decodeTime)
+
+            self.__latest = frame
+            self.__condition.notify_all()
+
+            if self.__queue is not None and not self.__queue.Put(frame, True):
+                # queue full, oldest frame replaced
+                self.__dropped += 1
@@ -0,0 +1,192 @@
+import os
+import mmap
+import struct
+import numpy as np
+
+from typing import Any
+
+
+WAV_FORMAT_PCM = 0x0001
+WAV_FORMAT_EXTENSIBLE = 0xFFFE
+
+_RIFF_HEADER = struct.Struct("<4sI4s")
+_CHUNK_HEADER = struct.Struct("<4sI")
+_FMT_CHUNK = struct.Struct("<HHIIHH")
+
+
+"""
+" class WavReader. 16-bit PCM WAV file, memory-mapped.
+"
+" the data chunk is exposed as an int16 NumPy view of the mapping, so pages
+" are only read when touched and nothing is copied. any chunk other than
+" "fmt " and "data" (JUNK, LIST, bext, ...) is skipped.
+"
+" views returned by GetSamples() / IterFrames() point into the mapping: drop
+" them before Close(), or the mapping stays alive until they are collected.
+"""
+class WavReader:
+    def __init__(self, path: str):
+        self.__path = path
+        self.__file = None
+        self.__mmap = None
+        self.__samples = None
+
+        self.sampleRate = 0
+        self.channels = 0
+        self.sampleWidth = 0
+        self.frames = 0
+
+    def __enter__(self):
+        self.Open()
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
+
+    def Open(self):
+        self.__file = open(self.__path, "rb")
+        try:
+            self.__mmap = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.__Parse()
+        except Exception:
+            self.Close()
+            raise
+
+    def Close(self):
+        self.__samples = None
+        if self.__mmap is not None:
+            try:
+                self.__mmap.close()
+            except BufferError:
+                # views still exported, the mapping is released with the last of them
+                pass
+            self.__mmap = None
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def GetDuration(self):
+        return self.frames / self.sampleRate if self.sampleRate else 0.0
+
+    def GetSamples(self):
+        # (frames, channels) int16 view of the whole data chunk
+        return self.__samples
+
+    def GetBytes(self):
+        # the data chunk as a flat byte view
+        return memoryview(self.__samples).cast("B")
+
+    def ReadFrames(self, start: int, count: int):
+        return self.__samples[start:start + count]
+
+    def IterFrames(self, duration: float):
+        # consecutive duration-second views, the last one may be shorter
+        step = max(1, int(duration * self.sampleRate))
+        for start in range(0, self.frames, step):
+            yield self.__samples[start:start + step]
+
+    def __Parse(self):
+        mm = self.__mmap
+        if len(mm) < _RIFF_HEADER.size:
+            raise ValueError("not a WAV file: too short")
+
+        riff, _, wave = _RIFF_HEADER.unpack_from(mm, 0)
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError("not a RIFF/WAVE file")
+
+        fmt = None
+        dataOffset = dataSize = None
+        offset = _RIFF_HEADER.size
+        while offset + _CHUNK_HEADER.size <= len(mm):
+            chunkId, chunkSize = _CHUNK_HEADER.unpack_from(mm, offset)
+            body = offset + _CHUNK_HEADER.size
+
+            if chunkId == b"fmt ":
+                fmt = _FMT_CHUNK.unpack_from(mm, body)
+                if fmt[0] == WAV_FORMAT_EXTENSIBLE and chunkSize >= 40:
+                    # sub format GUID starts with the real format tag
+                    fmt = (struct.unpack_from("<H", mm, body + 24)[0],) + fmt[1:]
+            elif chunkId == b"data":
+                dataOffset = body
+                # streaming writers may leave the size unset, take what is there
+                dataSize = min(chunkSize, len(mm) - body)
+                break
+
+            # chunks are word aligned
+            offset = body + chunkSize + (chunkSize & 1)
+
+        if fmt is None:
+            raise ValueError("WAV file has no fmt chunk")
+        if dataOffset is None:
+            raise ValueError("WAV file has no data chunk")
+
+        formatTag, channels, sampleRate, _, blockAlign, bitsPerSample = fmt
+        if formatTag != WAV_FORMAT_PCM or bitsPerSample != 16:
+            raise ValueError("only 16-bit PCM WAV is supported, got format {} with {} bits".format(
+                formatTag, bitsPerSample))
+        if channels < 1 or blockAlign != channels * 2:
+            raise ValueError("invalid block align {} for {} channels".format(blockAlign, channels))
+
+        self.sampleRate = sampleRate
+        self.channels = channels
+        self.sampleWidth = 2
+        self.frames = dataSize // blockAlign
+        self.__samples = np.frombuffer(mm, dtype="<i2", count=self.frames * channels,
+                                       offset=dataOffset).reshape(self.frames, channels)
+
+
+"""
+" class WavWriter. 16-bit PCM WAV file written incrementally.
+"
+" the RIFF and data sizes are patched in Close(), so any length can be
+" streamed without holding it in memory.
+"""
+class WavWriter:
+    def __init__(self, path: str, sampleRate: int, channels: int = 1):
+        self.__path = path
+        self.__file = None
+        self.__dataSize = 0
+
+        self.sampleRate = sampleRate
+        self.channels = channels
+
+    def __enter__(self):
+        self.Open()
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
+
+    def Open(self):
+        self.__file = open(self.__path, "wb")
+        self.__dataSize = 0
+        blockAlign = self.channels * 2
+        self.__file.write(_RIFF_HEADER.pack(b"RIFF", 0, b"WAVE"))
+        self.__file.write(_CHUNK_HEADER.pack(b"fmt ", _FMT_CHUNK.size))
+        self.__file.write(_FMT_CHUNK.pack(WAV_FORMAT_PCM, self.channels, self.sampleRate,
+                                          self.sampleRate * blockAlign, blockAlign, 16))
+        self.__file.write(_CHUNK_HEADER.pack(b"data", 0))
+
+    def Write(self, samples: Any):
+        # int16 NumPy array, bytes-like, or list of int16 samples
+        if isinstance(samples, (list, tuple)):
+            samples = np.asarray(samples, dtype="<i2")
+        if isinstance(samples, np.ndarray):
+            samples = np.ascontiguousarray(samples, dtype="<i2")
+        data = memoryview(samples).cast("B")
+        self.__file.write(data)
+        self.__dataSize += len(data)
+
+    def Close(self):
+        if self.__file is None:
+            return
+
+        if self.__dataSize & 1:
+            self.__file.write(b"\x00")
+        riffSize = self.__file.tell() - 8
+        self.__file.seek(4, os.SEEK_SET)
+        self.__file.write(struct.pack("<I", riffSize))
+        self.__file.seek(_RIFF_HEADER.size + _CHUNK_HEADER.size + _FMT_CHUNK.size + 4, os.SEEK_SET)
+        self.__file.write(struct.pack("<I", self.__dataSize))
+        self.__file.close()
+        self.__file = None